@@ -2,32 +2,38 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
 
 app = Flask(__name__)
 CORS(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
+# Gemeinsame Konfiguration (src/app_config.py), vor dem Import der Routen
+from src.app_config import configure_app
+configure_app(app)
+
 # Importiere die Route-Definitionen
 from src.routes.journal_routes import journal_bp
 from src.routes.entry_routes import entry_bp
 from src.routes.stats_routes import stats_bp
+from src.upload_serving import serve_upload_file
+from src import data_storage
 
 # Registriere die Blueprints
 app.register_blueprint(journal_bp, url_prefix='/api')
 app.register_blueprint(entry_bp, url_prefix='/api')
 app.register_blueprint(stats_bp, url_prefix='/api')
 
+@app.errorhandler(413)
+def request_entity_too_large(error):
+    """Antwortet auf zu große Uploads mit einer JSON-Fehlermeldung"""
+    return jsonify({"error": "Datei ist zu groß"}), 413
+
 # Route zum Bereitstellen hochgeladener Dateien
 @app.route('/api/uploads/<path:filename>')
 def serve_upload(filename):
-    upload_dir = os.path.join(os.path.dirname(__file__), 'data', 'uploads')
-    # Sicherheitsprüfung: sicherstellen, dass der Dateiname sicher ist
-    safe_path = os.path.abspath(os.path.join(upload_dir, filename))
-    if not safe_path.startswith(os.path.abspath(upload_dir)):
-        return jsonify({"error": "Ungültiger Dateipfad"}), 400
-    return send_from_directory(upload_dir, filename)
+    return serve_upload_file(data_storage.UPLOADS_DIR, filename, data_storage.upload_content_hash)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,229 @@
+# src/analytics.py - Zeitreihen-Auswertungen auf Basis der typisierten EntryRecords
+
+import datetime
+from collections import deque
+
+from src.entry_records import POSITIVE_RESULTS
+
+DEFAULT_CURVE_POINTS = 500  # Standard-Auflösung der Equity-Kurve für das Frontend
+
+
+def sort_by_entry_date(records):
+    """Sortiert Datensätze nach Einstiegszeitpunkt; Einträge ohne Datum kommen ans Ende."""
+    return sorted(records, key=lambda r: (r.entry_ts is None, r.entry_ts or 0, r.id))
+
+
+def format_ts(ts):
+    """Formatiert Epoch-Sekunden als UTC-ISO-String."""
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def downsample_lttb(points, threshold, x_key='index', y_key='equity'):
+    """
+    Reduziert eine Kurve mit Largest-Triangle-Three-Buckets auf threshold Punkte.
+    Erster und letzter Punkt bleiben erhalten, Spitzen und Einbrüche werden bevorzugt.
+    """
+    count = len(points)
+    if threshold <= 0 or threshold >= count or threshold < 3:
+        return points
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        # Durchschnitt des nächsten Buckets als dritter Dreieckspunkt
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(points[i][x_key] for i in range(next_start, next_end)) / span
+        avg_y = sum(points[i][y_key] for i in range(next_start, next_end)) / span
+
+        # Punkt des aktuellen Buckets mit der größten Dreiecksfläche wählen
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        anchor_x, anchor_y = points[selected][x_key], points[selected][y_key]
+        best_area = -1
+        best_index = start
+        for i in range(start, end):
+            area = abs((anchor_x - avg_x) * (points[i][y_key] - anchor_y)
+                       - (anchor_x - points[i][x_key]) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best_index = i
+
+        sampled.append(points[best_index])
+        selected = best_index
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def calculate_equity_curve(records, initial_equity=0.0, max_points=DEFAULT_CURVE_POINTS):
+    """
+    Berechnet Equity-Kurve, laufendes Hoch, maximalen Drawdown (absolut und in %),
+    Drawdown-Dauer und die längsten Gewinn-/Verlustserien in einem Durchlauf über die
+    nach Datum sortierten Einträge. Win, BE und PartialBE zählen als Gewinnserie.
+    Einträge ohne PnL verändern die Equity nicht, Einträge ohne Ergebnis unterbrechen keine Serie.
+    """
+    ordered = sort_by_entry_date(records)
+
+    equity = initial_equity
+    peak = initial_equity
+    peak_index = -1
+    peak_ts = ordered[0].entry_ts if ordered else None
+
+    max_drawdown = 0.0
+    max_drawdown_percentage = 0.0
+    max_duration_trades = 0
+    max_duration_seconds = 0
+
+    win_streak = loss_streak = 0
+    longest_win_streak = longest_loss_streak = 0
+
+    curve = []
+    for index, record in enumerate(ordered):
+        if record.pnl is not None:
+            equity += record.pnl
+
+        if equity >= peak:
+            # Neues Hoch (oder Erholung): Drawdown-Phase endet
+            peak = equity
+            peak_index = index
+            peak_ts = record.entry_ts
+        else:
+            drawdown = peak - equity
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+            if peak > 0:
+                max_drawdown_percentage = max(max_drawdown_percentage, drawdown / peak * 100)
+            max_duration_trades = max(max_duration_trades, index - peak_index)
+            if record.entry_ts is not None and peak_ts is not None:
+                max_duration_seconds = max(max_duration_seconds, record.entry_ts - peak_ts)
+
+        if record.result in POSITIVE_RESULTS:
+            win_streak += 1
+            loss_streak = 0
+            longest_win_streak = max(longest_win_streak, win_streak)
+        elif record.result == "Loss":
+            loss_streak += 1
+            win_streak = 0
+            longest_loss_streak = max(longest_loss_streak, loss_streak)
+
+        curve.append({
+            'index': index,
+            'entry_id': record.id,
+            'date': format_ts(record.entry_ts),
+            'pnl': record.pnl,
+            'equity': round(equity, 2),
+            'peak': round(peak, 2),
+            'drawdown': round(peak - equity, 2)
+        })
+
+    full_length = len(curve)
+    if max_points:
+        curve = downsample_lttb(curve, max_points)
+
+    return {
+        'initial_equity': initial_equity,
+        'final_equity': round(equity, 2),
+        'total_pnl': round(equity - initial_equity, 2),
+        'total_trades': full_length,
+        'max_drawdown': round(max_drawdown, 2),
+        'max_drawdown_percentage': round(max_drawdown_percentage, 2),
+        'max_drawdown_duration_trades': max_duration_trades,
+        'max_drawdown_duration_days': round(max_duration_seconds / 86400, 2),
+        'longest_win_streak': longest_win_streak,
+        'longest_loss_streak': longest_loss_streak,
+        'downsampled': len(curve) < full_length,
+        'curve': curve
+    }
+
+
+ROLLING_UNITS = ('trades', 'days')
+
+
+class RollingWindow:
+    """Gleitende Summen über die Einträge eines Fensters (Hinzufügen/Entfernen in O(1))."""
+
+    __slots__ = ('trades', 'with_result', 'positive', 'pnl', 'pnl_count', 'rr', 'rr_count')
+
+    def __init__(self):
+        self.trades = 0
+        self.with_result = 0
+        self.positive = 0
+        self.pnl = 0
+        self.pnl_count = 0
+        self.rr = 0
+        self.rr_count = 0
+
+    def apply(self, record, sign=1):
+        self.trades += sign
+        if record.result:
+            self.with_result += sign
+            if record.result in POSITIVE_RESULTS:
+                self.positive += sign
+        if record.pnl is not None:
+            self.pnl += sign * record.pnl
+            self.pnl_count += sign
+        if record.initial_rr is not None:
+            self.rr += sign * record.initial_rr
+            self.rr_count += sign
+
+    def snapshot(self, record, index):
+        """Kennzahlen des Fensters, das mit record endet."""
+        return {
+            'index': index,
+            'entry_id': record.id,
+            'date': format_ts(record.entry_ts),
+            'trades': self.trades,
+            'win_rate': round(self.positive / self.with_result * 100, 2) if self.with_result else 0,
+            'expectancy': round(self.pnl / self.pnl_count, 2) if self.pnl_count else 0,
+            'average_rr': round(self.rr / self.rr_count, 2) if self.rr_count else 0,
+            'pnl': round(self.pnl, 2)
+        }
+
+
+def calculate_rolling_performance(records, window, unit='trades', max_points=DEFAULT_CURVE_POINTS):
+    """
+    Gleitende Gewinnrate, Erwartungswert (Ø PnL je Trade), Ø R/R und PnL über die letzten
+    window Trades bzw. Tage, in einem Durchlauf mit einer deque als Fenster.
+    Win, BE und PartialBE zählen als positiv, nur Loss als negativ.
+    Im Modus 'trades' beginnt die Reihe erst, wenn das Fenster gefüllt ist;
+    Einträge ohne Einstiegsdatum werden nicht berücksichtigt.
+    """
+    ordered = [r for r in sort_by_entry_date(records) if r.entry_ts is not None]
+    span = window * 86400
+
+    accumulator = RollingWindow()
+    buffer = deque()
+    series = []
+
+    for index, record in enumerate(ordered):
+        buffer.append(record)
+        accumulator.apply(record)
+
+        if unit == 'trades':
+            if len(buffer) > window:
+                accumulator.apply(buffer.popleft(), -1)
+            if len(buffer) < window:
+                continue
+        else:
+            while buffer[0].entry_ts <= record.entry_ts - span:
+                accumulator.apply(buffer.popleft(), -1)
+
+        series.append(accumulator.snapshot(record, index))
+
+    full_length = len(series)
+    if max_points:
+        series = downsample_lttb(series, max_points, y_key='pnl')
+
+    return {
+        'window': window,
+        'unit': unit,
+        'total_points': full_length,
+        'downsampled': len(series) < full_length,
+        'series': series
+    }
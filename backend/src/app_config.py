@@ -0,0 +1,73 @@
+# src/app_config.py - Gemeinsame Konfiguration der Flask-App (src/main.py und api_only.py)
+
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def configure_app(app):
+    """
+    Setzt die Konfiguration aus Standardwerten und Umgebungsvariablen, richtet Logging, Metriken
+    und Profiling ein und überträgt die Speicheroptionen auf data_storage. Muss vor dem Import
+    der Routen aufgerufen werden, damit auch die Initialisierung der Datendateien geloggt wird.
+    """
+    # Upload-Limits: Bilder bis 20 MB, Anfragen mit größerem Body werden sofort mit 413 abgelehnt
+    app.config['MAX_UPLOAD_SIZE'] = 20 * 1024 * 1024
+    app.config['MAX_CONTENT_LENGTH'] = app.config['MAX_UPLOAD_SIZE'] + 64 * 1024  # Reserve für Multipart-Header
+
+    # Auslieferung der Uploads: Dateinamen sind eindeutig, Dateien ändern sich nie
+    app.config['UPLOADS_CACHE_MAX_AGE'] = 365 * 24 * 3600
+    app.config['UPLOADS_IMMUTABLE'] = True
+    # Offload an einen Front-Proxy: None, 'x-sendfile' (Apache/lighttpd) oder 'x-accel-redirect' (nginx)
+    app.config['UPLOADS_OFFLOAD'] = os.environ.get('TRADING_JOURNAL_UPLOADS_OFFLOAD') or None
+    app.config['UPLOADS_ACCEL_PREFIX'] = '/protected-uploads/'
+
+    # Laufzeitmetriken unter /api/metrics (nur wenn TRADING_JOURNAL_METRICS gesetzt ist)
+    app.config['METRICS_ENABLED'] = env_flag('TRADING_JOURNAL_METRICS')
+
+    # Profiling einzelner Anfragen per Header "X-Profile: 1" oder ?_profile=1 (nur wenn TRADING_JOURNAL_PROFILING gesetzt ist)
+    app.config['PROFILING_ENABLED'] = env_flag('TRADING_JOURNAL_PROFILING')
+    app.config['PROFILING_DIR'] = None  # unterhalb von data_storage.DATA_DIR, siehe unten
+    app.config['PROFILING_MAX_PROFILES'] = 50
+
+    # Haltbarkeit der Speichervorgänge: 'paranoid', 'standard' (fsync) oder 'fast' (ohne fsync)
+    app.config['STORAGE_DURABILITY'] = os.environ.get('TRADING_JOURNAL_DURABILITY', 'standard')
+    # Group Commit: Speicherungen von journals/templates/strategies.json innerhalb von n ms bündeln (0 = aus)
+    app.config['STORAGE_GROUP_COMMIT_MS'] = float(os.environ.get('TRADING_JOURNAL_GROUP_COMMIT_MS') or 0)
+    # Write-Back: Änderungen an Einträgen, Checklisten und Bildern spätestens nach n ms schreiben (0 = aus).
+    # Schnelle Klickfolgen ergeben so einen Schreibvorgang; bei einem Absturz gehen aber bis zu n ms verloren.
+    app.config['STORAGE_WRITE_BACK_MS'] = float(os.environ.get('TRADING_JOURNAL_WRITE_BACK_MS') or 0)
+    # Speicherformat: 'json' oder 'binary' (zusätzliche Binärdateien für schnelleres Laden)
+    app.config['STORAGE_FORMAT'] = os.environ.get('TRADING_JOURNAL_STORAGE_FORMAT') or 'json'
+
+    # Statistiken: zuletzt berechneten Stand sofort liefern, höchstens n Sekunden veraltet (0 = immer aktuell)
+    app.config['STATS_MAX_STALENESS_SECONDS'] = float(os.environ.get('TRADING_JOURNAL_STATS_MAX_STALENESS') or 10)
+
+    # Logging über eine Warteschlange (Datei-I/O im Hintergrund-Thread), rotierend, standardmäßig als JSON
+    app.config['LOG_FILE'] = os.environ.get('TRADING_JOURNAL_LOG_FILE') or os.path.join(BACKEND_DIR, 'trading_journal.log')
+    app.config['LOG_FORMAT'] = os.environ.get('TRADING_JOURNAL_LOG_FORMAT', 'json')  # 'json' oder 'text'
+    app.config['LOG_MAX_BYTES'] = 10 * 1024 * 1024
+    app.config['LOG_BACKUP_COUNT'] = 5
+    # Häufige Meldungen nur jedes n-te Mal schreiben
+    app.config['LOG_SAMPLE_RATES'] = {'storage.save': 10, 'http.request': 10}
+    app.config['LOG_REQUESTS'] = env_flag('TRADING_JOURNAL_LOG_REQUESTS')
+
+    from src.log_setup import init_logging
+    init_logging(app)
+
+    # Erst nach dem Logging importieren: der Import initialisiert die Datendateien
+    from src.metrics import init_metrics
+    from src.profiling import init_profiling
+    from src import data_storage
+
+    app.config['PROFILING_DIR'] = os.path.join(data_storage.DATA_DIR, 'profiles')
+    init_metrics(app)
+    init_profiling(app)
+    data_storage.configure_durability(app.config['STORAGE_DURABILITY'], app.config['STORAGE_GROUP_COMMIT_MS'],
+                                      app.config['STORAGE_WRITE_BACK_MS'])
+    data_storage.configure_storage_format(app.config['STORAGE_FORMAT'])
+    data_storage.configure_statistics_cache(app.config['STATS_MAX_STALENESS_SECONDS'])
@@ -0,0 +1,173 @@
+# src/binary_format.py - Binäre Snapshots der Datendateien (MessagePack, ersatzweise marshal)
+#
+# Neben jeder JSON-Datei (entries.json) kann eine Binärdatei (entries.bin) mit demselben Inhalt
+# liegen, die sich deutlich schneller laden lässt als das eingerückte JSON. Die JSON-Datei bleibt
+# maßgeblich (Export, Backups, Wiederherstellung): Der Kopf der Binärdatei enthält Größe,
+# Änderungszeit und Inode der JSON-Datei, aus der sie entstand, und wird nur bei Übereinstimmung
+# verwendet. Aufbau:
+#   Kopf (HEADER): Magic, Codec, Größe/mtime_ns/Inode der JSON-Datei, Länge und SHA-256 der Nutzdaten
+#   Nutzdaten: die mit dem Codec kodierte Liste
+# Passt der Codec einer Datei nicht zur Umgebung, lädt data_storage das JSON und baut sie neu auf.
+
+import os
+import sys
+import json
+import struct
+import marshal
+import hashlib
+import datetime
+
+try:
+    import msgpack  # requirements.txt; portables Binärformat
+except ImportError:
+    msgpack = None
+
+EXTENSION = '.bin'
+MAGIC = b'TJB\x02'
+HEADER = struct.Struct('>4s16sQqQQ32s')
+
+# Ersatz ohne msgpack: marshal ist an Formatversion und Interpreter gebunden, beides steht im
+# Codec-Namen (z. B. marshal4-py311); andere Interpreter bauen die Datei neu auf
+MARSHAL_CODEC = f'marshal{marshal.version}-py{sys.version_info[0]}{sys.version_info[1]}'
+
+
+class SnapshotError(ValueError):
+    """Binärdatei ist beschädigt, veraltet oder mit diesem Interpreter nicht lesbar."""
+
+
+class StaleSnapshotError(SnapshotError):
+    """Binärdatei gehört zu einem früheren Stand der JSON-Datei (z. B. nach manueller Bearbeitung)."""
+
+
+def available_codecs():
+    """Verfügbare Codecs, der bevorzugte (portable) zuerst."""
+    return (('msgpack',) if msgpack is not None else ()) + (MARSHAL_CODEC,)
+
+
+def default_codec():
+    return available_codecs()[0]
+
+
+def source_stamp(stat_result):
+    """Kennung einer JSON-Datei (Größe, mtime_ns, Inode) aus os.stat()."""
+    return (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+
+def json_key(key):
+    """Wandelt einen Dictionary-Schlüssel so um, wie json.dumps ihn schreiben würde."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, float):
+        return float.__repr__(key)
+    return str(key)
+
+
+def json_compatible(value):
+    """
+    Bringt Daten in die Form, die ein JSON-Rundlauf ergäbe (Tupel als Listen, Schlüssel als
+    Strings, Datumswerte als ISO-Text), damit Binär- und JSON-Datei gleich geladen werden.
+    """
+    if isinstance(value, dict):
+        return {json_key(k): json_compatible(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_compatible(v) for v in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def canonical_checksum(data):
+    """SHA-256 über eine kanonische JSON-Darstellung; gleich für JSON- und Binärdatei desselben Inhalts."""
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'),
+                      default=lambda obj: obj.isoformat())
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def encode(data, stamp, codec=None):
+    """Kodiert eine Liste samt Kopf; stamp ist die Kennung der zugehörigen JSON-Datei."""
+    codec = codec or default_codec()
+    data = json_compatible(data)
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise SnapshotError("msgpack ist nicht installiert")
+        payload = msgpack.packb(data, use_bin_type=True)
+    elif codec == MARSHAL_CODEC:
+        payload = marshal.dumps(data)
+    else:
+        raise SnapshotError(f"Unbekannter Codec: {codec}")
+
+    size, mtime_ns, inode = stamp
+    header = HEADER.pack(MAGIC, codec.encode('ascii'), size, mtime_ns, inode, len(payload),
+                         hashlib.sha256(payload).digest())
+    return header + payload
+
+
+def read_header(content):
+    """Gibt (Codec, Kennung der JSON-Datei, Nutzdaten) zurück."""
+    if len(content) < HEADER.size:
+        raise SnapshotError("Datei zu kurz")
+    magic, codec, size, mtime_ns, inode, length, digest = HEADER.unpack_from(content)
+    if magic != MAGIC:
+        raise SnapshotError("Keine Binärdatei des Trading Journals")
+    payload = content[HEADER.size:]
+    if len(payload) != length:
+        raise SnapshotError(f"Unvollständige Nutzdaten ({len(payload)} von {length} Bytes)")
+    if hashlib.sha256(payload).digest() != digest:
+        raise SnapshotError("Prüfsumme der Nutzdaten stimmt nicht")
+    return codec.rstrip(b'\0').decode('ascii'), (size, mtime_ns, inode), payload
+
+
+def decode(content, stamp=None):
+    """
+    Dekodiert eine Binärdatei. Mit stamp wird geprüft, dass sie zur aktuellen JSON-Datei gehört;
+    ohne stamp (Wiederherstellung) wird jeder unbeschädigte Inhalt geliefert.
+    """
+    codec, source, payload = read_header(content)
+    if stamp is not None and source != tuple(stamp):
+        raise StaleSnapshotError("Binärdatei ist älter als die JSON-Datei")
+
+    try:
+        if codec == 'msgpack':
+            if msgpack is None:
+                raise SnapshotError("msgpack ist nicht installiert")
+            data = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        elif codec == MARSHAL_CODEC:
+            data = marshal.loads(payload)
+        else:
+            raise SnapshotError(f"Codec {codec} wird nicht unterstützt")
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"Nutzdaten nicht lesbar: {e}")
+
+    if not isinstance(data, list):
+        raise SnapshotError("Daten sind keine Liste")
+    return data
+
+
+def write_snapshot(path, data, stamp, fsync=False, codec=None):
+    """Schreibt eine Binärdatei atomar (temporäre Datei + Umbenennen); gibt die Byte-Anzahl zurück."""
+    content = encode(data, stamp, codec)
+    temp_file = f"{path}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    return len(content)
+
+
+def read_snapshot(path, stamp=None):
+    with open(path, 'rb') as f:
+        return decode(f.read(), stamp)
@@ -2,30 +2,72 @@
 
 import os
 import json
+import math
 import datetime
 import uuid
 import shutil
 import time
 import threading
 import logging
+import hashlib
+import tempfile
+import queue
+import atexit
+import itertools
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-
-# Logger einrichten
-logging.basicConfig(
-    filename='trading_journal.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+from src.analytics import (
+    calculate_equity_curve, calculate_rolling_performance, DEFAULT_CURVE_POINTS, ROLLING_UNITS
+)
+from src import metrics
+from src import binary_format
+from src.search_index import SearchIndex, make_snippet
+from src.rollups import JournalRollups, PortfolioAccumulator, rollup_statistics
+from src.simulation import (
+    extract_samples, run_simulation, SIMULATION_MODES, MAX_PATHS, MAX_TRADES_PER_PATH, MAX_CELLS
 )
+from src.entry_records import (
+    EntryRecord, ValidationError, EntryValidationError, normalize_entry_fields, POSITIVE_RESULTS,
+    DEFAULT_TIMEZONE, DEFAULT_SESSIONS, resolve_timezone, validate_sessions, session_hour_table
+)
+
+# Logging wird von der App eingerichtet (src/log_setup.py); hier wird nur geloggt.
+# Die Handler schreiben nur in eine Warteschlange, Datei-I/O läuft nie unter den Datensperren.
 
 # Globale Sperre für Dateioperationen
 file_locks = {}
 LOCK_TIMEOUT = 30  # Timeout in Sekunden
 
-# Basispfad für die Datenspeicherung
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+# Basispfad für die Datenspeicherung (überschreibbar für Benchmarks und Testdaten)
+DATA_DIR = os.environ.get('TRADING_JOURNAL_DATA_DIR') or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 UPLOADS_DIR = os.path.join(DATA_DIR, 'uploads')
 BACKUP_DIR = os.path.join(DATA_DIR, 'backups')
 
+# Haltbarkeit der Speichervorgänge:
+#   paranoid - fsync von Datei und Verzeichnis, einmalige Prüfung der geschriebenen Datei
+#   standard - fsync der Datei, keine erneuten Lesevorgänge
+#   fast     - kein fsync (schnell, bei Stromausfall können die letzten Änderungen fehlen)
+DURABILITY_MODES = ('paranoid', 'standard', 'fast')
+DURABILITY = os.environ.get('TRADING_JOURNAL_DURABILITY') or 'standard'
+if DURABILITY not in DURABILITY_MODES:
+    DURABILITY = 'standard'
+# Group Commit: Fenster in Sekunden, in dem Speicherungen derselben Datei gebündelt werden (0 = aus)
+GROUP_COMMIT_WINDOW = float(os.environ.get('TRADING_JOURNAL_GROUP_COMMIT_MS') or 0) / 1000
+
+# Write-Back: Änderungen an Journal-Dateien werden im Speicher gehalten und spätestens nach
+# dieser Verzögerung (Sekunden) geschrieben; sie ist zugleich das maximale Verlustfenster (0 = aus)
+WRITE_BACK_DELAY = float(os.environ.get('TRADING_JOURNAL_WRITE_BACK_MS') or 0) / 1000
+
+# Speicherformat: 'json' schreibt nur die JSON-Dateien, 'binary' zusätzlich je eine Binärdatei
+# (MessagePack, src/binary_format.py), die beim Laden bevorzugt wird. JSON bleibt Export- und
+# Wiederherstellungsformat.
+STORAGE_FORMATS = ('json', 'binary')
+STORAGE_FORMAT = os.environ.get('TRADING_JOURNAL_STORAGE_FORMAT') or 'json'
+if STORAGE_FORMAT not in STORAGE_FORMATS:
+    STORAGE_FORMAT = 'json'
+
 # Stellen Sie sicher, dass die Verzeichnisse existieren
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(UPLOADS_DIR, exist_ok=True)
@@ -33,11 +75,41 @@ os.makedirs(BACKUP_DIR, exist_ok=True)
 
 # Pfade zu JSON-Dateien
 JOURNALS_FILE = os.path.join(DATA_DIR, 'journals.json')
-ENTRIES_FILE = os.path.join(DATA_DIR, 'entries.json')
 TEMPLATES_FILE = os.path.join(DATA_DIR, 'templates.json')
+STRATEGIES_FILE = os.path.join(DATA_DIR, 'strategies.json')
+
+# Einträge, Status und Bilder liegen pro Journal in data/journals/<id>/<collection>.json
+JOURNALS_DIR = os.path.join(DATA_DIR, 'journals')
+SHARDED_COLLECTIONS = ('entries', 'statuses', 'images')
+
+# Alte globale Dateien (werden beim Start in die Journal-Verzeichnisse migriert)
+ENTRIES_FILE = os.path.join(DATA_DIR, 'entries.json')
 STATUSES_FILE = os.path.join(DATA_DIR, 'statuses.json')
 IMAGES_FILE = os.path.join(DATA_DIR, 'images.json')
-STRATEGIES_FILE = os.path.join(DATA_DIR, 'strategies.json')
+
+os.makedirs(JOURNALS_DIR, exist_ok=True)
+
+# Upload-Einstellungen
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Uploads werden in 64-KB-Blöcken geschrieben
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024  # Maximale Bildgröße in Bytes
+
+# Magic Bytes der erlaubten Bildformate
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+IMAGE_SIGNATURE_LENGTH = max(len(signature) for signature, _ in IMAGE_SIGNATURES)
+
+
+class UploadError(Exception):
+    """Wird ausgelöst, wenn ein Upload abgelehnt wird (zu groß, falscher Typ)."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
 
 
 # Sperrfunktionen für Dateioperationen
@@ -51,9 +123,13 @@ def acquire_lock(file_path, timeout=LOCK_TIMEOUT):
 
     while time.time() - start_time < timeout:
         if lock.acquire(blocking=False):
+            if metrics.enabled:
+                metrics.LOCK_WAIT_SECONDS.observe(time.time() - start_time)
             return True
         time.sleep(0.1)
 
+    if metrics.enabled:
+        metrics.LOCK_TIMEOUTS.inc()
     logging.error(f"Timeout beim Erwerb der Sperre für {file_path}")
     return False
 
@@ -68,15 +144,28 @@ def release_lock(file_path):
             pass
 
 
+def backup_name(file_path):
+    """
+    Liefert den Basisnamen für Backups einer Datei.
+    Journal-Dateien werden mit ihrem Verzeichnis benannt (journals_5_entries.json),
+    damit sich die Backups verschiedener Journale nicht überschreiben.
+    """
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(DATA_DIR))
+    if relative.startswith('..'):
+        return os.path.basename(file_path)
+    return relative.replace(os.sep, '_')
+
+
 # Funktion zum Erstellen eines Backups
 def create_backup(file_path):
     """Erstellt ein Backup der angegebenen Datei"""
     if not os.path.exists(file_path):
         return False
 
+    backup_start = time.perf_counter()
     try:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.basename(file_path)
+        filename = backup_name(file_path)
         backup_filename = f"{filename}_{timestamp}.bak"
         backup_path = os.path.join(BACKUP_DIR, backup_filename)
 
@@ -93,7 +182,12 @@ def create_backup(file_path):
 
         # Erstelle das Backup
         shutil.copy2(file_path, backup_path)
-        logging.info(f"Backup erstellt: {backup_path}")
+        duration = time.perf_counter() - backup_start
+        logging.info(f"Backup erstellt: {backup_path}", extra={
+            'event': 'storage.backup', 'file': file_path, 'duration_ms': round(duration * 1000, 3)
+        })
+        if metrics.enabled:
+            metrics.BACKUP_SECONDS.observe(duration)
         return True
     except Exception as e:
         logging.error(f"Fehler beim Erstellen des Backups für {file_path}: {e}")
@@ -103,8 +197,8 @@ def create_backup(file_path):
 # Funktion zum Wiederherstellen aus Backup
 def restore_from_backup(file_path):
     """Versucht, eine Datei aus dem letzten Backup wiederherzustellen"""
-    filename = os.path.basename(file_path)
-    backup_files = [f for f in os.listdir(BACKUP_DIR) if f.startswith(filename) and f.endswith('.bak')]
+    filename = backup_name(file_path)
+    backup_files = [f for f in os.listdir(BACKUP_DIR) if f.startswith(filename + '_') and f.endswith('.bak')]
 
     if not backup_files:
         logging.warning(f"Keine Backup-Dateien für {file_path} gefunden")
@@ -126,7 +220,8 @@ def restore_from_backup(file_path):
             # Überprüfe, ob die Datei gültiges JSON enthält
             json.loads(content)
 
-            # Stelle aus dem Backup wieder her
+            # Stelle aus dem Backup wieder her (eine vorhandene Binärdatei ist danach veraltet)
+            remove_binary_snapshot(file_path)
             shutil.copy2(backup_path, file_path)
             logging.info(f"Wiederherstellung aus Backup erfolgreich: {backup_path}")
             return True
@@ -161,6 +256,11 @@ def safe_load_data(file_path, max_retry=3):
                     logging.warning(f"Datei {file_path} existiert nicht, erstelle leere Liste")
                     return []
 
+                # Eine aktuelle Binärdatei ist deutlich schneller zu laden als das JSON
+                data = load_binary_snapshot(file_path)
+                if data is not None:
+                    return data
+
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
 
@@ -168,12 +268,23 @@ def safe_load_data(file_path, max_retry=3):
                     logging.warning(f"Datei {file_path} ist leer, erstelle leere Liste")
                     return []
 
-                data = json.loads(content)
+                if metrics.enabled:
+                    parse_start = time.perf_counter()
+                    data = json.loads(content)
+                    label = metrics.file_label(file_path)
+                    metrics.PARSE_SECONDS.observe(time.perf_counter() - parse_start, label)
+                    metrics.FILE_LOADS.inc(1, label)
+                    metrics.BYTES_PARSED.inc(len(content.encode('utf-8')), label)
+                else:
+                    data = json.loads(content)
 
                 # Überprüfe, ob es eine Liste ist
                 if not isinstance(data, list):
                     raise ValueError(f"Daten in {file_path} sind keine Liste")
 
+                if STORAGE_FORMAT == 'binary':
+                    # Fehlende, veraltete oder mit anderem Codec/Interpreter geschriebene Binärdatei ersetzen
+                    write_binary_snapshot(file_path, data, DURABILITY)
                 return data
 
             except json.JSONDecodeError as e:
@@ -207,8 +318,78 @@ def safe_load_data(file_path, max_retry=3):
         release_lock(file_path)
 
 
-def safe_save_data(file_path, data, create_backup_copy=False):
-    """Speichert Daten sicher in einer JSON-Datei mit verbesserter Fehlerbehandlung."""
+def fsync_directory(directory):
+    """Schreibt den Verzeichniseintrag (z. B. nach einem Umbenennen) auf die Platte."""
+    if os.name == 'nt':
+        return  # Verzeichnisse lassen sich unter Windows nicht öffnen
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def binary_path(file_path):
+    """Pfad der Binärdatei zu einer JSON-Datei (entries.json -> entries.bin)."""
+    return os.path.splitext(file_path)[0] + binary_format.EXTENSION
+
+
+def remove_binary_snapshot(file_path):
+    """Entfernt die Binärdatei einer JSON-Datei (vor jeder Änderung der JSON-Datei)."""
+    try:
+        os.remove(binary_path(file_path))
+    except FileNotFoundError:
+        pass
+
+
+def write_binary_snapshot(file_path, data, mode):
+    """
+    Schreibt die Binärdatei zur soeben geschriebenen JSON-Datei; gibt die Byte-Anzahl zurück
+    (0 bei Fehlern - die JSON-Datei bleibt maßgeblich, das Speichern gilt trotzdem als erfolgreich).
+    """
+    try:
+        stamp = binary_format.source_stamp(os.stat(file_path))
+        return binary_format.write_snapshot(binary_path(file_path), data, stamp, fsync=mode != 'fast')
+    except Exception as e:
+        logging.warning(f"Binärdatei für {file_path} konnte nicht geschrieben werden: {e}")
+        remove_binary_snapshot(file_path)
+        return 0
+
+
+def load_binary_snapshot(file_path):
+    """
+    Lädt die Binärdatei einer JSON-Datei, sofern sie existiert und zum aktuellen Stand der
+    JSON-Datei gehört; sonst None (dann wird das JSON gelesen).
+    """
+    path = binary_path(file_path)
+    try:
+        load_start = time.perf_counter()
+        with open(path, 'rb') as f:
+            content = f.read()
+        data = binary_format.decode(content, binary_format.source_stamp(os.stat(file_path)))
+    except FileNotFoundError:
+        return None
+    except binary_format.StaleSnapshotError:
+        return None
+    except (OSError, binary_format.SnapshotError) as e:
+        logging.warning(f"Binärdatei {path} wird ignoriert: {e}")
+        return None
+
+    if metrics.enabled:
+        label = metrics.file_label(file_path)
+        metrics.PARSE_SECONDS.observe(time.perf_counter() - load_start, label)
+        metrics.FILE_LOADS.inc(1, label)
+        metrics.BINARY_LOADS.inc(1, label)
+        metrics.BYTES_PARSED.inc(len(content), label)
+    return data
+
+
+def write_data_file(file_path, data, create_backup_copy=False):
+    """
+    Schreibt eine JSON-Datei atomar (temporäre Datei + Umbenennen) im eingestellten
+    Haltbarkeitsmodus (siehe DURABILITY_MODES), im Format 'binary' zusätzlich die Binärdatei.
+    """
+    save_start = time.perf_counter()
     if not acquire_lock(file_path):
         logging.error(f"Konnte keine Sperre für {file_path} erwerben")
         return False
@@ -220,59 +401,60 @@ def safe_save_data(file_path, data, create_backup_copy=False):
             return False
 
         # Erstelle das Verzeichnis, falls es nicht existiert
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
 
         # Erstelle ein Backup der aktuellen Datei, falls gewünscht
         if create_backup_copy and os.path.exists(file_path):
             create_backup(file_path)
 
-        # Temporäre Datei für atomares Schreiben
-        temp_file = f"{file_path}.tmp"
+        mode = DURABILITY
+        content = json.dumps(data, ensure_ascii=False, indent=2, default=json_serialize).encode('utf-8')
 
         # Daten in temporäre Datei schreiben
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json_text = json.dumps(data, ensure_ascii=False, indent=2, default=json_serialize)
-            f.write(json_text)
+        temp_file = f"{file_path}.tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(content)
+            if mode != 'fast':
+                f.flush()
+                os.fsync(f.fileno())
 
-        # Überprüfe, ob die Daten korrekt geschrieben wurden
         try:
-            with open(temp_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            json.loads(content)  # Validiere JSON
+            if mode == 'paranoid':
+                # Einmalige Prüfung der geschriebenen Datei vor dem Umbenennen
+                with open(temp_file, 'rb') as f:
+                    written = f.read()
+                if written != content:
+                    raise IOError("Inhalt der temporären Datei weicht ab")
+                json.loads(written)
+
+            # Die alte Binärdatei darf nie zusammen mit der neuen JSON-Datei existieren
+            remove_binary_snapshot(file_path)
+            # Atomares Umbenennen (ersetzt die Zieldatei auch unter Windows)
+            os.replace(temp_file, file_path)
         except Exception as e:
-            logging.error(f"Fehler beim Validieren der temporären Datei: {e}")
+            logging.error(f"Fehler beim Schreiben von {file_path}: {e}")
             if os.path.exists(temp_file):
                 os.remove(temp_file)
             return False
 
-        # Atomares Umbenennen
-        try:
-            if os.name == 'nt' and os.path.exists(file_path):  # Windows benötigt Sonderbehandlung
-                os.replace(temp_file, file_path)
-            else:
-                os.rename(temp_file, file_path)
-        except Exception as e:
-            logging.error(f"Fehler beim atomaren Umbenennen: {e}")
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            return False
+        storage_format = STORAGE_FORMAT
+        binary_bytes = write_binary_snapshot(file_path, data, mode) if storage_format == 'binary' else 0
 
-        # Überprüfe Integrität der geschriebenen Datei
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-            if not file_content or file_content.strip() == '':
-                logging.error(f"Datei {file_path} ist nach dem Schreiben leer")
-                return restore_from_backup(file_path)
-
-            # Versuche JSON zu parsen
-            json.loads(file_content)
-            logging.info(f"Daten erfolgreich gespeichert in {file_path}")
-            return True
+        if mode == 'paranoid':
+            fsync_directory(directory)
 
-        except Exception as e:
-            logging.error(f"Fehler bei der Integritätsprüfung: {e}")
-            return restore_from_backup(file_path)
+        logging.info(f"Daten erfolgreich gespeichert in {file_path}", extra={
+            'event': 'storage.save', 'sample': 'storage.save', 'file': file_path,
+            'rows': len(data), 'bytes': len(content), 'binary_bytes': binary_bytes,
+            'format': storage_format, 'durability': mode,
+            'duration_ms': round((time.perf_counter() - save_start) * 1000, 3)
+        })
+        if metrics.enabled:
+            label = metrics.file_label(file_path)
+            metrics.FILE_SAVES.inc(1, label)
+            metrics.BYTES_WRITTEN.inc(len(content) + binary_bytes, label)
+        return True
 
     except Exception as e:
         logging.error(f"Unerwarteter Fehler beim Speichern in {file_path}: {e}")
@@ -282,17 +464,108 @@ def safe_save_data(file_path, data, create_backup_copy=False):
         release_lock(file_path)
 
 
+# Group Commit: Speichervorgänge derselben Datei innerhalb eines kurzen Fensters werden
+# zu einem Schreibvorgang zusammengefasst. Da jede Speicherung den vollständigen Inhalt
+# enthält, genügt es, den zuletzt übergebenen Stand zu schreiben; alle Beteiligten warten
+# auf diesen Schreibvorgang und erhalten dessen Ergebnis. Das gilt nur für die gemeinsamen
+# Dateien: Journal-Dateien werden ohnehin unter der Journal-Sperre gespeichert, gleichzeitige
+# Speicherungen gibt es dort nicht, und das Fenster würde nur die Sperre verlängern.
+_pending_saves = {}
+_pending_saves_guard = threading.Lock()
+
+
+class PendingSave:
+    """Sammelt die Speicheranforderungen einer Datei während des Group-Commit-Fensters."""
+
+    __slots__ = ('data', 'create_backup_copy', 'count', 'done', 'result')
+
+    def __init__(self):
+        self.data = None
+        self.create_backup_copy = False
+        self.count = 0
+        self.done = threading.Event()
+        self.result = False
+
+
+def group_commit_save(file_path, data, create_backup_copy=False):
+    """Reiht eine Speicherung in das laufende Fenster ein (oder eröffnet es) und wartet auf das Ergebnis."""
+    with _pending_saves_guard:
+        batch = _pending_saves.get(file_path)
+        leader = batch is None
+        if leader:
+            batch = _pending_saves[file_path] = PendingSave()
+        batch.data = data
+        batch.create_backup_copy = batch.create_backup_copy or create_backup_copy
+        batch.count += 1
+
+    if not leader:
+        batch.done.wait()
+        return batch.result
+
+    try:
+        time.sleep(GROUP_COMMIT_WINDOW)
+        with _pending_saves_guard:
+            # Spätere Speicherungen eröffnen ein neues Fenster
+            del _pending_saves[file_path]
+        batch.result = write_data_file(file_path, batch.data, batch.create_backup_copy)
+        if metrics.enabled and batch.count > 1:
+            metrics.COALESCED_SAVES.inc(batch.count - 1, metrics.file_label(file_path))
+    finally:
+        batch.done.set()
+    return batch.result
+
+
+def safe_save_data(file_path, data, create_backup_copy=False):
+    """Speichert Daten sicher in einer JSON-Datei (gemeinsame Dateien bei aktivem Group Commit gebündelt)."""
+    if GROUP_COMMIT_WINDOW > 0 and file_path in (JOURNALS_FILE, TEMPLATES_FILE, STRATEGIES_FILE):
+        return group_commit_save(file_path, data, create_backup_copy)
+    return write_data_file(file_path, data, create_backup_copy)
+
+
+def configure_durability(mode=None, group_commit_ms=None, write_back_ms=None):
+    """
+    Stellt Haltbarkeitsmodus, Group-Commit-Fenster und Write-Back-Verzögerung ein
+    (z. B. aus der App-Konfiguration). Nicht angegebene Werte bleiben unverändert.
+    """
+    global DURABILITY, GROUP_COMMIT_WINDOW, WRITE_BACK_DELAY
+    if mode is not None:
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unbekannter Haltbarkeitsmodus: {mode}")
+        DURABILITY = mode
+    if group_commit_ms is not None:
+        GROUP_COMMIT_WINDOW = max(0.0, float(group_commit_ms)) / 1000
+    if write_back_ms is not None:
+        WRITE_BACK_DELAY = max(0.0, float(write_back_ms)) / 1000
+        if WRITE_BACK_DELAY == 0:
+            flush_pending_writes()
+
+
+def configure_storage_format(storage_format):
+    """
+    Stellt das Speicherformat ein (siehe STORAGE_FORMATS). Binärdateien entstehen beim nächsten
+    Speichern einer Datei oder mit tools/convert_format.py; veraltete werden beim Laden ignoriert.
+    """
+    global STORAGE_FORMAT
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(f"Unbekanntes Speicherformat: {storage_format}")
+    STORAGE_FORMAT = storage_format
+
+
 # Automatisches Backup für wichtige Dateien
 def schedule_backups():
     """Plant regelmäßige Backups wichtiger Dateien"""
-    files_to_backup = [JOURNALS_FILE, ENTRIES_FILE, IMAGES_FILE, TEMPLATES_FILE, STATUSES_FILE, STRATEGIES_FILE]
+    files_to_backup = [JOURNALS_FILE, TEMPLATES_FILE, STRATEGIES_FILE]
+    for journal_id in list_journal_shards():
+        files_to_backup.extend(journal_file(journal_id, c) for c in SHARDED_COLLECTIONS)
 
     for file_path in files_to_backup:
         if os.path.exists(file_path):
             create_backup(file_path)
 
-    # Plant das nächste Backup in 30 Minuten
-    threading.Timer(1800, schedule_backups).start()
+    # Plant das nächste Backup in 30 Minuten (Daemon, damit Skripte ohne Server beenden können)
+    timer = threading.Timer(1800, schedule_backups)
+    timer.daemon = True
+    timer.start()
 
 
 # Initialisierung der Dateien
@@ -302,10 +575,7 @@ def init_data_files():
 
     files = {
         JOURNALS_FILE: [],
-        ENTRIES_FILE: [],
         TEMPLATES_FILE: [],
-        STATUSES_FILE: [],
-        IMAGES_FILE: [],
         STRATEGIES_FILE: []
     }
 
@@ -313,6 +583,7 @@ def init_data_files():
     os.makedirs(DATA_DIR, exist_ok=True)
     os.makedirs(UPLOADS_DIR, exist_ok=True)
     os.makedirs(BACKUP_DIR, exist_ok=True)
+    os.makedirs(JOURNALS_DIR, exist_ok=True)
 
     for file_path, default_data in files.items():
         # Prüfe, ob die Datei existiert
@@ -326,10 +597,6 @@ def init_data_files():
                     # Versuche das JSON zu parsen
                     json.loads(content)
                     logging.info(f"Datei {file_path} ist gültig")
-
-                    # Erstelle ein Backup, wenn die Datei gültig ist (besonders für images.json)
-                    if file_path == IMAGES_FILE:
-                        create_backup(file_path)
                 else:
                     logging.warning(f"Datei {file_path} ist leer, initialisiere mit Standarddaten")
                     safe_save_data(file_path, default_data)
@@ -337,20 +604,23 @@ def init_data_files():
             except json.JSONDecodeError:
                 logging.error(f"Datei {file_path} enthält ungültiges JSON")
 
-                # Bei images.json versuchen wir eine Wiederherstellung aus dem Backup
-                if file_path == IMAGES_FILE and not restore_from_backup(file_path):
+                # Zuerst eine Wiederherstellung aus dem Backup versuchen
+                if not restore_from_backup(file_path):
                     logging.warning(
                         f"Konnte {file_path} nicht aus Backup wiederherstellen, initialisiere mit leerer Liste")
                     safe_save_data(file_path, default_data)
-                else:
-                    # Für andere Dateien initialisieren wir mit Standarddaten
-                    safe_save_data(file_path, default_data)
 
         else:
             # Datei existiert nicht, erstellen
             logging.info(f"Erstelle neue Datei {file_path}")
             safe_save_data(file_path, default_data)
 
+    # Alte globale Dateien in die Journal-Verzeichnisse verschieben
+    migrate_to_journal_shards()
+    compact_status_shards()
+    normalize_entry_shards()
+    rebuild_indexes()
+
     # Starte regelmäßige Backups
     schedule_backups()
     logging.info("Datei-Initialisierung abgeschlossen")
@@ -364,15 +634,1114 @@ def load_data(file_path):
 
 def save_data(file_path, data):
     """Speichert Daten in einer JSON-Datei."""
-    # Für images.json immer ein Backup erstellen
-    create_backup_copy = (file_path == IMAGES_FILE)
-    return safe_save_data(file_path, data, create_backup_copy)
+    # Für Bilddateien immer ein Backup erstellen
+    create_backup_copy = os.path.basename(file_path) == 'images.json'
+    saved = safe_save_data(file_path, data, create_backup_copy)
+    if file_path in (JOURNALS_FILE, TEMPLATES_FILE):
+        # Journal-Metadaten und Vorlagen sind Teil jedes Snapshots
+        drop_all_snapshots()
+    return saved
+
+
+# Journal-Verzeichnisse (Sharding)
+def journal_dir(journal_id):
+    """Gibt das Datenverzeichnis eines Journals zurück."""
+    return os.path.join(JOURNALS_DIR, str(journal_id))
+
+
+def journal_file(journal_id, collection):
+    """Gibt den Pfad einer Journal-Datei zurück (entries, statuses oder images)."""
+    return os.path.join(journal_dir(journal_id), f'{collection}.json')
+
+
+def list_journal_shards():
+    """Gibt die IDs aller Journale zurück, die ein Datenverzeichnis besitzen."""
+    if not os.path.isdir(JOURNALS_DIR):
+        return []
+    return sorted(int(name) for name in os.listdir(JOURNALS_DIR)
+                  if name.isdigit() and os.path.isdir(os.path.join(JOURNALS_DIR, name)))
+
+
+def load_journal_data(journal_id, collection):
+    """
+    Lädt eine Journal-Datei; fehlende Dateien ergeben eine leere Liste.
+    Noch nicht geschriebene Änderungen (Write-Back) haben Vorrang vor der Datei.
+    """
+    with _write_back_lock:
+        pending = _write_back.get((journal_id, collection))
+    if pending is not None:
+        # Zeilen kopieren, damit Aufrufer den gepufferten Stand nicht verändern
+        return [dict(row) for row in pending]
+
+    file_path = journal_file(journal_id, collection)
+    if not os.path.exists(file_path):
+        return []
+    return load_data(file_path)
+
+
+def save_journal_data(journal_id, collection, data):
+    """
+    Speichert eine Journal-Datei. Bei aktivem Write-Back wird nur der Puffer ersetzt;
+    die übergebene Liste darf danach nicht mehr verändert werden.
+    """
+    if collection == 'entries':
+        bump_entries_generation(journal_id)
+    if WRITE_BACK_DELAY > 0:
+        buffer_journal_data(journal_id, collection, data)
+        saved = True
+    else:
+        saved = save_data(journal_file(journal_id, collection), data)
+
+    txn = active_transaction(journal_id)
+    if txn is None:
+        drop_snapshot(journal_id)  # Schreibzugriff ohne Transaktion (z. B. Werkzeuge)
+    elif saved:
+        txn.saved[collection] = data
+    else:
+        txn.invalid = True
+    return saved
+
+
+# Write-Back-Puffer
+# Gespeicherte Journal-Dateien werden nur im Speicher ersetzt und sind sofort für alle Leser
+# sichtbar. Ein Hintergrund-Thread schreibt sie spätestens WRITE_BACK_DELAY nach der ersten
+# Änderung; mehrere Änderungen derselben Datei ergeben dabei einen einzigen Schreibvorgang.
+_write_back = {}  # (journal_id, collection) -> zuletzt gespeicherte Liste
+_pending_entries = set()  # Journale, deren entries.json im Puffer liegt
+_write_back_lock = threading.Lock()
+_write_back_cond = threading.Condition(_write_back_lock)
+_write_back_deadline = 0.0
+_write_back_thread = None
+# Kennungen gepufferter Stände gelten nur in diesem Prozess und werden nie gespeichert
+PROCESS_TOKEN = uuid.uuid4().hex
+
+
+def entries_pending(journal_id):
+    """Liegen Änderungen an entries.json noch im Write-Back-Puffer?"""
+    with _write_back_lock:
+        return journal_id in _pending_entries
+
+
+def buffer_journal_data(journal_id, collection, data):
+    """Legt den neuen Stand einer Journal-Datei im Write-Back-Puffer ab."""
+    global _write_back_deadline, _write_back_thread
+    with _write_back_cond:
+        if not _write_back:
+            _write_back_deadline = time.monotonic() + WRITE_BACK_DELAY
+        _write_back[(journal_id, collection)] = data
+        if collection == 'entries':
+            _pending_entries.add(journal_id)
+
+        if _write_back_thread is None or not _write_back_thread.is_alive():
+            _write_back_thread = threading.Thread(target=_write_back_loop, name='write-back', daemon=True)
+            _write_back_thread.start()
+        _write_back_cond.notify()
+
+
+def _write_back_loop():
+    """Schreibt den Puffer, sobald die Verzögerung seit der ersten Änderung abgelaufen ist."""
+    while True:
+        with _write_back_cond:
+            while not _write_back:
+                _write_back_cond.wait()
+            remaining = _write_back_deadline - time.monotonic()
+            while remaining > 0 and _write_back:
+                _write_back_cond.wait(remaining)
+                remaining = _write_back_deadline - time.monotonic()
+        try:
+            flush_pending_writes()
+        except Exception as e:
+            logging.error(f"Fehler beim Schreiben des Write-Back-Puffers: {e}")
+            time.sleep(1)
+
+
+def flush_journal(journal_id):
+    """Schreibt die gepufferten Dateien eines Journals (innerhalb der Journal-Transaktion)."""
+    written = 0
+    with journal_transaction(journal_id):
+        pending_signature = entries_signature(journal_id) if entries_pending(journal_id) else None
+        with _write_back_lock:
+            pending = {c: _write_back.pop((journal_id, c)) for c in SHARDED_COLLECTIONS
+                       if (journal_id, c) in _write_back}
+            _pending_entries.discard(journal_id)
+
+        for collection, data in pending.items():
+            if save_data(journal_file(journal_id, collection), data):
+                written += 1
+                continue
+            # Fehlgeschlagen: im Puffer lassen und beim nächsten Durchlauf erneut versuchen
+            logging.error(f"Write-Back von {collection} (Journal {journal_id}) fehlgeschlagen")
+            # Gleicher Speicherzähler, daher wieder dieselbe Kennung wie vor dem Versuch
+            buffer_journal_data(journal_id, collection, data)
+            if collection == 'entries':
+                pending_signature = None
+
+        if pending_signature is not None:
+            resign_derived_indexes(journal_id, pending_signature, entries_signature(journal_id))
+    return written
+
+
+def flush_pending_writes():
+    """Schreibt alle gepufferten Änderungen sofort (z. B. beim Beenden); gibt die Anzahl der Dateien zurück."""
+    with _write_back_lock:
+        journal_ids = sorted({journal_id for journal_id, _ in _write_back})
+    return sum(flush_journal(journal_id) for journal_id in journal_ids)
+
+
+def discard_pending_writes(journal_id):
+    """Verwirft gepufferte Änderungen eines Journals (beim Löschen des Journals)."""
+    with _write_back_lock:
+        for collection in SHARDED_COLLECTIONS:
+            _write_back.pop((journal_id, collection), None)
+        _pending_entries.discard(journal_id)
+
+
+atexit.register(flush_pending_writes)
+
+
+# Indizes: Eintrag -> Journal und Bild -> Eintrag
+# Werden beim Start aus den Journal-Verzeichnissen aufgebaut und bei Änderungen gepflegt,
+# damit get_entry(entry_id) & Co. nur die Dateien eines Journals lesen müssen.
+_index_lock = threading.RLock()
+_entry_journal_index = {}
+_image_entry_index = {}
+_upload_hashes = {}  # Dateiname im Upload-Verzeichnis -> SHA-256 des Inhalts (für ETags)
+_next_entry_id = 1  # Laufende Zähler für neue IDs; vergebene IDs werden nie erneut vergeben
+_next_image_id = 1
+
+
+def rebuild_indexes():
+    """Baut die Indizes aus den Journal-Verzeichnissen neu auf."""
+    global _next_entry_id, _next_image_id
+    entry_index = {}
+    image_index = {}
+    upload_hashes = {}
+    for journal_id in list_journal_shards():
+        for entry in load_journal_data(journal_id, 'entries'):
+            entry_index[entry['id']] = journal_id
+        for image in load_journal_data(journal_id, 'images'):
+            image_index[image['id']] = image['entry_id']
+            if image.get('file_path') and image.get('sha256'):
+                upload_hashes[image['file_path']] = image['sha256']
+
+    with _index_lock:
+        _entry_journal_index.clear()
+        _entry_journal_index.update(entry_index)
+        _image_entry_index.clear()
+        _image_entry_index.update(image_index)
+        _upload_hashes.clear()
+        _upload_hashes.update(upload_hashes)
+        _next_entry_id = max(_next_entry_id, max(entry_index, default=0) + 1)
+        _next_image_id = max(_next_image_id, max(image_index, default=0) + 1)
+
+
+def upload_content_hash(filename):
+    """
+    SHA-256 einer hochgeladenen Datei aus den Bild-Metadaten. Für ältere Uploads ohne
+    gespeicherten Hash wird er einmalig aus der Datei berechnet (der Name ist bereits geprüft).
+    """
+    with _index_lock:
+        content_hash = _upload_hashes.get(filename)
+    if content_hash is not None:
+        return content_hash
+
+    digest = hashlib.sha256()
+    try:
+        with open(os.path.join(UPLOADS_DIR, filename), 'rb') as f:
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    with _index_lock:
+        _upload_hashes[filename] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def get_entry_journal_id(entry_id):
+    """Gibt die Journal-ID eines Eintrags zurück (oder None)."""
+    with _index_lock:
+        return _entry_journal_index.get(entry_id)
+
+
+def allocate_entry_id():
+    """
+    Reserviert eine neue, journalübergreifend eindeutige Eintrags-ID. In den Index kommt sie
+    erst nach dem Speichern (register_entry); schlägt das fehl, bleibt nur eine Lücke.
+    """
+    global _next_entry_id
+    with _index_lock:
+        new_id = _next_entry_id
+        _next_entry_id += 1
+        return new_id
+
+
+def allocate_image_id():
+    """Reserviert eine neue, journalübergreifend eindeutige Bild-ID (siehe allocate_entry_id)."""
+    global _next_image_id
+    with _index_lock:
+        new_id = _next_image_id
+        _next_image_id += 1
+        return new_id
+
+
+def register_entry(entry_id, journal_id):
+    """Nimmt einen gespeicherten Eintrag in den Index auf."""
+    with _index_lock:
+        _entry_journal_index[entry_id] = journal_id
+
+
+def register_image(image_id, entry_id):
+    """Nimmt ein gespeichertes Bild in den Index auf."""
+    with _index_lock:
+        _image_entry_index[image_id] = entry_id
+
+
+def next_free_ids():
+    """Nächste freie Eintrags- und Bild-ID (für Werkzeuge, die Daten direkt schreiben)."""
+    with _index_lock:
+        return _next_entry_id, _next_image_id
+
+
+def forget_entries(entry_ids):
+    """Entfernt Einträge und deren Bilder aus den Indizes."""
+    entry_ids = set(entry_ids)
+    with _index_lock:
+        for entry_id in entry_ids:
+            _entry_journal_index.pop(entry_id, None)
+        for image_id in [i for i, e in _image_entry_index.items() if e in entry_ids]:
+            del _image_entry_index[image_id]
+
+
+# Journal-Transaktionen
+# Eine Transaktion hält die Sperre eines Journals über mehrere Dateien hinweg (Einträge,
+# Status, Bilder). Bilddateien, die dabei gelöscht werden sollen, werden erst nach
+# erfolgreichem Abschluss an den Hintergrund-Reaper übergeben.
+_journal_locks = {}
+_journal_locks_guard = threading.Lock()
+_active_transactions = threading.local()
+
+
+class JournalTransaction:
+    """Sammelt Nacharbeiten, die erst nach Abschluss einer Journal-Transaktion laufen."""
+
+    def __init__(self, journal_id):
+        self.journal_id = journal_id
+        self.files_to_delete = []
+        self.saved = {}  # collection -> gespeicherte Liste (für den neuen Snapshot)
+        self.invalid = False  # Fehler oder fehlgeschlagenes Speichern: Snapshot verwerfen
+
+    def delete_file_after_commit(self, image):
+        """Merkt die Datei eines Bildes zum Löschen nach dem Commit vor."""
+        if image.get('file_path') and image['file_path'] != 'None':
+            self.files_to_delete.append(image['file_path'])
+
+
+def journal_lock(journal_id):
+    """Gibt die (wiedereintrittsfähige) Sperre eines Journals zurück."""
+    with _journal_locks_guard:
+        return _journal_locks.setdefault(journal_id, threading.RLock())
+
+
+def active_transaction(journal_id):
+    """Gibt die offene Transaktion des aktuellen Threads für ein Journal zurück (oder None)."""
+    active = getattr(_active_transactions, 'by_journal', None)
+    return active.get(journal_id) if active else None
+
+
+@contextmanager
+def journal_transaction(journal_id):
+    """
+    Führt mehrere Lese-/Schreibvorgänge eines Journals unter einer Sperre aus.
+    Verschachtelte Aufrufe im selben Thread teilen sich die äußere Transaktion.
+    """
+    active = getattr(_active_transactions, 'by_journal', None)
+    if active is None:
+        active = _active_transactions.by_journal = {}
+
+    if journal_id in active:
+        yield active[journal_id]
+        return
+
+    lock = journal_lock(journal_id)
+    if not lock.acquire(timeout=LOCK_TIMEOUT):
+        raise TimeoutError(f"Timeout beim Erwerb der Sperre für Journal {journal_id}")
+
+    txn = JournalTransaction(journal_id)
+    active[journal_id] = txn
+    try:
+        yield txn
+    except BaseException:
+        txn.invalid = True
+        raise
+    finally:
+        # Neue Version noch unter der Sperre veröffentlichen (Reihenfolge = Commit-Reihenfolge)
+        publish_snapshot(txn)
+        del active[journal_id]
+        lock.release()
+
+    # Nur nach erfolgreichem Abschluss: Dateien im Hintergrund löschen. Bei aktivem Write-Back
+    # zuerst die Bildliste schreiben, damit auf der Platte keine Verweise auf gelöschte Dateien bleiben.
+    if txn.files_to_delete and WRITE_BACK_DELAY > 0:
+        flush_journal(journal_id)
+    reap_upload_files(txn.files_to_delete)
+
+
+# MVCC-Snapshots
+# Leser arbeiten auf einer unveränderlichen Momentaufnahme eines Journals (Einträge, Status,
+# Bilder, Vorlagen und Metadaten aus demselben Stand) und halten dabei keine Sperre.
+# Schreibende Transaktionen veröffentlichen beim Commit eine neue Version, in der nur die
+# gespeicherten Sammlungen ersetzt sind (Copy-on-Write); ältere Snapshots bleiben gültig,
+# solange Leser sie verwenden. Die Zeilen eines Snapshots dürfen nicht verändert werden.
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+_snapshot_versions = itertools.count(1)
+_snapshot_generation = 0  # wird bei Änderungen an journals.json/templates.json erhöht
+
+
+class JournalSnapshot:
+    """Unveränderlicher, in sich konsistenter Stand eines Journals."""
+
+    __slots__ = ('journal_id', 'version', 'journal', 'templates', 'entries', 'statuses', 'images',
+                 'signature', '_records')
+
+    def __init__(self, journal_id, version, journal, templates, entries, statuses, images, signature):
+        self.journal_id = journal_id
+        self.version = version
+        self.journal = journal
+        self.templates = tuple(templates)
+        self.entries = tuple(entries)
+        self.statuses = tuple(statuses)
+        self.images = tuple(images)
+        self.signature = signature
+        self._records = None
+
+    def derive(self, saved, signature):
+        """Neue Version, in der die gespeicherten Sammlungen ersetzt sind."""
+        return JournalSnapshot(
+            self.journal_id, next(_snapshot_versions), self.journal, self.templates,
+            saved.get('entries', self.entries), saved.get('statuses', self.statuses),
+            saved.get('images', self.images),
+            signature if 'entries' in saved else self.signature
+        )
+
+    def records(self):
+        """Einträge als EntryRecords (einmal je Snapshot, wenn möglich aus dem Record-Cache)."""
+        if self._records is None:
+            with _record_cache_lock:
+                cached = _record_cache.get(self.journal_id)
+            if cached and cached[0] == self.signature:
+                self._records = cached[1]
+            else:
+                self._records = [EntryRecord.from_dict(e) for e in self.entries]
+                if self.signature is not None and self.signature == entries_signature(self.journal_id):
+                    with _record_cache_lock:
+                        _record_cache[self.journal_id] = (self.signature, self._records)
+        return self._records
+
+
+def build_snapshot(journal_id):
+    """Liest alle Dateien eines Journals in einen Snapshot (innerhalb der Journal-Transaktion)."""
+    journal = find_journal(journal_id)
+    if journal is None:
+        return None
+    return JournalSnapshot(
+        journal_id, next(_snapshot_versions), journal, get_checklist_templates(journal_id),
+        load_journal_data(journal_id, 'entries'), load_journal_data(journal_id, 'statuses'),
+        load_journal_data(journal_id, 'images'), entries_signature(journal_id)
+    )
+
+
+def journal_snapshot(journal_id):
+    """
+    Gibt den aktuellen Snapshot eines Journals zurück (None, wenn es nicht existiert).
+    Innerhalb einer schreibenden Transaktion sieht der Aufrufer seine eigenen Änderungen.
+    """
+    txn = active_transaction(journal_id)
+    with _snapshot_lock:
+        snapshot = _snapshots.get(journal_id)
+        generation = _snapshot_generation
+
+    if txn is not None and txn.saved:
+        # Noch nicht veröffentlichte eigene Änderungen einbeziehen
+        if snapshot is None:
+            return build_snapshot(journal_id)
+        return snapshot.derive(txn.saved, entries_signature(journal_id))
+    if snapshot is not None:
+        return snapshot
+
+    # Kein Snapshot vorhanden: einmalig unter der Journal-Sperre aufbauen
+    with journal_transaction(journal_id):
+        with _snapshot_lock:
+            snapshot = _snapshots.get(journal_id)
+        if snapshot is not None:
+            return snapshot
+        snapshot = build_snapshot(journal_id)
+        with _snapshot_lock:
+            if snapshot is not None and generation == _snapshot_generation:
+                _snapshots[journal_id] = snapshot
+    return snapshot
+
+
+def publish_snapshot(txn):
+    """Veröffentlicht beim Commit einer Transaktion die neue Snapshot-Version."""
+    if txn.invalid:
+        drop_snapshot(txn.journal_id)
+        return
+    if not txn.saved:
+        return
+    signature = entries_signature(txn.journal_id) if 'entries' in txn.saved else None
+    with _snapshot_lock:
+        current = _snapshots.get(txn.journal_id)
+        if current is not None:
+            # Ohne vorhandenen Snapshot baut der nächste Leser ihn auf
+            _snapshots[txn.journal_id] = current.derive(txn.saved, signature)
+    mark_statistics_stale(txn.journal_id)
+
+
+def drop_snapshot(journal_id):
+    with _snapshot_lock:
+        _snapshots.pop(journal_id, None)
+    mark_statistics_stale(journal_id)
+
+
+def drop_all_snapshots():
+    global _snapshot_generation
+    with _snapshot_lock:
+        _snapshots.clear()
+        _snapshot_generation += 1
+    mark_statistics_stale()
+
+
+# Hintergrund-Reaper für Bilddateien
+_reaper_queue = queue.Queue()
+_reaper_thread = None
+_reaper_guard = threading.Lock()
+
+
+def _reaper_loop():
+    """Löscht Bilddateien aus der Warteschlange, bis der Prozess endet."""
+    while True:
+        filename = _reaper_queue.get()
+        try:
+            delete_image_file({'file_path': filename})
+        finally:
+            _reaper_queue.task_done()
+
+
+def reap_upload_files(filenames):
+    """Übergibt Bilddateien zum Löschen an den Hintergrund-Thread."""
+    global _reaper_thread
+    if not filenames:
+        return
+
+    with _reaper_guard:
+        if _reaper_thread is None or not _reaper_thread.is_alive():
+            _reaper_thread = threading.Thread(target=_reaper_loop, name='upload-reaper', daemon=True)
+            _reaper_thread.start()
+
+    with _index_lock:
+        for filename in filenames:
+            _upload_hashes.pop(filename, None)
+    for filename in filenames:
+        _reaper_queue.put(filename)
+
+
+def wait_for_reaper():
+    """Blockiert, bis alle vorgemerkten Bilddateien gelöscht sind."""
+    _reaper_queue.join()
+
+
+def migrate_to_journal_shards():
+    """
+    Verschiebt Einträge, Status und Bilder aus den alten globalen Dateien in die
+    Journal-Verzeichnisse. Bereits vorhandene Zeilen werden nicht doppelt übernommen,
+    die alten Dateien werden danach in *.migrated umbenannt.
+    """
+    legacy_files = [(ENTRIES_FILE, 'entries'), (STATUSES_FILE, 'statuses'), (IMAGES_FILE, 'images')]
+    if not any(os.path.exists(path) for path, _ in legacy_files):
+        return False
+
+    logging.info("Migriere globale Datendateien in Journal-Verzeichnisse...")
+
+    # Zuordnung Eintrag -> Journal aus bereits migrierten und alten Einträgen
+    rebuild_indexes()
+    with _index_lock:
+        entry_journal = dict(_entry_journal_index)
+    legacy_entries = load_data(ENTRIES_FILE) if os.path.exists(ENTRIES_FILE) else []
+    for entry in legacy_entries:
+        entry_journal[entry['id']] = entry['journal_id']
+
+    def row_key(collection, row):
+        if collection == 'statuses':
+            return (row['entry_id'], row.get('template_id'))
+        return row['id']
+
+    for file_path, collection in legacy_files:
+        if not os.path.exists(file_path):
+            continue
+
+        rows = legacy_entries if collection == 'entries' else load_data(file_path)
+        grouped = {}
+        orphaned = 0
+        for row in rows:
+            journal_id = row['journal_id'] if collection == 'entries' else entry_journal.get(row['entry_id'])
+            if journal_id is None:
+                orphaned += 1
+                continue
+            grouped.setdefault(journal_id, []).append(row)
+
+        if orphaned:
+            logging.warning(f"{orphaned} verwaiste Zeilen in {file_path} werden nicht migriert")
+
+        for journal_id, journal_rows in grouped.items():
+            existing = load_journal_data(journal_id, collection)
+            known = {row_key(collection, row) for row in existing}
+            existing.extend(row for row in journal_rows if row_key(collection, row) not in known)
+            if not save_journal_data(journal_id, collection, existing):
+                logging.error(f"Migration von {file_path} für Journal {journal_id} fehlgeschlagen")
+                return False
+
+        os.replace(file_path, f"{file_path}.migrated")
+        logging.info(f"{file_path} migriert ({len(rows)} Zeilen)")
+
+    return True
+
+
+# Checklistenstatus als Bitmasken
+# statuses.json eines Journals enthält eine Zeile pro Eintrag:
+#   {'entry_id': 12, 'known': 0b0111, 'checked': 0b0101}
+# Bit n steht für die Vorlage mit order == n. 'known' markiert die Vorlagen, für die der
+# Eintrag einen Status besitzt (Einträge, die vor einer Vorlage angelegt wurden, haben keinen),
+# 'checked' die angehakten Vorlagen.
+popcount = getattr(int, 'bit_count', None) or (lambda value: bin(value).count('1'))
+
+
+def template_bit(template):
+    """Gibt die Bitmaske einer Checklistenvorlage zurück."""
+    return 1 << template['order']
+
+
+def is_legacy_status(row):
+    """Erkennt alte Statuszeilen im Format {'entry_id', 'template_id', 'checked'}."""
+    return 'template_id' in row
+
+
+def compact_statuses(statuses, templates):
+    """
+    Wandelt alte Statuszeilen (eine pro Eintrag und Vorlage) in Bitmasken-Zeilen um.
+    Bereits kompakte Zeilen bleiben erhalten, alte Zeilen werden hineingemischt.
+    """
+    template_map = {t['id']: t for t in templates}
+    rows = {}
+    for row in statuses:
+        if is_legacy_status(row):
+            continue
+        rows[row['entry_id']] = {'entry_id': row['entry_id'], 'known': row['known'], 'checked': row['checked']}
+
+    for row in statuses:
+        if not is_legacy_status(row):
+            continue
+        template = template_map.get(row['template_id'])
+        if template is None:
+            continue  # Status einer gelöschten Vorlage
+        compact = rows.setdefault(row['entry_id'], {'entry_id': row['entry_id'], 'known': 0, 'checked': 0})
+        bit = template_bit(template)
+        compact['known'] |= bit
+        if row['checked']:
+            compact['checked'] |= bit
+        else:
+            compact['checked'] &= ~bit
+
+    return list(rows.values())
+
+
+def compact_status_shards():
+    """Migriert die statuses.json aller Journale in das Bitmasken-Format."""
+    templates = load_data(TEMPLATES_FILE)
+    for journal_id in list_journal_shards():
+        statuses = load_journal_data(journal_id, 'statuses')
+        if not any(is_legacy_status(row) for row in statuses):
+            continue
+
+        journal_templates = [t for t in templates if t['journal_id'] == journal_id]
+        compacted = compact_statuses(statuses, journal_templates)
+        if save_journal_data(journal_id, 'statuses', compacted):
+            logging.info(f"Checklistenstatus von Journal {journal_id} kompaktiert: "
+                         f"{len(statuses)} -> {len(compacted)} Zeilen")
+
+
+def journal_timezones(journal):
+    """
+    Gibt (Eingabe-Zeitzone, Auswertungs-Zeitzone) eines Journals zurück.
+    'timezone' gilt für Datumswerte ohne Zeitzone (z. B. aus dem Formular),
+    'bucket_timezone' für Stunde/Wochentag/Datum/Monat und die Sessions (Standard: wie 'timezone').
+    """
+    journal = journal or {}
+    input_name = journal.get('timezone') or DEFAULT_TIMEZONE
+    bucket_name = journal.get('bucket_timezone') or input_name
+    try:
+        return resolve_timezone(input_name), resolve_timezone(bucket_name, 'bucket_timezone')
+    except ValidationError as e:
+        logging.error(f"Journal {journal.get('id')}: {e.message}, verwende UTC")
+        utc = resolve_timezone(DEFAULT_TIMEZONE)
+        return utc, utc
+
+
+def find_journal(journal_id):
+    """Gibt die Metadaten eines Journals ohne Checklistenvorlagen zurück."""
+    return next((j for j in load_data(JOURNALS_FILE) if j['id'] == journal_id), None)
+
+
+def rederive_entry_dates(journal_id, input_tz, bucket_tz):
+    """
+    Berechnet UTC-Form, Epoch und Gruppierungsschlüssel aller Einträge eines Journals neu.
+    Wird nur aufgerufen, wenn sich die Zeitzonen des Journals ändern.
+    """
+    with journal_transaction(journal_id):
+        entries = load_journal_data(journal_id, 'entries')
+        for entry in entries:
+            dates = {field: entry.get(field) for field in ('entry_date', 'end_date')}
+            normalize_entry_fields(dates, strict=False, input_tz=input_tz, bucket_tz=bucket_tz)
+            entry.update(dates)
+        if entries:
+            save_journal_data(journal_id, 'entries', entries)
+
+
+def normalize_entry_shards():
+    """
+    Einmalige Migration: normalisiert die Einträge aller Journale (Zahlen, Aufzählungen,
+    Datumsfelder, Gruppierungsschlüssel). Einträge mit 'entry_ts' und passender
+    'bucket_tz' gelten als bereits normalisiert.
+    Ungültige Altwerte werden auf None gesetzt und protokolliert.
+    """
+    journals = {j['id']: j for j in load_data(JOURNALS_FILE)}
+    for journal_id in list_journal_shards():
+        input_tz, bucket_tz = journal_timezones(journals.get(journal_id))
+        entries = load_journal_data(journal_id, 'entries')
+        pending = [e for e in entries
+                   if 'entry_ts' not in e or (e.get('entry_ts') is not None and e.get('bucket_tz') != str(bucket_tz))]
+        if not pending:
+            continue
+
+        for entry in pending:
+            rejected = normalize_entry_fields(entry, strict=False, input_tz=input_tz, bucket_tz=bucket_tz)
+            if rejected:
+                logging.warning(f"Eintrag {entry['id']}: ungültige Werte verworfen ({', '.join(rejected)})")
+
+        if save_journal_data(journal_id, 'entries', entries):
+            logging.info(f"{len(pending)} Einträge in Journal {journal_id} normalisiert")
+
+
+# Cache der typisierten Datensätze pro Journal, gültig solange sich entries.json nicht ändert
+_record_cache = {}
+_record_cache_lock = threading.Lock()
+
+# Speicherzähler je Journal: Die Dateikennung (Inode, mtime, Größe) allein kann sich bei zwei
+# schnell aufeinanderfolgenden Speicherungen wiederholen, der Zähler nicht
+_entries_generations = {}
+_entries_generations_lock = threading.Lock()
+
+
+def bump_entries_generation(journal_id):
+    """Erhöht den Speicherzähler von entries.json (bei jeder Speicherung, vor dem Schreiben)."""
+    with _entries_generations_lock:
+        _entries_generations[journal_id] = _entries_generations.get(journal_id, 0) + 1
+
+
+def entries_signature(journal_id):
+    """
+    Kennung des aktuellen Stands von entries.json (None, wenn die Datei fehlt): Speicherzähler
+    plus Dateikennung, solange Änderungen im Write-Back-Puffer liegen die Kennung des Puffers.
+    """
+    with _entries_generations_lock:
+        generation = _entries_generations.get(journal_id, 0)
+    if entries_pending(journal_id):
+        return (generation, 'pending', PROCESS_TOKEN)
+    try:
+        stat = os.stat(journal_file(journal_id, 'entries'))
+    except OSError:
+        return None
+    return (generation, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def get_entry_records(journal_id):
+    """Gibt die Einträge eines Journals als EntryRecord-Liste zurück (gecacht)."""
+    signature = entries_signature(journal_id)
+    if signature is None:
+        return []
+
+    with _record_cache_lock:
+        cached = _record_cache.get(journal_id)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    # Kennung und Inhalt unter der Journal-Sperre lesen, damit sie zum selben Stand gehören
+    with journal_transaction(journal_id):
+        signature = entries_signature(journal_id)
+        if signature is None:
+            return []
+        records = [EntryRecord.from_dict(e) for e in load_journal_data(journal_id, 'entries')]
+    with _record_cache_lock:
+        _record_cache[journal_id] = (signature, records)
+    return records
+
+
+# Tages-Rollups pro Journal; werden bei Schreibvorgängen inkrementell angepasst
+_rollup_cache = {}
+_rollup_lock = threading.Lock()
+
+
+def get_rollups(journal_id):
+    """
+    Gibt den Rollup-Index eines Journals zurück.
+    Passt die Dateikennung nicht mehr (z.B. nach Migration oder Backup-Wiederherstellung),
+    wird der Index aus den Einträgen neu aufgebaut - unter der Journal-Sperre, damit Kennung
+    und gelesene Einträge zum selben Stand gehören (sonst würde update_rollups eine bereits
+    enthaltene Änderung ein zweites Mal anwenden).
+    """
+    signature = entries_signature(journal_id)
+    with _rollup_lock:
+        rollups = _rollup_cache.get(journal_id)
+    if rollups is not None and rollups.signature == signature:
+        return rollups
+
+    with journal_transaction(journal_id):
+        signature = entries_signature(journal_id)
+        with _rollup_lock:
+            rollups = _rollup_cache.get(journal_id)
+        if rollups is None or rollups.signature != signature:
+            rollups = JournalRollups.build(get_entry_records(journal_id), signature)
+            with _rollup_lock:
+                _rollup_cache[journal_id] = rollups
+        return rollups
+
+
+def update_rollups(journal_id, previous_signature, removed=(), added=()):
+    """
+    Überträgt eine Änderung an entries.json auf den Rollup-Index (innerhalb der Journal-Transaktion).
+    removed/added enthalten die alten bzw. neuen Fassungen der geänderten Einträge.
+    """
+    with _rollup_lock:
+        rollups = _rollup_cache.get(journal_id)
+        if rollups is None:
+            return
+        if rollups.signature != previous_signature:
+            # Index war bereits veraltet, beim nächsten Zugriff neu aufbauen
+            del _rollup_cache[journal_id]
+            return
+
+        for entry in removed:
+            rollups.apply(EntryRecord.from_dict(entry), -1)
+        for entry in added:
+            rollups.apply(EntryRecord.from_dict(entry))
+        rollups.signature = entries_signature(journal_id)
+
+
+# Volltextindex pro Journal (im Speicher und als search_index.json im Journal-Verzeichnis)
+# Die Datei wird verzögert im Hintergrund geschrieben (SEARCH_INDEX_SAVE_DELAY nach der ersten
+# Änderung und beim Beenden), nicht bei jedem Schreibvorgang. Sie trägt statt der Kennung des
+# Prozesses die SHA-256 der entries.json, zu der sie gehört; passt diese nicht mehr (z. B. nach
+# einem Absturz vor dem Schreiben), wird der Index neu aufgebaut.
+SEARCH_INDEX_SAVE_DELAY = 5.0  # Sekunden
+_search_cache = {}
+_search_lock = threading.Lock()
+_search_dirty = set()
+_search_save_timer = None
+
+
+def search_index_file(journal_id):
+    return os.path.join(journal_dir(journal_id), 'search_index.json')
+
+
+def entries_content_hash(journal_id):
+    """SHA-256 der entries.json auf der Platte (None, wenn sie fehlt)."""
+    try:
+        with open(journal_file(journal_id, 'entries'), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def save_search_index(journal_id):
+    """
+    Schreibt den Suchindex eines Journals, sofern er zum Stand der entries.json auf der Platte
+    passt (abgeleitete Daten, daher ohne Backup). Gibt True zurück, wenn geschrieben wurde.
+    """
+    with journal_transaction(journal_id):
+        if entries_pending(journal_id):
+            return False  # nach dem Write-Back wird erneut geplant
+        with _search_lock:
+            index = _search_cache.get(journal_id)
+            if index is None or index.signature != entries_signature(journal_id):
+                return False
+            data = index.to_dict()
+        content_hash = entries_content_hash(journal_id)
+    if content_hash is None:
+        return False
+
+    data['signature'] = ['sha256', content_hash]
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    file_path = search_index_file(journal_id)
+    with journal_transaction(journal_id):
+        if not os.path.isdir(journal_dir(journal_id)):
+            return False  # Journal wurde inzwischen gelöscht
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix='.search-', suffix='.tmp', dir=os.path.dirname(file_path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+            return True
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern des Suchindex für Journal {journal_id}: {e}")
+            return False
+
+
+def schedule_search_index_save(journal_id):
+    """Merkt den Suchindex zum verzögerten Schreiben vor."""
+    global _search_save_timer
+    with _search_lock:
+        _search_dirty.add(journal_id)
+        if _search_save_timer is not None:
+            return
+        _search_save_timer = threading.Timer(SEARCH_INDEX_SAVE_DELAY, save_dirty_search_indexes)
+        _search_save_timer.daemon = True
+        _search_save_timer.start()
+
+
+def save_dirty_search_indexes():
+    """Schreibt alle vorgemerkten Suchindizes."""
+    global _search_save_timer
+    with _search_lock:
+        journal_ids = sorted(_search_dirty)
+        _search_dirty.clear()
+        _search_save_timer = None
+    for journal_id in journal_ids:
+        try:
+            save_search_index(journal_id)
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern des Suchindex für Journal {journal_id}: {e}")
+
+
+def _save_search_indexes_at_exit():
+    # Zuerst den Write-Back-Puffer schreiben, sonst passt kein Index zur Datei
+    flush_pending_writes()
+    save_dirty_search_indexes()
+
+
+atexit.register(_save_search_indexes_at_exit)
+
+
+def load_search_index(journal_id):
+    """
+    Liest den gespeicherten Suchindex (None, wenn er fehlt, beschädigt ist oder nicht zur
+    aktuellen entries.json gehört). Aufruf unter der Journal-Sperre ohne gepufferte Einträge.
+    """
+    try:
+        with open(search_index_file(journal_id), 'r', encoding='utf-8') as f:
+            index = SearchIndex.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    content_hash = entries_content_hash(journal_id)
+    if content_hash is None or index.signature != ('sha256', content_hash):
+        return None
+    return index
+
+
+def get_search_index(journal_id):
+    """
+    Gibt den Suchindex eines Journals zurück. Reihenfolge: Speicher, Datei, Neuaufbau.
+    Ein Index gilt nur, solange seine Kennung zu entries.json passt; Laden und Neuaufbau
+    laufen unter der Journal-Sperre, damit Kennung und Inhalt zum selben Stand gehören.
+    """
+    signature = entries_signature(journal_id)
+    with _search_lock:
+        index = _search_cache.get(journal_id)
+    if index is not None and index.signature == signature:
+        return index
+
+    with journal_transaction(journal_id):
+        signature = entries_signature(journal_id)
+        with _search_lock:
+            index = _search_cache.get(journal_id)
+        if index is not None and index.signature == signature:
+            return index
+
+        index = None if entries_pending(journal_id) else load_search_index(journal_id)
+        if index is None:
+            index = SearchIndex.build(load_journal_data(journal_id, 'entries'))
+            schedule_search_index_save(journal_id)
+            logging.info(f"Suchindex für Journal {journal_id} neu aufgebaut")
+        index.signature = signature
+
+        with _search_lock:
+            _search_cache[journal_id] = index
+        return index
+
+
+def update_search_index(journal_id, previous_signature, removed=(), added=()):
+    """Überträgt eine Änderung an entries.json auf den Suchindex (innerhalb der Journal-Transaktion)."""
+    with _search_lock:
+        index = _search_cache.get(journal_id)
+        if index is None or index.signature != previous_signature:
+            # Kein passender Index vorhanden: wird bei der nächsten Suche neu aufgebaut
+            _search_cache.pop(journal_id, None)
+            return
+
+        for entry in removed:
+            index.remove(entry)
+        for entry in added:
+            index.add(entry)
+        index.signature = entries_signature(journal_id)
+    schedule_search_index_save(journal_id)
+
+
+def resign_derived_indexes(journal_id, old_signature, new_signature):
+    """
+    Überträgt die abgeleiteten Indizes nach dem Schreiben des Write-Back-Puffers auf die
+    neue Dateikennung, statt sie neu aufzubauen (der Inhalt ist derselbe).
+    """
+    with _record_cache_lock:
+        cached = _record_cache.get(journal_id)
+        if cached and cached[0] == old_signature:
+            _record_cache[journal_id] = (new_signature, cached[1])
+    with _rollup_lock:
+        rollups = _rollup_cache.get(journal_id)
+        if rollups is not None and rollups.signature == old_signature:
+            rollups.signature = new_signature
+    with _search_lock:
+        index = _search_cache.get(journal_id)
+        resigned = index is not None and index.signature == old_signature
+        if resigned:
+            index.signature = new_signature
+    if resigned:
+        # Jetzt passt der Index zur geschriebenen Datei
+        schedule_search_index_save(journal_id)
+
+
+def entries_changed(journal_id, previous_signature, removed=(), added=()):
+    """Aktualisiert die abgeleiteten Indizes nach einer Änderung an entries.json."""
+    update_rollups(journal_id, previous_signature, removed, added)
+    update_search_index(journal_id, previous_signature, removed, added)
+
+
+def search_entries(journal_id, query, page=1, per_page=20):
+    """
+    Volltextsuche über Notizen, Symbol, Strategie und Emotion eines Journals.
+    Gibt die Trefferzahl und eine Seite der nach Relevanz sortierten Einträge zurück.
+    """
+    hits = get_search_index(journal_id).search(query)
+    page_hits = hits[(page - 1) * per_page:page * per_page]
+
+    entries_by_id = {}
+    if page_hits:
+        wanted = {entry_id for entry_id, _ in page_hits}
+        entries_by_id = {e['id']: e for e in load_journal_data(journal_id, 'entries') if e['id'] in wanted}
+
+    results = []
+    for entry_id, score in page_hits:
+        entry = entries_by_id.get(entry_id)
+        if entry is None:
+            continue
+        results.append({
+            'entry_id': entry_id,
+            'score': round(score, 4),
+            'entry_date': entry.get('entry_date'),
+            'symbol': entry.get('symbol'),
+            'strategy': entry.get('strategy'),
+            'result': entry.get('result'),
+            'pnl': entry.get('pnl'),
+            'emotion': entry.get('emotion'),
+            'snippet': make_snippet(entry.get('notes'), query)
+        })
+
+    return {
+        'query': query,
+        'total': len(hits),
+        'page': page,
+        'per_page': per_page,
+        'results': results
+    }
+
+
+def expand_status_row(row, templates):
+    """Gibt die Status einer Bitmasken-Zeile im alten Zeilenformat zurück (API-Kompatibilität)."""
+    statuses = []
+    for template in templates:
+        bit = template_bit(template)
+        if row['known'] & bit:
+            statuses.append({
+                'entry_id': row['entry_id'],
+                'template_id': template['id'],
+                'checked': bool(row['checked'] & bit)
+            })
+    return statuses
+
+
+def checklist_inputs(journal_id, snapshot=None):
+    """Vorlagen und Status eines Journals, bevorzugt aus einem gemeinsamen Snapshot."""
+    if snapshot is not None:
+        return snapshot.templates, snapshot.statuses
+    return get_checklist_templates(journal_id), load_journal_data(journal_id, 'statuses')
+
+
+def build_checklist_bitsets(templates, entries, statuses):
+    """
+    Baut pro Vorlage zwei Bitsets über die übergebenen Einträge (Bit i = i-ter Eintrag):
+    welche Einträge einen Status für die Vorlage haben und welche angehakt sind.
+    Rückgabe: {template_id: (known_bits, checked_bits)}
+    """
+    rows = {row['entry_id']: row for row in statuses}
+    known_columns = {}
+    checked_columns = {}
+    for position, entry in enumerate(entries):
+        row = rows.get(entry.id)
+        if row is None:
+            continue
+        entry_bit = 1 << position
+        known, checked = row['known'], row['checked']
+        while known:
+            low = known & -known
+            known_columns[low] = known_columns.get(low, 0) | entry_bit
+            if checked & low:
+                checked_columns[low] = checked_columns.get(low, 0) | entry_bit
+            known ^= low
+
+    bitsets = {}
+    for template in templates:
+        bit = template_bit(template)
+        bitsets[template['id']] = (known_columns.get(bit, 0), checked_columns.get(bit, 0))
+    return bitsets
+
+
+def result_bitsets(entries):
+    """Gibt Bitsets der positiven Ergebnisse (Win, BE, PartialBE), der Verluste und aller Einträge mit Ergebnis zurück."""
+    positive = 0
+    losses = 0
+    with_result = 0
+    for position, entry in enumerate(entries):
+        result = entry.result
+        if not result:
+            continue
+        with_result |= 1 << position
+        if result in POSITIVE_RESULTS:
+            positive |= 1 << position
+        elif result == "Loss":
+            losses |= 1 << position
+    return positive, losses, with_result
 
 
 # Journal-Funktionen
-def get_journals():
-    """Gibt alle Journals zurück."""
-    return load_data(JOURNALS_FILE)
+def get_journals(include_summary=False):
+    """
+    Gibt alle Journals zurück.
+    Mit include_summary enthält jedes Journal eine Kurzübersicht (Anzahl Einträge, letzter Trade,
+    Gesamt-PnL, Gewinnrate) aus den inkrementell gepflegten Rollup-Summen.
+    """
+    journals = load_data(JOURNALS_FILE)
+    if include_summary:
+        for journal in journals:
+            journal['summary'] = get_rollups(journal['id']).summary()
+    return journals
 
 
 def get_journal(journal_id):
@@ -389,7 +1758,7 @@ def get_journal(journal_id):
 
 
 def create_journal(data):
-    """Erstellt ein neues Journal."""
+    """Erstellt ein neues Journal (ungültige Zeitzonen oder Sessions lösen einen ValidationError aus)."""
     journals = load_data(JOURNALS_FILE)
 
     # Generiere eine eindeutige ID
@@ -408,8 +1777,14 @@ def create_journal(data):
         'custom_field_name': data.get('custom_field_name', ''),
         'custom_field_options': data.get('custom_field_options', []),
         'has_emotions': data.get('has_emotions', False),  # New field for emotions tracking
+        'timezone': data.get('timezone') or DEFAULT_TIMEZONE,
+        'bucket_timezone': data.get('bucket_timezone') or None,
+        'sessions': validate_sessions(data['sessions']) if data.get('sessions') else None,
         'created_at': current_time
     }
+    resolve_timezone(new_journal['timezone'])
+    if new_journal['bucket_timezone']:
+        resolve_timezone(new_journal['bucket_timezone'], 'bucket_timezone')
 
     journals.append(new_journal)
     save_data(JOURNALS_FILE, journals)
@@ -436,10 +1811,22 @@ def create_journal(data):
 
 
 def update_journal(journal_id, data):
-    """Aktualisiert ein bestehendes Journal."""
+    """
+    Aktualisiert ein bestehendes Journal.
+    Ändern sich die Zeitzonen, werden die abgeleiteten Datumsfelder der Einträge neu berechnet.
+    """
+    # Zeitzonen und Sessions vor dem Schreiben prüfen
+    if data.get('timezone'):
+        resolve_timezone(data['timezone'])
+    if data.get('bucket_timezone'):
+        resolve_timezone(data['bucket_timezone'], 'bucket_timezone')
+    sessions = validate_sessions(data['sessions']) if data.get('sessions') else None
+
     journals = load_data(JOURNALS_FILE)
     for journal in journals:
         if journal['id'] == journal_id:
+            old_timezones = journal_timezones(journal)
+
             if 'name' in data:
                 journal['name'] = data['name']
             if 'description' in data:
@@ -454,8 +1841,19 @@ def update_journal(journal_id, data):
                 journal['custom_field_options'] = data['custom_field_options']
             if 'has_emotions' in data:
                 journal['has_emotions'] = data['has_emotions']
+            if 'timezone' in data:
+                journal['timezone'] = data['timezone'] or DEFAULT_TIMEZONE
+            if 'bucket_timezone' in data:
+                journal['bucket_timezone'] = data['bucket_timezone'] or None
+            if 'sessions' in data:
+                journal['sessions'] = sessions
 
             save_data(JOURNALS_FILE, journals)
+
+            new_timezones = journal_timezones(journal)
+            if [str(tz) for tz in new_timezones] != [str(tz) for tz in old_timezones]:
+                rederive_entry_dates(journal_id, *new_timezones)
+
             return journal
 
     return None
@@ -472,14 +1870,23 @@ def delete_journal(journal_id):
     templates = [t for t in templates if t['journal_id'] != journal_id]
     save_data(TEMPLATES_FILE, templates)
 
-    # Finde Einträge, die zum Journal gehören
-    entries = load_data(ENTRIES_FILE)
-    entry_ids = [e['id'] for e in entries if e['journal_id'] == journal_id]
-    entries = [e for e in entries if e['journal_id'] != journal_id]
-    save_data(ENTRIES_FILE, entries)
+    # Das gesamte Journal-Verzeichnis entfernen, Bilddateien löscht danach der Reaper
+    with journal_transaction(journal_id) as txn:
+        entry_ids = {e['id'] for e in load_journal_data(journal_id, 'entries')}
+        for img in load_journal_data(journal_id, 'images'):
+            txn.delete_file_after_commit(img)
+
+        discard_pending_writes(journal_id)
+        shutil.rmtree(journal_dir(journal_id), ignore_errors=True)
+        forget_entries(entry_ids)
 
-    # Lösche Checklistenstatus und Bilder für die Einträge
-    delete_related_entry_data(entry_ids)
+    drop_snapshot(journal_id)
+    forget_statistics(journal_id)
+    with _rollup_lock:
+        _rollup_cache.pop(journal_id, None)
+    with _search_lock:
+        _search_cache.pop(journal_id, None)
+        _search_dirty.discard(journal_id)
 
     return True
 
@@ -564,13 +1971,20 @@ def update_checklist_template(template_id, data):
 def delete_checklist_template(template_id):
     """Löscht eine Checklistenvorlage."""
     templates = load_data(TEMPLATES_FILE)
+    template = next((t for t in templates if t['id'] == template_id), None)
     templates = [t for t in templates if t['id'] != template_id]
     save_data(TEMPLATES_FILE, templates)
 
-    # Lösche zugehörige Checklistenstatus
-    statuses = load_data(STATUSES_FILE)
-    statuses = [s for s in statuses if s['template_id'] != template_id]
-    save_data(STATUSES_FILE, statuses)
+    # Lösche zugehörige Checklistenstatus (nur im Journal der Vorlage)
+    if template:
+        journal_id = template['journal_id']
+        bit = template_bit(template)
+        with journal_transaction(journal_id):
+            statuses = load_journal_data(journal_id, 'statuses')
+            for row in statuses:
+                row['known'] &= ~bit
+                row['checked'] &= ~bit
+            save_journal_data(journal_id, 'statuses', statuses)
 
     return True
 
@@ -578,23 +1992,31 @@ def delete_checklist_template(template_id):
 # Eintrags-Funktionen
 def get_entries(journal_id):
     """Gibt alle Einträge für ein Journal zurück."""
-    entries = load_data(ENTRIES_FILE)
-    return [e for e in entries if e['journal_id'] == journal_id]
+    snapshot = journal_snapshot(journal_id)
+    return [dict(e) for e in snapshot.entries] if snapshot else []
 
 
 def get_entry(entry_id):
-    """Gibt einen bestimmten Eintrag mit Details zurück."""
-    entries = load_data(ENTRIES_FILE)
-    entry = next((e for e in entries if e['id'] == entry_id), None)
+    """Gibt einen bestimmten Eintrag mit Details zurück (alle Teile aus demselben Snapshot)."""
+    journal_id = get_entry_journal_id(entry_id)
+    if journal_id is None:
+        return None
+
+    snapshot = journal_snapshot(journal_id)
+    if snapshot is None:
+        return None
+    entry = next((e for e in snapshot.entries if e['id'] == entry_id), None)
 
     if entry:
+        entry = dict(entry)  # Snapshot-Zeilen nicht verändern
+
         # Füge Checklistenstatus hinzu
-        statuses = load_data(STATUSES_FILE)
-        entry_statuses = [s for s in statuses if s['entry_id'] == entry_id]
+        row = next((s for s in snapshot.statuses if s['entry_id'] == entry_id), None)
 
         # Hole Vorlagentext für jeden Status
-        templates = load_data(TEMPLATES_FILE)
+        templates = snapshot.templates
         template_map = {t['id']: t for t in templates}
+        entry_statuses = expand_status_row(row, templates) if row else []
 
         checklist_statuses = []
         for status in entry_statuses:
@@ -610,8 +2032,7 @@ def get_entry(entry_id):
         entry['checklist_statuses'] = sorted(checklist_statuses, key=lambda x: x['order'])
 
         # Füge Bilder hinzu
-        images = load_data(IMAGES_FILE)
-        entry_images = [i for i in images if i['entry_id'] == entry_id]
+        entry_images = [dict(i) for i in snapshot.images if i['entry_id'] == entry_id]
 
         # Korrigiere Bildpfade und entferne "None"-Werte
         for img in entry_images:
@@ -626,24 +2047,17 @@ def get_entry(entry_id):
 
 
 def create_entry(journal_id, data):
-    """Erstellt einen neuen Eintrag."""
-    entries = load_data(ENTRIES_FILE)
-
-    # Generiere eine eindeutige ID
-    new_id = 1
-    if entries:
-        new_id = max(e['id'] for e in entries) + 1
-
+    """
+    Erstellt einen neuen Eintrag.
+    Zahlen, Aufzählungen und Datumswerte werden einmalig beim Schreiben normalisiert;
+    ungültige Werte lösen einen EntryValidationError aus.
+    """
     # Verwende das angegebene Datum oder das aktuelle Datum
     entry_date = data.get('entry_date', datetime.datetime.utcnow().isoformat())
-
-    # Füge Strategie hinzu, wenn angegeben
     strategy = data.get('strategy')
-    if strategy:
-        add_strategy(strategy)  # Speichert die Strategie in der Liste
 
     new_entry = {
-        'id': new_id,
+        'id': None,
         'journal_id': journal_id,
         'entry_date': entry_date,
         'end_date': data.get('end_date'),  # New field for trade end date
@@ -662,84 +2076,132 @@ def create_entry(journal_id, data):
         'custom_field_value': data.get('custom_field_value'),
         'emotion': data.get('emotion')
     }
+    input_tz, bucket_tz = journal_timezones(find_journal(journal_id))
+    normalize_entry_fields(new_entry, input_tz=input_tz, bucket_tz=bucket_tz)
+
+    # Füge Strategie hinzu, wenn angegeben
+    if strategy:
+        add_strategy(strategy)  # Speichert die Strategie in der Liste
+
+    with journal_transaction(journal_id):
+        new_id = _create_entry_locked(journal_id, new_entry, data.get('checklist_statuses', {}))
+    if new_id is None:
+        return None
+
+    # Gib den vollständigen Eintrag zurück
+    return get_entry(new_id)
+
+
+def _create_entry_locked(journal_id, new_entry, initial_statuses):
+    """
+    Legt Eintrag und Checklistenstatus an; erwartet eine offene Journal-Transaktion.
+    Gibt die neue ID zurück oder None, wenn der Eintrag nicht gespeichert werden konnte.
+    """
+    entries = load_journal_data(journal_id, 'entries')
+
+    # Generiere eine eindeutige ID (journalübergreifend)
+    new_id = allocate_entry_id()
+    new_entry['id'] = new_id
 
     entries.append(new_entry)
-    save_data(ENTRIES_FILE, entries)
+    previous_signature = entries_signature(journal_id)
+    if not save_journal_data(journal_id, 'entries', entries):
+        return None
+    register_entry(new_id, journal_id)
+    entries_changed(journal_id, previous_signature, added=[new_entry])
 
     # Erstelle Checklistenstatus
     journal = get_journal(journal_id)
     if journal:
         templates = journal.get('checklist_templates', [])
 
-        statuses = load_data(STATUSES_FILE)
-        initial_statuses = data.get('checklist_statuses', {})
+        statuses = load_journal_data(journal_id, 'statuses')
 
+        status = {'entry_id': new_id, 'known': 0, 'checked': 0}
         for template in templates:
-            template_id = template['id']
-            status = {
-                'entry_id': new_id,
-                'template_id': template_id,
-                'checked': initial_statuses.get(str(template_id), False)
-            }
-            statuses.append(status)
+            bit = template_bit(template)
+            status['known'] |= bit
+            if initial_statuses.get(str(template['id']), False):
+                status['checked'] |= bit
+        statuses.append(status)
 
-        save_data(STATUSES_FILE, statuses)
+        save_journal_data(journal_id, 'statuses', statuses)
 
-    # Gib den vollständigen Eintrag zurück
-    return get_entry(new_id)
+    return new_id
 
 
 def update_entry(entry_id, data):
-    """Aktualisiert einen bestehenden Eintrag."""
-    entries = load_data(ENTRIES_FILE)
-    for entry in entries:
-        if entry['id'] == entry_id:
-            # Aktualisiere die Felder
-            fields = [
-                'entry_date', 'end_date', 'symbol', 'position_type',
-                'strategy', 'initial_rr', 'risk_percentage', 'pnl',
-                'result', 'confidence_level', 'trade_rating',
-                'notes', 'stop_loss', 'take_profit',
-                'custom_field_value', 'emotion'
-            ]
-
-            for field in fields:
-                if field in data:
-                    # Für Strategie, füge sie der Liste hinzu, wenn sie neu ist
-                    if field == 'strategy' and data[field]:
-                        add_strategy(data[field])
-
-                    entry[field] = data[field]
-
-            save_data(ENTRIES_FILE, entries)
-
-            # Aktualisiere Checklistenstatus
-            if 'checklist_statuses' in data and isinstance(data['checklist_statuses'], dict):
-                statuses = load_data(STATUSES_FILE)
-                for template_id_str, checked_status in data['checklist_statuses'].items():
-                    try:
-                        template_id = int(template_id_str)
-                        for status in statuses:
-                            if status['entry_id'] == entry_id and status['template_id'] == template_id:
-                                status['checked'] = checked_status
-                                break
-                    except ValueError:
-                        continue
-
-                save_data(STATUSES_FILE, statuses)
+    """Aktualisiert einen bestehenden Eintrag (ungültige Werte lösen einen EntryValidationError aus)."""
+    journal_id = get_entry_journal_id(entry_id)
+    if journal_id is None:
+        return None
 
-            return get_entry(entry_id)
+    # Aktualisiere die Felder
+    fields = [
+        'entry_date', 'end_date', 'symbol', 'position_type',
+        'strategy', 'initial_rr', 'risk_percentage', 'pnl',
+        'result', 'confidence_level', 'trade_rating',
+        'notes', 'stop_loss', 'take_profit',
+        'custom_field_value', 'emotion'
+    ]
+    changes = {field: data[field] for field in fields if field in data}
+    input_tz, bucket_tz = journal_timezones(find_journal(journal_id))
+    normalize_entry_fields(changes, input_tz=input_tz, bucket_tz=bucket_tz)
+
+    # Für Strategie, füge sie der Liste hinzu, wenn sie neu ist
+    if changes.get('strategy'):
+        add_strategy(changes['strategy'])
+
+    with journal_transaction(journal_id):
+        entries = load_journal_data(journal_id, 'entries')
+        for entry in entries:
+            if entry['id'] == entry_id:
+                previous = dict(entry)
+                entry.update(changes)
+
+                previous_signature = entries_signature(journal_id)
+                if save_journal_data(journal_id, 'entries', entries):
+                    entries_changed(journal_id, previous_signature, removed=[previous], added=[entry])
+
+                # Aktualisiere Checklistenstatus
+                if 'checklist_statuses' in data and isinstance(data['checklist_statuses'], dict):
+                    statuses = load_journal_data(journal_id, 'statuses')
+                    row = next((s for s in statuses if s['entry_id'] == entry_id), None)
+                    template_map = {t['id']: t for t in get_checklist_templates(journal_id)}
+                    for template_id_str, checked_status in data['checklist_statuses'].items():
+                        try:
+                            template = template_map.get(int(template_id_str))
+                        except ValueError:
+                            continue
+                        if row and template and row['known'] & template_bit(template):
+                            if checked_status:
+                                row['checked'] |= template_bit(template)
+                            else:
+                                row['checked'] &= ~template_bit(template)
+
+                    save_journal_data(journal_id, 'statuses', statuses)
+
+                return get_entry(entry_id)
 
-    return None
+        return None
 
 
 def delete_entry(entry_id):
     """Löscht einen Eintrag und zugehörige Daten."""
-    entries = load_data(ENTRIES_FILE)
-    entries = [e for e in entries if e['id'] != entry_id]
-    save_data(ENTRIES_FILE, entries)
+    journal_id = get_entry_journal_id(entry_id)
+    if journal_id is None:
+        return False
 
-    delete_related_entry_data([entry_id])
+    with journal_transaction(journal_id):
+        entries = load_journal_data(journal_id, 'entries')
+        removed = [e for e in entries if e['id'] == entry_id]
+        entries = [e for e in entries if e['id'] != entry_id]
+        previous_signature = entries_signature(journal_id)
+        if save_journal_data(journal_id, 'entries', entries):
+            entries_changed(journal_id, previous_signature, removed=removed)
+
+        delete_related_entry_data(journal_id, {entry_id})
+        forget_entries([entry_id])
 
     return True
 
@@ -747,32 +2209,110 @@ def delete_entry(entry_id):
 # Checklistenstatus-Funktionen
 def update_checklist_status(entry_id, template_id, checked):
     """Aktualisiert den Status eines Checklistenelements."""
-    statuses = load_data(STATUSES_FILE)
-    for status in statuses:
-        if status['entry_id'] == entry_id and status['template_id'] == template_id:
-            status['checked'] = checked
-            save_data(STATUSES_FILE, statuses)
-            return status
+    journal_id = get_entry_journal_id(entry_id)
+    if journal_id is None:
+        return None
+
+    template = next((t for t in get_checklist_templates(journal_id) if t['id'] == template_id), None)
+    if template is None:
+        return None
+    bit = template_bit(template)
+
+    with journal_transaction(journal_id):
+        statuses = load_journal_data(journal_id, 'statuses')
+        for row in statuses:
+            if row['entry_id'] == entry_id and row['known'] & bit:
+                if checked:
+                    row['checked'] |= bit
+                else:
+                    row['checked'] &= ~bit
+                save_journal_data(journal_id, 'statuses', statuses)
+                return {'entry_id': entry_id, 'template_id': template_id, 'checked': checked}
 
     return None
 
 
-def upload_image(entry_id, file=None, category="Before", link_url=None):
-    """Fügt ein Bild oder einen Link für einen bestimmten Journal-Eintrag hinzu."""
-    # Lade die vorhandenen Bilder
-    images = load_data(IMAGES_FILE)
+def sniff_image_type(header):
+    """Erkennt den Bildtyp anhand der Magic Bytes, gibt den MIME-Typ oder None zurück."""
+    for signature, content_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+    return None
 
-    # Neue ID erzeugen
-    new_id = 1
-    if images:
-        new_id = max(i['id'] for i in images) + 1
+
+def store_upload_stream(stream, filename, max_size=MAX_UPLOAD_SIZE, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Schreibt einen Upload blockweise in eine temporäre Datei und verschiebt sie atomar.
+    Berechnet dabei den SHA-256-Hash und prüft den Bildtyp anhand der Magic Bytes,
+    sodass der Speicherverbrauch unabhängig von der Dateigröße bleibt.
+    """
+    unique_filename = f"{uuid.uuid4()}_{os.path.basename(filename)}"
+    final_path = os.path.join(UPLOADS_DIR, unique_filename)
+
+    fd, temp_path = tempfile.mkstemp(prefix='.upload-', suffix='.part', dir=UPLOADS_DIR)
+    digest = hashlib.sha256()
+    size = 0
+    header = b''
+    content_type = None
+
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadError(f"Datei ist größer als {max_size} Bytes", 413)
+
+                # Bildtyp prüfen, sobald genug Bytes für die Signaturen vorliegen
+                if content_type is None:
+                    header += chunk[:IMAGE_SIGNATURE_LENGTH]
+                    if len(header) >= IMAGE_SIGNATURE_LENGTH:
+                        content_type = sniff_image_type(header)
+                        if content_type is None:
+                            raise UploadError("Dateiinhalt ist kein unterstütztes Bild")
+
+                digest.update(chunk)
+                out.write(chunk)
+
+        if size == 0:
+            raise UploadError("Leere Datei")
+        if content_type is None:
+            content_type = sniff_image_type(header)
+            if content_type is None:
+                raise UploadError("Dateiinhalt ist kein unterstütztes Bild")
+
+        os.replace(temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return {
+        'file_path': unique_filename,
+        'sha256': digest.hexdigest(),
+        'size': size,
+        'content_type': content_type
+    }
+
+
+def upload_image(entry_id, file=None, category="Before", link_url=None, max_size=MAX_UPLOAD_SIZE):
+    """
+    Fügt ein Bild oder einen Link für einen bestimmten Journal-Eintrag hinzu.
+    Abgelehnte Dateien (zu groß, kein Bild) lösen einen UploadError aus.
+    """
+    journal_id = get_entry_journal_id(entry_id)
+    if journal_id is None:
+        return None
 
     current_time = datetime.datetime.utcnow().isoformat()
 
     # Link-URLs verarbeiten
     if link_url:
         new_image = {
-            'id': new_id,
+            'id': allocate_image_id(),
             'entry_id': entry_id,
             'file_path': None,  # Explizit auf None setzen
             'link_url': link_url,
@@ -780,8 +2320,12 @@ def upload_image(entry_id, file=None, category="Before", link_url=None):
             'uploaded_at': current_time
         }
 
-        images.append(new_image)
-        save_data(IMAGES_FILE, images)
+        with journal_transaction(journal_id):
+            images = load_journal_data(journal_id, 'images')
+            images.append(new_image)
+            if not save_journal_data(journal_id, 'images', images):
+                return None
+            register_image(new_image['id'], entry_id)
 
         return new_image
 
@@ -789,78 +2333,99 @@ def upload_image(entry_id, file=None, category="Before", link_url=None):
     if not file:
         return None
 
-    # Eindeutigen Dateinamen erstellen
-    filename = file.filename
-    unique_filename = f"{uuid.uuid4()}_{filename}"
-    file_path = os.path.join(UPLOADS_DIR, unique_filename)
-
-    # Datei speichern
+    # Datei blockweise speichern, bevor die Bildliste geladen wird
     try:
-        file.save(file_path)
+        stored = store_upload_stream(file.stream, file.filename, max_size=max_size)
+    except UploadError:
+        raise
     except Exception as e:
         logging.error(f"Fehler beim Speichern der Datei: {e}")
         return None
 
     # Neues Bild erstellen
     new_image = {
-        'id': new_id,
+        'id': allocate_image_id(),
         'entry_id': entry_id,
-        'file_path': unique_filename,
+        'file_path': stored['file_path'],
         'link_url': None,  # Explizit auf None setzen
         'category': category,
-        'uploaded_at': current_time
+        'uploaded_at': current_time,
+        'sha256': stored['sha256'],
+        'size': stored['size'],
+        'content_type': stored['content_type']
     }
 
-    images.append(new_image)
-    save_data(IMAGES_FILE, images)
+    with journal_transaction(journal_id):
+        images = load_journal_data(journal_id, 'images')
+        images.append(new_image)
+        saved = save_journal_data(journal_id, 'images', images)
+        if saved:
+            register_image(new_image['id'], entry_id)
+    if not saved:
+        delete_image_file(new_image)  # Datei ohne Metadaten nicht liegen lassen
+        return None
+    with _index_lock:
+        _upload_hashes[stored['file_path']] = stored['sha256']
 
     # Bild mit API-Pfad für das Frontend zurückgeben
     return {
         'id': new_image['id'],
-        'file_path': f"/api/uploads/{unique_filename}",
+        'file_path': f"/api/uploads/{stored['file_path']}",
         'link_url': None,
         'category': new_image['category'],
         'uploaded_at': new_image['uploaded_at']
     }
 
 
+def delete_image_file(image):
+    """Löscht die Datei eines Bildes aus dem Upload-Verzeichnis (Links haben keine Datei)."""
+    # Überprüfe, ob file_path existiert und nicht None ist
+    if image.get('file_path') and image['file_path'] != 'None':
+        file_path = os.path.join(UPLOADS_DIR, image['file_path'])
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as e:
+            logging.error(f"Fehler beim Löschen der Bilddatei {image['file_path']}: {e}")
+
+
 def delete_image(image_id):
     """Löscht ein Bild und seine Datei."""
-    images = load_data(IMAGES_FILE)
-    image = next((i for i in images if i['id'] == image_id), None)
+    with _index_lock:
+        entry_id = _image_entry_index.get(image_id)
+    journal_id = get_entry_journal_id(entry_id) if entry_id is not None else None
+    if journal_id is None:
+        return False
 
-    if image:
-        # Überprüfe, ob file_path existiert und nicht None ist
-        if image.get('file_path') and image['file_path'] is not None and image['file_path'] != 'None':
-            file_path = os.path.join(UPLOADS_DIR, image['file_path'])
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except OSError as e:
-                logging.error(f"Fehler beim Löschen der Bilddatei {image['file_path']}: {e}")
+    with journal_transaction(journal_id) as txn:
+        images = load_journal_data(journal_id, 'images')
+        image = next((i for i in images if i['id'] == image_id), None)
 
-        images = [i for i in images if i['id'] != image_id]
-        save_data(IMAGES_FILE, images)
-        return True
+        if image:
+            images = [i for i in images if i['id'] != image_id]
+            save_journal_data(journal_id, 'images', images)
+            txn.delete_file_after_commit(image)
+            with _index_lock:
+                _image_entry_index.pop(image_id, None)
+            return True
 
     return False
 
 
-def calculate_checklist_usage(journal_id, entries):
+def calculate_checklist_usage(journal_id, entries, snapshot=None):
     """Berechnet die Nutzung von Checklistenelementen."""
-    templates = get_checklist_templates(journal_id)
-    statuses = load_data(STATUSES_FILE)
+    templates, statuses = checklist_inputs(journal_id, snapshot)
+    bitsets = build_checklist_bitsets(templates, entries, statuses)
 
     results = []
     for template in templates:
-        template_id = template['id']
+        known_bits, checked_bits = bitsets[template['id']]
 
-        # Finde alle Status für diese Vorlage
-        template_statuses = [s for s in statuses if s['template_id'] == template_id]
-        total = len(template_statuses)
+        # Anzahl der Einträge mit Status für diese Vorlage
+        total = popcount(known_bits)
 
         if total > 0:
-            checked_count = sum(1 for s in template_statuses if s['checked'])
+            checked_count = popcount(checked_bits)
             percentage = (checked_count / total * 100)
 
             results.append({
@@ -873,115 +2438,82 @@ def calculate_checklist_usage(journal_id, entries):
     return results
 
 
-def delete_related_entry_data(entry_ids):
-    """Löscht alle mit den Einträgen verbundenen Daten."""
+def delete_related_entry_data(journal_id, entry_ids):
+    """
+    Löscht alle mit den Einträgen verbundenen Daten in einem Durchlauf pro Datei.
+    Die Bilddateien werden nach Abschluss der Transaktion im Hintergrund gelöscht.
+    """
+    entry_ids = set(entry_ids)
     if not entry_ids:
         return
 
-    # Lösche Checklistenstatus
-    statuses = load_data(STATUSES_FILE)
-    statuses = [s for s in statuses if s['entry_id'] not in entry_ids]
-    save_data(STATUSES_FILE, statuses)
-
-    # Lösche Bilder und Dateien
-    images = load_data(IMAGES_FILE)
-    to_delete = [i for i in images if i['entry_id'] in entry_ids]
-
-    for img in to_delete:
-        # Überprüfe, ob file_path existiert und nicht None ist
-        if img.get('file_path') and img['file_path'] != 'None' and img['file_path'] is not None:
-            file_path = os.path.join(UPLOADS_DIR, img['file_path'])
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except OSError as e:
-                logging.error(f"Fehler beim Löschen der Bilddatei {img['file_path']}: {e}")
+    with journal_transaction(journal_id) as txn:
+        # Lösche Checklistenstatus
+        statuses = load_journal_data(journal_id, 'statuses')
+        remaining_statuses = [s for s in statuses if s['entry_id'] not in entry_ids]
+        if len(remaining_statuses) != len(statuses):
+            save_journal_data(journal_id, 'statuses', remaining_statuses)
+
+        # Lösche Bilder; Dateien werden nach dem Commit vom Reaper entfernt
+        images = load_journal_data(journal_id, 'images')
+        remaining_images = []
+        for img in images:
+            if img['entry_id'] in entry_ids:
+                txn.delete_file_after_commit(img)
+            else:
+                remaining_images.append(img)
 
-    # Behalte nur die Einträge, die nicht gelöscht werden
-    remaining_images = [i for i in images if i['entry_id'] not in entry_ids]
-    save_data(IMAGES_FILE, remaining_images)
+        if len(remaining_images) != len(images):
+            save_journal_data(journal_id, 'images', remaining_images)
 
 
-def get_journal_statistics(journal_id):
-    """Berechnet und gibt Statistiken für ein Journal zurück."""
-    entries = get_entries(journal_id)
+def get_journal_statistics(journal_id, snapshot=None):
+    """
+    Berechnet und gibt Statistiken für ein Journal zurück.
+    Arbeitet auf den typisierten EntryRecords, Werte werden hier nicht mehr geparst.
+    Alle Teilergebnisse stammen aus einem Snapshot; parallele Schreibvorgänge werden nicht blockiert.
+    """
+    snapshot = snapshot or journal_snapshot(journal_id)
+    if snapshot is None:
+        return None
+    entries = snapshot.records()
 
     if not entries:
         return None
 
     # Grundlegende Statistiken
     total_trades = len(entries)
-    wins = sum(1 for e in entries if e.get('result') == "Win")
-    losses = sum(1 for e in entries if e.get('result') == "Loss")
-    bes = sum(1 for e in entries if e.get('result') == "BE")
-    partial_bes = sum(1 for e in entries if e.get('result') == "PartialBE")
+    wins = sum(1 for e in entries if e.result == "Win")
+    losses = sum(1 for e in entries if e.result == "Loss")
+    bes = sum(1 for e in entries if e.result == "BE")
+    partial_bes = sum(1 for e in entries if e.result == "PartialBE")
 
     # FIXED: Count Win, BE, and PartialBE as positive results
     positive_results = wins + bes + partial_bes
     total_with_result = positive_results + losses
     win_rate = (positive_results / total_with_result * 100) if total_with_result > 0 else 0
 
-    long_positions = sum(1 for e in entries if e.get('position_type') == "Long")
-    short_positions = sum(1 for e in entries if e.get('position_type') == "Short")
+    long_positions = sum(1 for e in entries if e.position_type == "Long")
+    short_positions = sum(1 for e in entries if e.position_type == "Short")
 
     # PnL-Berechnungen
-    pnl_values = []
-    for e in entries:
-        pnl = e.get('pnl')
-        if pnl is not None:
-            # Konvertiere String-Werte in Floats
-            if isinstance(pnl, str):
-                try:
-                    pnl = float(pnl)
-                except ValueError:
-                    continue  # Überspringen von ungültigen Werten
-            pnl_values.append(pnl)
-
-    total_pnl = sum(pnl_values)
+    total_pnl = sum(e.pnl for e in entries if e.pnl is not None)
     avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
 
     # Gleiches für Gewinn- und Verlust-PnLs
-    winning_pnls = []
-    for e in entries:
-        if e.get('result') == "Win" and e.get('pnl') is not None:
-            pnl = e.get('pnl')
-            if isinstance(pnl, str):
-                try:
-                    pnl = float(pnl)
-                except ValueError:
-                    continue
-            winning_pnls.append(pnl)
-
-    losing_pnls = []
-    for e in entries:
-        if e.get('result') == "Loss" and e.get('pnl') is not None:
-            pnl = e.get('pnl')
-            if isinstance(pnl, str):
-                try:
-                    pnl = float(pnl)
-                except ValueError:
-                    continue
-            losing_pnls.append(pnl)
+    winning_pnls = [e.pnl for e in entries if e.result == "Win" and e.pnl is not None]
+    losing_pnls = [e.pnl for e in entries if e.result == "Loss" and e.pnl is not None]
 
     avg_win_pnl = sum(winning_pnls) / len(winning_pnls) if winning_pnls else 0
     avg_loss_pnl = sum(losing_pnls) / len(losing_pnls) if losing_pnls else 0
 
-    # R/R-Werte mit Typkonvertierung
-    rr_values = []
-    for e in entries:
-        rr = e.get('initial_rr')
-        if rr is not None:
-            if isinstance(rr, str):
-                try:
-                    rr = float(rr)
-                except ValueError:
-                    continue
-            rr_values.append(rr)
+    # R/R-Werte
+    rr_values = [e.initial_rr for e in entries if e.initial_rr is not None]
 
     avg_rr = sum(rr_values) / len(rr_values) if rr_values else 0
 
     # Checklistennutzung
-    checklist_usage = calculate_checklist_usage(journal_id, entries)
+    checklist_usage = calculate_checklist_usage(journal_id, entries, snapshot)
 
     # Symbol-Performance
     symbol_stats = calculate_symbol_performance(entries)
@@ -989,15 +2521,15 @@ def get_journal_statistics(journal_id):
     # Strategie-Performance
     strategy_stats = calculate_strategy_performance(entries)
 
+    journal = snapshot.journal
+
     # Neue Statistiken
-    session_stats = calculate_session_performance(entries)
+    session_stats = calculate_session_performance(entries, (journal or {}).get('sessions'))
     daily_stats = calculate_daily_performance(entries)
     monthly_stats = calculate_monthly_performance(entries)
-    checklist_win_rate = calculate_checklist_win_rates(journal_id, entries)
+    checklist_win_rate = calculate_checklist_win_rates(journal_id, entries, snapshot)
     emotion_stats = calculate_emotion_performance(entries)  # New: emotion statistics
 
-    journal = get_journal(journal_id)
-
     return {
         'journal_name': journal['name'] if journal else "",
         'total_trades': total_trades,
@@ -1028,12 +2560,288 @@ def get_journal_statistics(journal_id):
     }
 
 
+# Statistik-Cache (Stale-While-Revalidate)
+# Die zuletzt berechneten Statistiken eines Journals werden sofort ausgeliefert; nach
+# Schreibvorgängen berechnet ein Hintergrund-Worker sie neu. Veraltete Ergebnisse werden nur
+# bis STATS_MAX_STALENESS Sekunden nach der ersten nicht eingerechneten Änderung verwendet,
+# danach wird synchron gerechnet. Gleichzeitige identische Berechnungen laufen nur einmal.
+STATS_MAX_STALENESS = float(os.environ.get('TRADING_JOURNAL_STATS_MAX_STALENESS') or 10)
+STATS_REFRESH_WORKERS = 2
+_stats_cache = {}  # journal_id -> CachedStatistics
+_stats_cache_lock = threading.Lock()
+_stats_refresh_pending = set()
+_stats_refresh_executor = ThreadPoolExecutor(max_workers=STATS_REFRESH_WORKERS, thread_name_prefix='stats-refresh')
+_inflight = {}  # Schlüssel -> Future der laufenden Berechnung
+_inflight_lock = threading.Lock()
+
+
+class CachedStatistics:
+    """Statistiken eines Snapshot-Stands und seit wann sie veraltet sind (monotone Zeit)."""
+
+    __slots__ = ('version', 'stats', 'computed_at', 'stale_since')
+
+    def __init__(self, version, stats, computed_at, stale_since=None):
+        self.version = version
+        self.stats = stats
+        self.computed_at = computed_at
+        self.stale_since = stale_since
+
+
+def single_flight(key, compute):
+    """
+    Führt compute() für gleichzeitige Aufrufe mit demselben Schlüssel nur einmal aus;
+    alle Aufrufer erhalten dasselbe Ergebnis (bzw. dieselbe Ausnahme).
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = compute()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def compute_statistics(journal_id, snapshot):
+    """Berechnet die Statistiken eines Snapshots (single-flight) und legt sie im Cache ab."""
+    started = time.monotonic()
+    stats = single_flight(('statistics', journal_id, snapshot.version),
+                          lambda: get_journal_statistics(journal_id, snapshot))
+
+    with _snapshot_lock:
+        published = _snapshots.get(journal_id)
+    # Während der Berechnung eingetroffene Änderungen sind noch nicht enthalten
+    stale_since = started if published is not None and published.version != snapshot.version else None
+
+    with _stats_cache_lock:
+        current = _stats_cache.get(journal_id)
+        if current is None or current.version < snapshot.version:
+            _stats_cache[journal_id] = CachedStatistics(snapshot.version, stats, time.monotonic(), stale_since)
+    return stats
+
+
+def get_cached_statistics(journal_id, snapshot=None):
+    """
+    Gibt (Statistiken, veraltet) zurück. Liegt ein nicht zu altes Ergebnis eines früheren
+    Stands vor, wird es sofort geliefert und die Neuberechnung im Hintergrund angestoßen.
+    """
+    snapshot = snapshot or journal_snapshot(journal_id)
+    if snapshot is None:
+        return None, False
+
+    with _stats_cache_lock:
+        cached = _stats_cache.get(journal_id)
+    if cached is not None:
+        if cached.version == snapshot.version:
+            return cached.stats, False
+        if cached.stale_since is not None and time.monotonic() - cached.stale_since <= STATS_MAX_STALENESS:
+            schedule_statistics_refresh(journal_id)
+            return cached.stats, True
+
+    return compute_statistics(journal_id, snapshot), False
+
+
+def mark_statistics_stale(journal_id=None):
+    """Markiert die Statistiken eines Journals (oder aller) als veraltet und plant die Neuberechnung."""
+    now = time.monotonic()
+    with _stats_cache_lock:
+        journal_ids = list(_stats_cache) if journal_id is None else [journal_id]
+        journal_ids = [j for j in journal_ids if j in _stats_cache]
+        for j in journal_ids:
+            if _stats_cache[j].stale_since is None:
+                _stats_cache[j].stale_since = now
+    for j in journal_ids:
+        schedule_statistics_refresh(j)
+
+
+def schedule_statistics_refresh(journal_id):
+    """Plant eine Neuberechnung im Hintergrund (höchstens eine wartende je Journal)."""
+    with _stats_cache_lock:
+        if journal_id in _stats_refresh_pending:
+            return
+        _stats_refresh_pending.add(journal_id)
+    _stats_refresh_executor.submit(_refresh_statistics, journal_id)
+
+
+def _refresh_statistics(journal_id):
+    with _stats_cache_lock:
+        _stats_refresh_pending.discard(journal_id)
+    try:
+        snapshot = journal_snapshot(journal_id)
+        if snapshot is None:
+            forget_statistics(journal_id)
+            return
+        compute_statistics(journal_id, snapshot)
+    except Exception as e:
+        logging.error(f"Fehler bei der Neuberechnung der Statistiken für Journal {journal_id}: {e}")
+
+
+def forget_statistics(journal_id):
+    with _stats_cache_lock:
+        _stats_cache.pop(journal_id, None)
+
+
+def configure_statistics_cache(max_staleness=None):
+    """Stellt die maximale Veraltung (Sekunden) der ausgelieferten Statistiken ein (0 = immer aktuell)."""
+    global STATS_MAX_STALENESS
+    if max_staleness is not None:
+        STATS_MAX_STALENESS = max(0.0, float(max_staleness))
+
+
+def get_range_statistics(journal_id, date_from=None, date_to=None, symbol=None, strategy=None):
+    """
+    Statistiken für einen Zeitraum (Datum inklusive, in der Auswertungs-Zeitzone des Journals)
+    und optional ein Symbol bzw. eine Strategie. Wird aus den Tages-Rollups zusammengesetzt,
+    ohne die Einträge erneut zu durchlaufen.
+    """
+    rollups = get_rollups(journal_id)
+    journal = find_journal(journal_id)
+
+    stats = rollup_statistics(rollups.cells(date_from, date_to, symbol, strategy),
+                              (journal or {}).get('sessions'))
+    if not stats:
+        return None
+
+    stats['journal_name'] = journal['name'] if journal else ""
+    stats['filters'] = {'from': date_from, 'to': date_to, 'symbol': symbol, 'strategy': strategy}
+    return stats
+
+
+def build_portfolio_partial(journal_id):
+    """Teilergebnis eines Journals für die Portfolio-Auswertung."""
+    return PortfolioAccumulator.from_journal(journal_id, get_rollups(journal_id), get_entry_records(journal_id))
+
+
+def get_portfolio_statistics(journal_ids=None, initial_equity=0.0, max_points=DEFAULT_CURVE_POINTS):
+    """
+    Journalübergreifende Statistiken: Gesamtwerte, gemeinsame Equity-Kurve, Beitrag je Journal
+    und Symbol-Überschneidungen. Ohne journal_ids werden alle Journale ausgewertet.
+    Die Journale werden nacheinander akkumuliert und zusammengeführt. Rollups und Datensätze
+    kommen aus den inkrementell gepflegten Caches, sodass je Journal nur Zellen zusammengefasst
+    werden. Threads brächten wegen des GIL nichts, und ein Prozesspool müsste aus dem
+    mehrfädigen Server forken oder die App je Worker neu importieren.
+    """
+    journal_names = {j['id']: j['name'] for j in load_data(JOURNALS_FILE)}
+    if journal_ids is None:
+        journal_ids = sorted(journal_names)
+    journal_ids = [journal_id for journal_id in journal_ids if journal_id in journal_names]
+    if not journal_ids:
+        return None
+
+    portfolio = PortfolioAccumulator()
+    for journal_id in journal_ids:
+        portfolio.merge(build_portfolio_partial(journal_id))
+    if portfolio.total.count == 0:
+        return None
+
+    result = portfolio.summary(journal_names)
+    result['journal_ids'] = journal_ids
+    result['equity'] = calculate_equity_curve(portfolio.records, initial_equity, max_points)
+    return result
+
+
+def get_equity_curve(journal_id, initial_equity=0.0, max_points=DEFAULT_CURVE_POINTS):
+    """
+    Gibt Equity-Kurve und Drawdown-Kennzahlen eines Journals zurück.
+    max_points begrenzt die Anzahl der Kurvenpunkte (LTTB), 0 liefert die volle Kurve.
+    """
+    entries = get_entry_records(journal_id)
+    if not entries:
+        return None
+
+    result = calculate_equity_curve(entries, initial_equity, max_points)
+    result['journal_id'] = journal_id
+    return result
+
+
+def get_rolling_performance(journal_id, window, unit='trades', max_points=DEFAULT_CURVE_POINTS):
+    """Gibt die gleitenden Kennzahlen eines Journals über window Trades bzw. Tage zurück."""
+    entries = get_entry_records(journal_id)
+    if not entries:
+        return None
+
+    result = calculate_rolling_performance(entries, window, unit, max_points)
+    result['journal_id'] = journal_id
+    return result
+
+
+# Ergebnisse der Monte-Carlo-Simulation, Schlüssel: (Journal, Dateistand, Parameter)
+SIMULATION_CACHE_SIZE = 32
+_simulation_cache = OrderedDict()
+_simulation_cache_lock = threading.Lock()
+
+
+def get_monte_carlo_simulation(journal_id, mode='pnl', paths=10000, trades=None, initial_equity=10000.0,
+                               ruin_percentage=50.0, seed=0, default_risk=1.0):
+    """
+    Führt eine Monte-Carlo-Simulation über die Ergebnisse eines Journals aus.
+    Ergebnisse werden pro Journalstand (entries.json) und Parametersatz zwischengespeichert.
+    Gibt None zurück, wenn keine verwertbaren Einträge vorhanden sind; überschreiten Pfade x Trades
+    MAX_CELLS, wird ein ValidationError ausgelöst.
+    """
+    key = (journal_id, entries_signature(journal_id), mode, paths, trades,
+           initial_equity, ruin_percentage, seed, default_risk)
+    with _simulation_cache_lock:
+        if key in _simulation_cache:
+            _simulation_cache.move_to_end(key)
+            return _simulation_cache[key]
+
+    samples = extract_samples(get_entry_records(journal_id), mode, default_risk)
+    if not samples:
+        return None
+    cells = paths * (trades or min(len(samples), MAX_TRADES_PER_PATH))
+    if cells > MAX_CELLS:
+        raise ValidationError('paths', f"paths x trades ({cells}) darf höchstens {MAX_CELLS} betragen")
+
+    result = run_simulation(samples, paths, trades, mode, initial_equity, ruin_percentage, seed)
+    result['journal_id'] = journal_id
+
+    with _simulation_cache_lock:
+        _simulation_cache[key] = result
+        while len(_simulation_cache) > SIMULATION_CACHE_SIZE:
+            _simulation_cache.popitem(last=False)
+    return result
+
+
+def reset_caches():
+    """
+    Verwirft alle abgeleiteten Caches (Datensätze, Rollups, Suchindizes, Snapshots, Statistiken,
+    Simulationen, Upload-Hashes), z. B. für Kaltstart-Messungen. Vorgemerkte Suchindizes werden
+    vorher geschrieben; die Daten selbst und die Indizes Eintrag/Bild bleiben unberührt.
+    """
+    save_dirty_search_indexes()
+    with _record_cache_lock:
+        _record_cache.clear()
+    with _rollup_lock:
+        _rollup_cache.clear()
+    with _search_lock:
+        _search_cache.clear()
+    drop_all_snapshots()
+    with _stats_cache_lock:
+        _stats_cache.clear()
+    with _simulation_cache_lock:
+        _simulation_cache.clear()
+    with _index_lock:
+        _upload_hashes.clear()
+
+
 def calculate_symbol_performance(entries):
     """Berechnet die Performance nach Symbol."""
     symbol_data = {}
 
     for entry in entries:
-        symbol = entry.get('symbol')
+        symbol = entry.symbol
         if not symbol:
             continue
 
@@ -1043,7 +2851,7 @@ def calculate_symbol_performance(entries):
         symbol_data[symbol]['count'] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
             symbol_data[symbol]['total_with_result'] += 1
             if result == "Loss":
@@ -1075,7 +2883,7 @@ def calculate_strategy_performance(entries):
     strategy_data = {}
 
     for entry in entries:
-        strategy = entry.get('strategy')
+        strategy = entry.strategy
         if not strategy:
             continue
 
@@ -1085,7 +2893,7 @@ def calculate_strategy_performance(entries):
         strategy_data[strategy]['count'] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
             strategy_data[strategy]['total_with_result'] += 1
             if result == "Loss":
@@ -1093,15 +2901,9 @@ def calculate_strategy_performance(entries):
             elif result in ["Win", "BE", "PartialBE"]:
                 strategy_data[strategy]['positive_results'] += 1
 
-        # Füge PnL hinzu, wenn vorhanden, mit Konvertierung von String zu Float
-        if entry.get('pnl') is not None:
-            try:
-                # Konvertiere String zu Float, falls es ein String ist
-                pnl_value = float(entry.get('pnl')) if isinstance(entry.get('pnl'), str) else entry.get('pnl')
-                strategy_data[strategy]['pnl'] += pnl_value
-            except (ValueError, TypeError):
-                # Ignoriere ungültige Werte
-                pass
+        # Füge PnL hinzu, wenn vorhanden
+        if entry.pnl is not None:
+            strategy_data[strategy]['pnl'] += entry.pnl
 
     results = []
     for strategy, data in strategy_data.items():
@@ -1125,52 +2927,41 @@ def calculate_strategy_performance(entries):
     return results
 
 
-def calculate_session_performance(entries):
-    """Berechnet die Performance nach Tageszeit."""
-    sessions = {
-        "Morgen (6-10 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0},
-        "Vormittag (10-12 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0},
-        "Mittag (12-14 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0},
-        "Nachmittag (14-18 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0},
-        "Abend (18-22 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0},
-        "Nacht (22-6 Uhr)": {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0}
+def calculate_session_performance(entries, sessions=None):
+    """
+    Berechnet die Performance nach Tageszeit.
+    Die Sessions sind pro Journal konfigurierbar (Standard: DEFAULT_SESSIONS),
+    die Stunde stammt aus den beim Schreiben vorberechneten Gruppierungsschlüsseln.
+    """
+    sessions = sessions or DEFAULT_SESSIONS
+    hour_table = session_hour_table(sessions)
+    session_data = {
+        session['name']: {"total": 0, "positive_results": 0, "losses": 0, "total_with_result": 0}
+        for session in sessions
     }
 
     for entry in entries:
-        if not entry.get('entry_date'):
+        if entry.bucket_hour is None:
             continue
 
-        entry_date = datetime.datetime.fromisoformat(entry['entry_date'].replace('Z', '+00:00'))
-        hour = entry_date.hour
-
-        session_key = ""
-        if 6 <= hour < 10:
-            session_key = "Morgen (6-10 Uhr)"
-        elif 10 <= hour < 12:
-            session_key = "Vormittag (10-12 Uhr)"
-        elif 12 <= hour < 14:
-            session_key = "Mittag (12-14 Uhr)"
-        elif 14 <= hour < 18:
-            session_key = "Nachmittag (14-18 Uhr)"
-        elif 18 <= hour < 22:
-            session_key = "Abend (18-22 Uhr)"
-        else:
-            session_key = "Nacht (22-6 Uhr)"
+        session_key = hour_table[entry.bucket_hour]
+        if session_key is None:
+            continue  # Stunde gehört zu keiner konfigurierten Session
 
-        sessions[session_key]["total"] += 1
+        session_data[session_key]["total"] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
-            sessions[session_key]["total_with_result"] += 1
+            session_data[session_key]["total_with_result"] += 1
             if result == "Loss":
-                sessions[session_key]["losses"] += 1
+                session_data[session_key]["losses"] += 1
             elif result in ["Win", "BE", "PartialBE"]:
-                sessions[session_key]["positive_results"] += 1
+                session_data[session_key]["positive_results"] += 1
 
     # Berechne Gewinnrate für jede Session
     results = []
-    for session, data in sessions.items():
+    for session, data in session_data.items():
         # Calculate win rate based on positive results (Win, BE, PartialBE) vs total results
         win_rate = 0
         if data["total_with_result"] > 0:
@@ -1203,18 +2994,17 @@ def calculate_daily_performance(entries):
     daily_data = {}
 
     for entry in entries:
-        if not entry.get('entry_date'):
+        if entry.bucket_date is None:
             continue
 
-        entry_date = datetime.datetime.fromisoformat(entry['entry_date'].replace('Z', '+00:00'))
-        day_of_week = entry_date.weekday()
-        date_key = entry_date.strftime('%Y-%m-%d')
+        day_of_week = entry.bucket_weekday
+        date_key = entry.bucket_date
 
         # Wochentags-Statistik
         days[day_of_week]["total"] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
             days[day_of_week]["total_with_result"] += 1
             if result == "Loss":
@@ -1236,15 +3026,9 @@ def calculate_daily_performance(entries):
             elif result in ["Win", "BE", "PartialBE"]:
                 daily_data[date_key]["positive_results"] += 1
 
-        # PnL mit Typkonvertierung hinzufügen
-        if entry.get('pnl') is not None:
-            try:
-                # Konvertiere den Wert zu einem Float, wenn es ein String ist
-                pnl_value = float(entry.get('pnl')) if isinstance(entry.get('pnl'), str) else entry.get('pnl')
-                daily_data[date_key]["pnl"] += pnl_value
-            except (ValueError, TypeError):
-                # Ignoriere ungültige Werte
-                pass
+        # PnL hinzufügen
+        if entry.pnl is not None:
+            daily_data[date_key]["pnl"] += entry.pnl
 
     # Ergebnisse für Wochentage
     weekday_results = []
@@ -1290,15 +3074,15 @@ def calculate_monthly_performance(entries):
     monthly_data = {}
 
     for entry in entries:
-        if not entry.get('entry_date'):
+        if entry.bucket_month is None:
             continue
 
-        entry_date = datetime.datetime.fromisoformat(entry['entry_date'].replace('Z', '+00:00'))
-        month_key = entry_date.strftime('%Y-%m')
+        month_key = entry.bucket_month
 
         if month_key not in monthly_data:
+            month_start = datetime.date(int(month_key[:4]), int(month_key[5:7]), 1)
             monthly_data[month_key] = {
-                "month_name": entry_date.strftime('%B %Y'),
+                "month_name": month_start.strftime('%B %Y'),
                 "total": 0,
                 "positive_results": 0,
                 "losses": 0,
@@ -1309,7 +3093,7 @@ def calculate_monthly_performance(entries):
         monthly_data[month_key]["total"] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
             monthly_data[month_key]["total_with_result"] += 1
             if result == "Loss":
@@ -1317,15 +3101,9 @@ def calculate_monthly_performance(entries):
             elif result in ["Win", "BE", "PartialBE"]:
                 monthly_data[month_key]["positive_results"] += 1
 
-        # PnL mit Typkonvertierung hinzufügen
-        if entry.get('pnl') is not None:
-            try:
-                # Konvertiere den Wert zu einem Float, wenn es ein String ist
-                pnl_value = float(entry.get('pnl')) if isinstance(entry.get('pnl'), str) else entry.get('pnl')
-                monthly_data[month_key]["pnl"] += pnl_value
-            except (ValueError, TypeError):
-                # Ignoriere ungültige Werte
-                pass
+        # PnL hinzufügen
+        if entry.pnl is not None:
+            monthly_data[month_key]["pnl"] += entry.pnl
 
     # Ergebnisse nach Monaten
     results = []
@@ -1351,74 +3129,40 @@ def calculate_monthly_performance(entries):
     return results
 
 
-def calculate_checklist_win_rates(journal_id, entries):
+def calculate_checklist_win_rates(journal_id, entries, snapshot=None):
     """Berechnet die Gewinnrate für jedes Checklist-Item."""
-    templates = get_checklist_templates(journal_id)
-    statuses = load_data(STATUSES_FILE)
+    templates, statuses = checklist_inputs(journal_id, snapshot)
+    bitsets = build_checklist_bitsets(templates, entries, statuses)
 
-    item_stats = {}
-    for template in templates:
-        template_id = template['id']
-        item_stats[template_id] = {
-            "text": template['text'],
-            "checked_positive": 0,
-            "checked_losses": 0,
-            "unchecked_positive": 0,
-            "unchecked_losses": 0,
-            "checked_total_with_result": 0,
-            "unchecked_total_with_result": 0
-        }
-
-    for entry in entries:
-        entry_id = entry['id']
-        result = entry.get('result')
-        if not result:
-            continue
-
-        is_positive = result in ["Win", "BE", "PartialBE"]
-        is_loss = result == "Loss"
-
-        for template in templates:
-            template_id = template['id']
-
-            # Finde den Status für dieses Template und diesen Eintrag
-            entry_status = next((s for s in statuses if s['entry_id'] == entry_id and s['template_id'] == template_id),
-                                None)
-
-            if entry_status:
-                if entry_status['checked']:
-                    item_stats[template_id]["checked_total_with_result"] += 1
-                    if is_positive:
-                        item_stats[template_id]["checked_positive"] += 1
-                    elif is_loss:
-                        item_stats[template_id]["checked_losses"] += 1
-                else:
-                    item_stats[template_id]["unchecked_total_with_result"] += 1
-                    if is_positive:
-                        item_stats[template_id]["unchecked_positive"] += 1
-                    elif is_loss:
-                        item_stats[template_id]["unchecked_losses"] += 1
+    # Bitsets über die Einträge: positive Ergebnisse (Win, BE, PartialBE) und alle mit Ergebnis
+    positive_bits, _, with_result_bits = result_bitsets(entries)
 
     # Berechne die Gewinnraten
     results = []
-    for template_id, stats in item_stats.items():
+    for template in templates:
+        template_id = template['id']
+        known_bits, checked_bits = bitsets[template_id]
+        unchecked_bits = known_bits & ~checked_bits
+
         # Calculate win rates based on positive results (Win, BE, PartialBE) vs total results
+        checked_total = popcount(checked_bits & with_result_bits)
         checked_win_rate = 0
-        if stats["checked_total_with_result"] > 0:
-            checked_win_rate = (stats["checked_positive"] / stats["checked_total_with_result"]) * 100
+        if checked_total > 0:
+            checked_win_rate = (popcount(checked_bits & positive_bits) / checked_total) * 100
 
+        unchecked_total = popcount(unchecked_bits & with_result_bits)
         unchecked_win_rate = 0
-        if stats["unchecked_total_with_result"] > 0:
-            unchecked_win_rate = (stats["unchecked_positive"] / stats["unchecked_total_with_result"]) * 100
+        if unchecked_total > 0:
+            unchecked_win_rate = (popcount(unchecked_bits & positive_bits) / unchecked_total) * 100
 
         win_rate_diff = checked_win_rate - unchecked_win_rate
 
         results.append({
             "template_id": template_id,
-            "text": stats["text"],
-            "checked_total": stats["checked_total_with_result"],
+            "text": template['text'],
+            "checked_total": checked_total,
             "checked_win_rate": checked_win_rate,
-            "unchecked_total": stats["unchecked_total_with_result"],
+            "unchecked_total": unchecked_total,
             "unchecked_win_rate": unchecked_win_rate,
             "win_rate_diff": win_rate_diff
         })
@@ -1429,12 +3173,101 @@ def calculate_checklist_win_rates(journal_id, entries):
     return results
 
 
+MAX_COMBINATION_SIZE = 6  # Obergrenze für die Größe der untersuchten Checklisten-Kombinationen
+
+
+def calculate_checklist_combinations(journal_id, entries, min_support=0.05, max_size=4, top_k=20, min_size=2,
+                                     snapshot=None):
+    """
+    Sucht Kombinationen angehakter Checklist-Items mit hoher Gewinnrate (Apriori über Bitsets).
+    Jede Kombination ist das bitweise UND der Checked-Bitsets ihrer Vorlagen; Kombinationen, die
+    in weniger als min_support (Anteil der Einträge mit Ergebnis) vorkommen, werden verworfen,
+    und nur häufige Kombinationen werden zur nächsten Größe erweitert.
+    Gibt die top_k Kombinationen mit min_size bis max_size Items nach Gewinnrate zurück.
+    """
+    templates, statuses = checklist_inputs(journal_id, snapshot)
+    bitsets = build_checklist_bitsets(templates, entries, statuses)
+    positive_bits, _, with_result_bits = result_bitsets(entries)
+
+    total_with_result = popcount(with_result_bits)
+    baseline_win_rate = (popcount(positive_bits) / total_with_result * 100) if total_with_result else 0
+    min_count = max(1, math.ceil(min_support * total_with_result))
+
+    # Ebene 1: einzelne Vorlagen mit ausreichender Unterstützung
+    level = {}
+    for template in templates:
+        checked_bits = bitsets[template['id']][1] & with_result_bits
+        if popcount(checked_bits) >= min_count:
+            level[(template['id'],)] = checked_bits
+
+    candidates = []
+    size = 1
+    while level:
+        if size >= min_size:
+            candidates.extend(level.items())
+        if size >= max_size:
+            break
+
+        # Ebene k+1: Itemsets mit gleichem Präfix verbinden, alle Teilmengen müssen häufig sein
+        itemsets = sorted(level)
+        next_level = {}
+        for i, left in enumerate(itemsets):
+            for right in itemsets[i + 1:]:
+                if left[:-1] != right[:-1]:
+                    break
+                combined = left + right[-1:]
+                if any(combined[:j] + combined[j + 1:] not in level for j in range(len(combined) - 2)):
+                    continue
+                bits = level[left] & level[right]
+                if popcount(bits) >= min_count:
+                    next_level[combined] = bits
+        level = next_level
+        size += 1
+
+    template_texts = {t['id']: t['text'] for t in templates}
+    results = []
+    for itemset, bits in candidates:
+        support = popcount(bits)
+        win_rate = popcount(bits & positive_bits) / support * 100
+        results.append({
+            "template_ids": list(itemset),
+            "texts": [template_texts[template_id] for template_id in itemset],
+            "support": support,
+            "support_percentage": round(support / total_with_result * 100, 2),
+            "win_rate": win_rate,
+            "win_rate_diff": win_rate - baseline_win_rate
+        })
+
+    # Sortiere nach Gewinnrate, bei Gleichstand nach Unterstützung (absteigend)
+    results.sort(key=lambda x: (x["win_rate"], x["support"]), reverse=True)
+
+    return {
+        "baseline_win_rate": baseline_win_rate,
+        "total_with_result": total_with_result,
+        "min_support_count": min_count,
+        "combinations": results[:top_k]
+    }
+
+
+def get_checklist_combinations(journal_id, min_support=0.05, max_size=4, top_k=20):
+    """Gibt die Checklisten-Kombinationen mit der höchsten Gewinnrate für ein Journal zurück."""
+    snapshot = journal_snapshot(journal_id)
+    entries = snapshot.records() if snapshot else None
+    if not entries:
+        return None
+
+    result = calculate_checklist_combinations(journal_id, entries, min_support, max_size, top_k,
+                                              snapshot=snapshot)
+    result['journal_id'] = journal_id
+    return result
+
+
 def calculate_emotion_performance(entries):
     """Berechnet die Performance nach emotionalen Zuständen."""
     emotion_data = {}
 
     for entry in entries:
-        emotion = entry.get('emotion')
+        emotion = entry.emotion
         if not emotion:
             continue
 
@@ -1444,7 +3277,7 @@ def calculate_emotion_performance(entries):
         emotion_data[emotion]['count'] += 1
 
         # Count Win, BE, and PartialBE as positive results, Only Loss as negative
-        result = entry.get('result')
+        result = entry.result
         if result:
             emotion_data[emotion]['total_with_result'] += 1
             if result == "Loss":
@@ -1453,14 +3286,8 @@ def calculate_emotion_performance(entries):
                 emotion_data[emotion]['positive_results'] += 1
 
         # Füge PnL hinzu, wenn vorhanden
-        if entry.get('pnl') is not None:
-            pnl = entry.get('pnl')
-            if isinstance(pnl, str):
-                try:
-                    pnl = float(pnl)
-                except ValueError:
-                    continue
-            emotion_data[emotion]['pnl'] += pnl
+        if entry.pnl is not None:
+            emotion_data[emotion]['pnl'] += entry.pnl
 
     results = []
     for emotion, data in emotion_data.items():
@@ -0,0 +1,243 @@
+# src/entry_records.py - Normalisierung und kompakte Darstellung von Journal-Einträgen
+
+import math
+import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Erlaubte Werte der Aufzählungsfelder
+RESULT_VALUES = ("Win", "Loss", "BE", "PartialBE")
+POSITIVE_RESULTS = ("Win", "BE", "PartialBE")  # Win, BE und PartialBE zählen als positiv
+POSITION_TYPES = ("Long", "Short")
+
+# Numerische Felder, die beim Schreiben in Zahlen umgewandelt werden
+NUMERIC_FIELDS = ('pnl', 'initial_rr', 'risk_percentage', 'confidence_level', 'trade_rating')
+
+# Datumsfelder und ihre abgeleiteten Felder (kanonische UTC-Form, Epoch-Sekunden)
+DATE_FIELDS = {
+    'entry_date': ('entry_date_utc', 'entry_ts'),
+    'end_date': ('end_date_utc', 'end_ts'),
+}
+
+# Vorberechnete Gruppierungsschlüssel des Einstiegszeitpunkts (in der Zeitzone des Journals)
+BUCKET_FIELDS = ('bucket_tz', 'bucket_hour', 'bucket_weekday', 'bucket_date', 'bucket_month')
+
+DEFAULT_TIMEZONE = 'UTC'
+
+# Standard-Sessions (Stunden in der Auswertungs-Zeitzone, Ende exklusiv, Übergang über Mitternacht erlaubt)
+DEFAULT_SESSIONS = [
+    {'name': "Morgen (6-10 Uhr)", 'start': 6, 'end': 10},
+    {'name': "Vormittag (10-12 Uhr)", 'start': 10, 'end': 12},
+    {'name': "Mittag (12-14 Uhr)", 'start': 12, 'end': 14},
+    {'name': "Nachmittag (14-18 Uhr)", 'start': 14, 'end': 18},
+    {'name': "Abend (18-22 Uhr)", 'start': 18, 'end': 22},
+    {'name': "Nacht (22-6 Uhr)", 'start': 22, 'end': 6},
+]
+
+
+class ValidationError(ValueError):
+    """Wird ausgelöst, wenn Eingabedaten ungültige Werte enthalten."""
+
+    def __init__(self, field, message):
+        super().__init__(f"{field}: {message}")
+        self.field = field
+        self.message = f"{field}: {message}"
+
+
+class EntryValidationError(ValidationError):
+    """Wird ausgelöst, wenn ein Eintrag ungültige Werte enthält."""
+
+
+def resolve_timezone(name, field='timezone'):
+    """Gibt die ZoneInfo zu einem IANA-Namen zurück (leere Werte ergeben UTC)."""
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(field, f"Unbekannte Zeitzone '{name}'")
+
+
+def validate_sessions(sessions):
+    """Prüft eine Session-Definition [{'name', 'start', 'end'}, ...] und gibt sie bereinigt zurück."""
+    if not isinstance(sessions, list) or not sessions:
+        raise ValidationError('sessions', "Liste von Sessions erwartet")
+
+    cleaned, names = [], set()
+    for session in sessions:
+        if not isinstance(session, dict) or not session.get('name'):
+            raise ValidationError('sessions', "Jede Session benötigt einen Namen")
+        start, end = session.get('start'), session.get('end')
+        if not isinstance(start, int) or not isinstance(end, int) or not 0 <= start <= 23 or not 0 <= end <= 24:
+            raise ValidationError('sessions', f"Ungültige Stunden für Session '{session['name']}'")
+        # Die Statistik gruppiert nach Namen; gleichnamige Sessions würden zusammenfallen
+        key = str(session['name']).strip().casefold()
+        if key in names:
+            raise ValidationError('sessions', f"Session '{session['name']}' ist doppelt vorhanden")
+        names.add(key)
+        cleaned.append({'name': str(session['name']), 'start': start, 'end': end})
+    return cleaned
+
+
+def session_hour_table(sessions):
+    """Ordnet jeder Stunde (0-23) den Namen der ersten passenden Session zu (oder None)."""
+    table = [None] * 24
+    for session in sessions:
+        start, end = session['start'], session['end'] % 24
+        hours = range(start, end) if start < end else list(range(start, 24)) + list(range(0, end))
+        for hour in hours:
+            if table[hour] is None:
+                table[hour] = session['name']
+    return table
+
+
+def derive_bucket_fields(entry, bucket_tz):
+    """
+    Berechnet die Gruppierungsschlüssel (Stunde, Wochentag, Datum, Monat) aus entry_ts
+    in der Auswertungs-Zeitzone. Wird nur bei Änderung des Datums oder der Zeitzone aufgerufen.
+    """
+    if entry.get('entry_ts') is None:
+        for field in BUCKET_FIELDS:
+            entry[field] = None
+        return
+
+    local = datetime.datetime.fromtimestamp(entry['entry_ts'], bucket_tz)
+    entry['bucket_tz'] = str(bucket_tz)
+    entry['bucket_hour'] = local.hour
+    entry['bucket_weekday'] = local.weekday()
+    entry['bucket_date'] = local.strftime('%Y-%m-%d')
+    entry['bucket_month'] = local.strftime('%Y-%m')
+
+
+def parse_number(value, field):
+    """
+    Wandelt Zahlen und Zahl-Strings in int/float um; leere Werte ergeben None.
+    Ganzzahlige Eingaben bleiben int, damit die JSON-Ausgabe unverändert bleibt.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise EntryValidationError(field, f"'{value}' ist keine endliche Zahl")
+        return value
+
+    text = str(value).strip().replace(',', '.')
+    if not text:
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        raise EntryValidationError(field, f"'{value}' ist keine Zahl")
+    if not math.isfinite(number):
+        raise EntryValidationError(field, f"'{value}' ist keine endliche Zahl")
+    return int(number) if number.is_integer() and '.' not in text and 'e' not in text.lower() else number
+
+
+def parse_choice(value, field, choices):
+    """Prüft ein Aufzählungsfeld; leere Werte ergeben None."""
+    if value is None or value == '':
+        return None
+    if value not in choices:
+        raise EntryValidationError(field, f"'{value}' ist nicht erlaubt ({', '.join(choices)})")
+    return value
+
+
+def parse_datetime(value, field, tzinfo=datetime.timezone.utc):
+    """
+    Parst ein ISO-Datum (mit 'Z', Offset oder ohne Zeitzone).
+    Datumswerte ohne Zeitzone werden in tzinfo interpretiert.
+    Rückgabe: (kanonische UTC-Form, Epoch-Sekunden) oder (None, None) für leere Werte.
+    """
+    if value is None or value == '':
+        return None, None
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise EntryValidationError(field, f"'{value}' ist kein gültiges Datum")
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tzinfo)
+    utc = parsed.astimezone(datetime.timezone.utc)
+    return utc.strftime('%Y-%m-%dT%H:%M:%SZ'), int(utc.timestamp())
+
+
+def normalize_entry_fields(entry, strict=True, input_tz=datetime.timezone.utc, bucket_tz=datetime.timezone.utc):
+    """
+    Normalisiert die typisierten Felder eines Eintrags (in-place) und berechnet die
+    abgeleiteten Datumsfelder. Nur vorhandene Felder werden verarbeitet, sodass auch
+    Teil-Updates normalisiert werden können.
+    Datumswerte ohne Zeitzone gelten in input_tz, die Gruppierungsschlüssel werden in
+    bucket_tz berechnet (nur wenn entry_date enthalten ist).
+    Mit strict=False werden ungültige Werte auf None gesetzt statt einen Fehler auszulösen
+    (für die Migration bestehender Dateien). Gibt die Liste der verworfenen Felder zurück.
+    """
+    rejected = []
+
+    def apply(field, parser):
+        try:
+            entry[field] = parser(entry[field])
+        except EntryValidationError:
+            if strict:
+                raise
+            rejected.append(field)
+            entry[field] = None
+
+    for field in NUMERIC_FIELDS:
+        if field in entry:
+            apply(field, lambda value, field=field: parse_number(value, field))
+
+    if 'result' in entry:
+        apply('result', lambda value: parse_choice(value, 'result', RESULT_VALUES))
+    if 'position_type' in entry:
+        apply('position_type', lambda value: parse_choice(value, 'position_type', POSITION_TYPES))
+
+    for field, (utc_field, ts_field) in DATE_FIELDS.items():
+        if field not in entry:
+            continue
+        try:
+            entry[utc_field], entry[ts_field] = parse_datetime(entry[field], field, input_tz)
+        except EntryValidationError:
+            if strict:
+                raise
+            rejected.append(field)
+            entry[utc_field], entry[ts_field] = None, None
+
+    if 'entry_date' in entry:
+        derive_bucket_fields(entry, bucket_tz)
+
+    return rejected
+
+
+class EntryRecord:
+    """
+    Kompakte, bereits typisierte Darstellung eines Eintrags für die Statistik.
+    Enthält nur die Felder, die in den Auswertungen gebraucht werden.
+    """
+
+    __slots__ = ('id', 'journal_id', 'entry_ts', 'end_ts', 'symbol', 'position_type', 'strategy',
+                 'initial_rr', 'risk_percentage', 'pnl', 'result', 'confidence_level',
+                 'trade_rating', 'emotion', 'bucket_hour', 'bucket_weekday', 'bucket_date',
+                 'bucket_month')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, entry):
+        """Erstellt einen Datensatz aus einem (normalisierten) Eintrag."""
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(record, name, entry.get(name))
+        return record
+
+    @property
+    def is_positive(self):
+        """Win, BE und PartialBE zählen als positives Ergebnis."""
+        return self.result in POSITIVE_RESULTS
+
+    @property
+    def entry_datetime(self):
+        """Einstiegszeitpunkt als UTC-datetime (oder None)."""
+        if self.entry_ts is None:
+            return None
+        return datetime.datetime.fromtimestamp(self.entry_ts, datetime.timezone.utc)
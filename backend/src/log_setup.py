@@ -0,0 +1,157 @@
+# src/log_setup.py - Asynchrones Logging (QueueHandler/QueueListener) mit Rotation, JSON und Sampling
+
+import json
+import time
+import queue
+import atexit
+import logging
+import datetime
+import threading
+import logging.handlers
+from flask import g, request
+
+DEFAULT_LOG_FILE = 'trading_journal.log'
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Häufige Meldungen werden nur jedes n-te Mal geschrieben (Schlüssel: extra={'sample': ...})
+DEFAULT_SAMPLE_RATES = {'storage.save': 10, 'http.request': 10}
+
+# Attribute eines LogRecord, die nicht als Zusatzfelder in den JSON-Datensatz gehören
+RESERVED_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_listener_guard = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatiert einen LogRecord als einzeiliges JSON-Objekt inklusive der extra-Felder."""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRIBUTES and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lässt von Meldungen mit einem Sampling-Schlüssel (extra={'sample': 'storage.save'}) nur jede
+    n-te durch und vermerkt die Rate im Datensatz (sampled=n). Warnungen und Fehler werden nie verworfen.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        rate = self.rates.get(key, 1) if key else 1
+        if rate <= 1 or record.levelno >= logging.WARNING:
+            return True
+        with self.lock:
+            count = self.counters.get(key, 0)
+            self.counters[key] = count + 1
+        if count % rate:
+            return False
+        record.sampled = rate
+        return True
+
+
+def build_file_handler(config):
+    """Rotierende Logdatei mit JSON- oder Textformat (config['LOG_FORMAT'])."""
+    handler = logging.handlers.RotatingFileHandler(
+        config.get('LOG_FILE') or DEFAULT_LOG_FILE,
+        maxBytes=config.get('LOG_MAX_BYTES', DEFAULT_MAX_BYTES),
+        backupCount=config.get('LOG_BACKUP_COUNT', DEFAULT_BACKUP_COUNT),
+        encoding='utf-8',
+        delay=True
+    )
+    if config.get('LOG_FORMAT', 'json') == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def configure_logging(config):
+    """
+    Leitet das Root-Logging über eine Warteschlange an einen Hintergrund-Thread um: Aufrufer
+    legen Datensätze nur in die Queue, das Schreiben (und Rotieren) der Datei übernimmt der
+    QueueListener. Vorhandene Root-Handler (z. B. aus einem impliziten basicConfig) werden
+    ersetzt, mehrfache Aufrufe ersetzen die vorherige Konfiguration.
+    """
+    global _listener
+    with _listener_guard:
+        root = logging.getLogger()
+        if _listener is not None:
+            _listener.stop()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(config.get('LOG_SAMPLE_RATES', DEFAULT_SAMPLE_RATES)))
+
+        _listener = logging.handlers.QueueListener(log_queue, build_file_handler(config),
+                                                   respect_handler_level=True)
+        _listener.start()
+
+        root.addHandler(queue_handler)
+        root.setLevel(config.get('LOG_LEVEL', logging.INFO))
+
+
+def shutdown_logging():
+    """Schreibt ausstehende Datensätze und beendet den Listener-Thread."""
+    global _listener
+    with _listener_guard:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _start_request_timer():
+    g._log_start = time.perf_counter()
+
+
+def _log_request(response):
+    start = g.pop('_log_start', None)
+    if start is not None:
+        logging.info(f"{request.method} {request.path} {response.status_code}", extra={
+            'sample': 'http.request',
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3)
+        })
+    return response
+
+
+def init_logging(app):
+    """
+    Richtet das asynchrone Logging anhand der App-Konfiguration ein (LOG_FILE, LOG_FORMAT,
+    LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_SAMPLE_RATES). Mit LOG_REQUESTS wird
+    zusätzlich jede Anfrage mit Dauer protokolliert (gesampelt).
+    """
+    configure_logging(app.config)
+    if app.config.get('LOG_REQUESTS'):
+        app.before_request(_start_request_timer)
+        app.after_request(_log_request)
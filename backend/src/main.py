@@ -4,7 +4,6 @@ import os
 import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from flask import Flask, jsonify, send_from_directory
 from flask import Flask, jsonify
 from flask_cors import CORS  # Add this import
 
@@ -12,16 +11,27 @@ app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
+# Gemeinsame Konfiguration (src/app_config.py), vor dem Import der Routen
+from src.app_config import configure_app
+configure_app(app)
+
 # Importiere die Route-Definitionen
 from src.routes.journal_routes import journal_bp
 from src.routes.entry_routes import entry_bp
 from src.routes.stats_routes import stats_bp
+from src.upload_serving import serve_upload_file
+from src import data_storage
 
 # Registriere die Blueprints
 app.register_blueprint(journal_bp, url_prefix='/api')
 app.register_blueprint(entry_bp, url_prefix='/api')
 app.register_blueprint(stats_bp, url_prefix='/api')
 
+@app.errorhandler(413)
+def request_entity_too_large(error):
+    """Antwortet auf zu große Uploads mit einer JSON-Fehlermeldung"""
+    return jsonify({"error": "Datei ist zu groß"}), 413
+
 # Entfernt: Die Routen für statische Dateien
 
 # Route zum Bereitstellen hochgeladener Dateien (wird für die API benötigt)
@@ -29,24 +39,9 @@ app.register_blueprint(stats_bp, url_prefix='/api')
 def serve_upload(filename):
     """
     Dient zum Bereitstellen hochgeladener Dateien
-    Fügt zusätzliche Fehlerprüfung für "None"-Werte hinzu
+    Unveränderliche Dateien werden mit langlebigen Cache-Headern, ETag und Range-Support ausgeliefert
     """
-    # Überprüfen, ob der Dateiname "None" ist oder nicht existiert
-    if filename == "None" or not filename:
-        return jsonify({"error": "Ungültiger Dateipfad"}), 400
-
-    upload_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'uploads')
-
-    # Sicherheitsprüfung: sicherstellen, dass der Dateiname sicher ist
-    safe_path = os.path.abspath(os.path.join(upload_dir, filename))
-    if not safe_path.startswith(os.path.abspath(upload_dir)):
-        return jsonify({"error": "Ungültiger Dateipfad"}), 400
-
-    # Überprüfen, ob die Datei existiert
-    if not os.path.exists(safe_path):
-        return jsonify({"error": "Datei nicht gefunden"}), 404
-
-    return send_from_directory(upload_dir, filename)
+    return serve_upload_file(data_storage.UPLOADS_DIR, filename, data_storage.upload_content_hash)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
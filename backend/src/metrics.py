@@ -0,0 +1,160 @@
+# src/metrics.py - Laufzeitmetriken (Request-Latenzen, Speicherzähler) im Prometheus-Textformat
+
+import os
+import threading
+import time
+from flask import Response, g, request
+
+# Metriken sind standardmäßig aus; dann kosten die Messpunkte nur eine Abfrage von `enabled`
+enabled = False
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STORAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monoton steigender Zähler mit optionalen Labels."""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{format_labels(self.labels, label_values)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogramm mit festen Bucket-Grenzen (kumulativ ausgegeben, wie von Prometheus erwartet)."""
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}  # Label-Werte -> [Zähler je Bucket..., Summe, Anzahl]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            series = self.values.get(label_values)
+            if series is None:
+                series = self.values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((key, list(series)) for key, series in self.values.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = format_labels(self.labels, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+# Request-Metriken
+REQUEST_LATENCY = Histogram('trading_journal_http_request_duration_seconds',
+                            'Dauer der HTTP-Anfragen nach Route', ('method', 'route', 'status'))
+
+# Speicher-Metriken (werden in data_storage erfasst)
+FILE_LOADS = Counter('trading_journal_storage_file_loads_total', 'Gelesene JSON-Dateien', ('file',))
+BINARY_LOADS = Counter('trading_journal_storage_binary_loads_total',
+                       'Aus Binärdateien statt JSON geladene Dateien', ('file',))
+BYTES_PARSED = Counter('trading_journal_storage_bytes_parsed_total', 'Geparste Bytes', ('file',))
+PARSE_SECONDS = Histogram('trading_journal_storage_parse_seconds', 'Dauer von json.loads',
+                          ('file',), STORAGE_BUCKETS)
+FILE_SAVES = Counter('trading_journal_storage_file_saves_total', 'Geschriebene JSON-Dateien', ('file',))
+BYTES_WRITTEN = Counter('trading_journal_storage_bytes_written_total', 'Geschriebene Bytes', ('file',))
+COALESCED_SAVES = Counter('trading_journal_storage_coalesced_saves_total',
+                          'Speicherungen, die per Group Commit in einen anderen Schreibvorgang eingingen', ('file',))
+LOCK_WAIT_SECONDS = Histogram('trading_journal_storage_lock_wait_seconds',
+                              'Wartezeit auf Dateisperren (acquire_lock)', (), STORAGE_BUCKETS)
+LOCK_TIMEOUTS = Counter('trading_journal_storage_lock_timeouts_total', 'Abgelaufene Sperranforderungen')
+BACKUP_SECONDS = Histogram('trading_journal_storage_backup_seconds', 'Dauer eines Backups',
+                           (), STORAGE_BUCKETS)
+
+REGISTRY = (REQUEST_LATENCY, FILE_LOADS, BINARY_LOADS, BYTES_PARSED, PARSE_SECONDS, FILE_SAVES,
+            BYTES_WRITTEN, COALESCED_SAVES, LOCK_WAIT_SECONDS, LOCK_TIMEOUTS, BACKUP_SECONDS)
+
+
+def file_label(file_path):
+    """Label für eine Datei ohne Journal-ID (entries, journals, ...), begrenzt die Anzahl der Reihen."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _start_timer():
+    g._metrics_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.pop('_metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        REQUEST_LATENCY.observe(time.perf_counter() - start, request.method, route, response.status_code)
+    return response
+
+
+def init_metrics(app):
+    """
+    Aktiviert die Metriken, wenn app.config['METRICS_ENABLED'] gesetzt ist:
+    registriert die Request-Hooks und den Endpunkt /api/metrics.
+    Ohne Aktivierung wird nichts registriert.
+    """
+    global enabled
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    enabled = True
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        """Metriken im Prometheus-Textformat"""
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,165 @@
+# src/profiling.py - Profiling einzelner API-Anfragen auf Anforderung (cProfile)
+
+import os
+import time
+import uuid
+import heapq
+import pstats
+import cProfile
+import logging
+import itertools
+import threading
+from flask import current_app, g, request
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_FLAG = '_profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+DEFAULT_MAX_PROFILES = 50
+MAX_STACK_DEPTH = 64
+MAX_STACK_PATHS = 20000  # Obergrenze der besuchten Aufrufpfade je Profil
+
+# cProfile erlaubt nur einen aktiven Profiler gleichzeitig
+_profile_lock = threading.Lock()
+
+
+def profiling_requested():
+    """Prüft, ob die Anfrage per Header (X-Profile: 1) oder Query (?_profile=1) ein Profil anfordert."""
+    flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_FLAG)
+    return bool(flag) and flag.lower() not in ('0', 'false', 'no')
+
+
+def function_label(func):
+    """Lesbarer Name eines pstats-Funktionsschlüssels (Datei:Zeile:Funktion)."""
+    filename, line, name = func
+    if filename == '~':
+        return name  # eingebaute Funktionen
+    return f"{os.path.basename(filename)}:{line}:{name}"
+
+
+def collapsed_stacks(stats):
+    """
+    Leitet aus dem cProfile-Aufrufgraphen Stacks im "collapsed"-Format für Flamegraphs ab
+    (Frame;Frame;Frame Mikrosekunden). cProfile kennt nur Aufrufer-Kanten, daher wird die Zeit
+    einer Funktion anteilig nach der kumulierten Zeit je Aufrufer auf die Pfade verteilt.
+    Da die Zahl der Pfade im Aufrufgraphen exponentiell wachsen kann, werden die Pfade nach
+    ihrer anteiligen Zeit absteigend besucht, höchstens MAX_STACK_PATHS; Pfade unter einer
+    Mikrosekunde entfallen.
+    """
+    children = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+    order = itertools.count()  # Gleichstand in der Warteschlange ohne Vergleich der Stacks
+    pending = [(-stats[func][3], next(order), func, (), 1.0)
+               for func, (_, _, _, _, callers) in stats.items() if not callers]
+    heapq.heapify(pending)
+    visited = 0
+    while pending and visited < MAX_STACK_PATHS:
+        weight, _, func, stack, scale = heapq.heappop(pending)
+        if -weight * 1000000 < 1:
+            break  # alle übrigen Pfade sind noch kürzer
+        visited += 1
+        stack = stack + (function_label(func),)
+        micros = int(stats[func][2] * scale * 1000000)
+        if micros > 0:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0) + micros
+        if len(stack) >= MAX_STACK_DEPTH:
+            continue
+        for child, edge_time in children.get(func, ()):
+            child_total = stats[child][3]
+            if child_total <= 0 or function_label(child) in stack:
+                continue  # Rekursion nicht erneut auffalten
+            child_scale = scale * min(1.0, edge_time / child_total)
+            heapq.heappush(pending, (-child_total * child_scale, next(order), child, stack, child_scale))
+
+    return [f"{stack} {micros}" for stack, micros in sorted(lines.items())]
+
+
+def rotate_profiles(directory, max_profiles):
+    """Löscht die ältesten Profile, sodass höchstens max_profiles übrig bleiben."""
+    profiles = {}
+    for name in os.listdir(directory):
+        profile_id, extension = os.path.splitext(name)
+        if extension in ('.pstats', '.collapsed'):
+            path = os.path.join(directory, name)
+            profiles.setdefault(profile_id, []).append(path)
+
+    ordered = sorted(profiles.items(), key=lambda item: max(os.path.getmtime(p) for p in item[1]))
+    for _, paths in ordered[:max(0, len(ordered) - max_profiles)]:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def save_profile(profile, directory, max_profiles, label):
+    """Speichert pstats- und collapsed-Datei eines Profils und gibt die Profil-ID zurück."""
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    profile.dump_stats(os.path.join(directory, f"{profile_id}.pstats"))
+    stats = pstats.Stats(profile).stats
+    with open(os.path.join(directory, f"{profile_id}.collapsed"), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+
+    rotate_profiles(directory, max_profiles)
+    logging.info(f"Profil {profile_id} gespeichert ({label})")
+    return profile_id
+
+
+def _start_profile():
+    if not profiling_requested():
+        return
+    if not _profile_lock.acquire(blocking=False):
+        g._profile_busy = True
+        return
+    profile = cProfile.Profile()
+    g._profile = profile
+    profile.enable()
+
+
+def _stop_profile():
+    """Beendet ein laufendes Profil; gibt es zurück (oder None)."""
+    profile = g.pop('_profile', None)
+    if profile is not None:
+        profile.disable()
+        _profile_lock.release()
+    return profile
+
+
+def _finish_profile(response):
+    profile = _stop_profile()
+    if profile is not None:
+        config = current_app.config
+        try:
+            profile_id = save_profile(profile, config['PROFILING_DIR'],
+                                      config.get('PROFILING_MAX_PROFILES', DEFAULT_MAX_PROFILES),
+                                      f"{request.method} {request.path}")
+            response.headers[PROFILE_ID_HEADER] = profile_id
+        except Exception as e:
+            logging.error(f"Fehler beim Speichern des Profils: {e}")
+    elif g.pop('_profile_busy', False):
+        response.headers[PROFILE_ID_HEADER] = 'busy'
+    return response
+
+
+def _teardown_profile(exception=None):
+    # Falls after_request nicht gelaufen ist, den Profiler trotzdem beenden
+    _stop_profile()
+
+
+def init_profiling(app):
+    """
+    Aktiviert das Profiling, wenn app.config['PROFILING_ENABLED'] gesetzt ist.
+    Profile werden in app.config['PROFILING_DIR'] abgelegt (höchstens PROFILING_MAX_PROFILES).
+    """
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_teardown_profile)
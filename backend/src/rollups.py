@@ -0,0 +1,394 @@
+# src/rollups.py - Tages-Rollups für Statistiken über beliebige Zeiträume und Journale
+
+import bisect
+import heapq
+import datetime
+
+from src.entry_records import POSITIVE_RESULTS, DEFAULT_SESSIONS, session_hour_table
+
+WEEKDAY_NAMES = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+
+
+class RollupCell:
+    """
+    Aufsummierte Kennzahlen aller Einträge eines Tages mit gleichem Symbol und gleicher Strategie.
+    Zellen lassen sich addieren und wieder abziehen, sodass Schreibvorgänge sie inkrementell pflegen.
+    """
+
+    __slots__ = ('count', 'results', 'long', 'short', 'pnl', 'win_pnl', 'win_pnl_count',
+                 'loss_pnl', 'loss_pnl_count', 'rr', 'rr_count', 'hours')
+
+    def __init__(self):
+        self.count = 0
+        self.results = {'Win': 0, 'Loss': 0, 'BE': 0, 'PartialBE': 0}
+        self.long = 0
+        self.short = 0
+        self.pnl = 0
+        self.win_pnl = 0
+        self.win_pnl_count = 0
+        self.loss_pnl = 0
+        self.loss_pnl_count = 0
+        self.rr = 0
+        self.rr_count = 0
+        self.hours = {}  # Stunde -> [Anzahl, positive Ergebnisse, Verluste, mit Ergebnis]
+
+    def apply(self, record, sign=1):
+        """Addiert (sign=1) oder entfernt (sign=-1) einen EntryRecord."""
+        self.count += sign
+        if record.result in self.results:
+            self.results[record.result] += sign
+        if record.position_type == "Long":
+            self.long += sign
+        elif record.position_type == "Short":
+            self.short += sign
+
+        if record.pnl is not None:
+            self.pnl += sign * record.pnl
+            if record.result == "Win":
+                self.win_pnl += sign * record.pnl
+                self.win_pnl_count += sign
+            elif record.result == "Loss":
+                self.loss_pnl += sign * record.pnl
+                self.loss_pnl_count += sign
+
+        if record.initial_rr is not None:
+            self.rr += sign * record.initial_rr
+            self.rr_count += sign
+
+        if record.bucket_hour is not None:
+            hour = self.hours.setdefault(record.bucket_hour, [0, 0, 0, 0])
+            hour[0] += sign
+            if record.result:
+                hour[3] += sign
+                if record.result == "Loss":
+                    hour[2] += sign
+                elif record.result in POSITIVE_RESULTS:
+                    hour[1] += sign
+            if not any(hour):
+                del self.hours[record.bucket_hour]
+
+    def merge(self, other):
+        """Addiert eine andere Zelle (für die Auswertung eines Zeitraums)."""
+        self.count += other.count
+        for result, count in other.results.items():
+            self.results[result] += count
+        self.long += other.long
+        self.short += other.short
+        self.pnl += other.pnl
+        self.win_pnl += other.win_pnl
+        self.win_pnl_count += other.win_pnl_count
+        self.loss_pnl += other.loss_pnl
+        self.loss_pnl_count += other.loss_pnl_count
+        self.rr += other.rr
+        self.rr_count += other.rr_count
+        for hour, counters in other.hours.items():
+            target = self.hours.setdefault(hour, [0, 0, 0, 0])
+            for i, value in enumerate(counters):
+                target[i] += value
+        return self
+
+    @property
+    def positive_results(self):
+        return self.results['Win'] + self.results['BE'] + self.results['PartialBE']
+
+    @property
+    def losses(self):
+        return self.results['Loss']
+
+    @property
+    def total_with_result(self):
+        return self.positive_results + self.losses
+
+    @property
+    def win_rate(self):
+        """Win, BE und PartialBE gelten als positiv, nur Loss als negativ."""
+        total = self.total_with_result
+        return (self.positive_results / total * 100) if total > 0 else 0
+
+
+class JournalRollups:
+    """
+    Rollup-Index eines Journals: Datum (bucket_date) -> (Symbol, Strategie) -> RollupCell.
+    Die sortierte Datumsliste erlaubt Bereichsabfragen per Binärsuche.
+    Einträge ohne Datum liegen unter dem Schlüssel None und zählen nur ohne Datumsfilter.
+    totals enthält die Summen über alle Einträge (für Journal-Übersichten).
+    """
+
+    def __init__(self, signature=None):
+        self.signature = signature
+        self.days = {}
+        self.dates = []
+        self.totals = RollupCell()
+
+    @classmethod
+    def build(cls, records, signature=None):
+        """Erstellt den Index aus allen Datensätzen eines Journals."""
+        rollups = cls(signature)
+        for record in records:
+            rollups.apply(record)
+        return rollups
+
+    def apply(self, record, sign=1):
+        """Addiert oder entfernt einen Datensatz; leere Zellen und Tage werden entfernt."""
+        date = record.bucket_date
+        day = self.days.get(date)
+        if day is None:
+            if sign < 0:
+                return
+            day = self.days[date] = {}
+            if date is not None:
+                bisect.insort(self.dates, date)
+
+        key = (record.symbol or None, record.strategy or None)
+        cell = day.get(key)
+        if cell is None:
+            if sign < 0:
+                return
+            cell = day[key] = RollupCell()
+        cell.apply(record, sign)
+        self.totals.apply(record, sign)
+
+        if cell.count <= 0:
+            del day[key]
+            if not day:
+                del self.days[date]
+                if date is not None:
+                    self.dates.pop(bisect.bisect_left(self.dates, date))
+
+    def cells(self, date_from=None, date_to=None, symbol=None, strategy=None):
+        """Liefert (Datum, Symbol, Strategie, Zelle) für alle passenden Zellen im Zeitraum (inklusive)."""
+        start = bisect.bisect_left(self.dates, date_from) if date_from else 0
+        end = bisect.bisect_right(self.dates, date_to) if date_to else len(self.dates)
+        dates = self.dates[start:end]
+        if date_from is None and date_to is None and None in self.days:
+            dates = dates + [None]
+
+        for date in dates:
+            for (cell_symbol, cell_strategy), cell in self.days[date].items():
+                if symbol is not None and cell_symbol != symbol:
+                    continue
+                if strategy is not None and cell_strategy != strategy:
+                    continue
+                yield date, cell_symbol, cell_strategy, cell
+
+    def summary(self):
+        """Kurzübersicht für das Dashboard aus den laufenden Summen."""
+        totals = self.totals
+        return {
+            'entry_count': totals.count,
+            'last_trade_date': self.dates[-1] if self.dates else None,
+            'total_pnl': round(totals.pnl, 2),
+            'win_rate_percentage': round(totals.win_rate, 2),
+            'wins': totals.positive_results,
+            'losses': totals.losses
+        }
+
+
+def rollup_statistics(cells, sessions=None):
+    """
+    Fasst Rollup-Zellen zu Statistiken im Format von get_journal_statistics zusammen.
+    Checklisten- und Emotionsauswertungen sind nicht enthalten, da sie nicht aufsummiert werden.
+    """
+    total = RollupCell()
+    by_symbol = {}
+    by_strategy = {}
+    by_date = {}
+    by_month = {}
+
+    for date, symbol, strategy, cell in cells:
+        total.merge(cell)
+        if symbol:
+            by_symbol.setdefault(symbol, RollupCell()).merge(cell)
+        if strategy:
+            by_strategy.setdefault(strategy, RollupCell()).merge(cell)
+        if date is not None:
+            by_date.setdefault(date, RollupCell()).merge(cell)
+            by_month.setdefault(date[:7], RollupCell()).merge(cell)
+
+    if total.count == 0:
+        return None
+
+    symbol_stats = [{
+        'symbol': symbol,
+        'count': cell.count,
+        'wins': cell.positive_results,
+        'losses': cell.losses,
+        'win_rate': cell.win_rate
+    } for symbol, cell in by_symbol.items()]
+    symbol_stats.sort(key=lambda x: x['count'], reverse=True)
+
+    strategy_stats = [{
+        'strategy': strategy,
+        'count': cell.count,
+        'wins': cell.positive_results,
+        'losses': cell.losses,
+        'win_rate': cell.win_rate,
+        'total_pnl': cell.pnl,
+        'avg_pnl': cell.pnl / cell.count if cell.count > 0 else 0
+    } for strategy, cell in by_strategy.items()]
+    strategy_stats.sort(key=lambda x: x['count'], reverse=True)
+
+    # Sessions aus den Stundenzählern zusammensetzen
+    sessions = sessions or DEFAULT_SESSIONS
+    hour_table = session_hour_table(sessions)
+    session_data = {session['name']: [0, 0, 0, 0] for session in sessions}
+    for hour, counters in total.hours.items():
+        name = hour_table[hour]
+        if name is not None:
+            for i, value in enumerate(counters):
+                session_data[name][i] += value
+    session_stats = [{
+        'session': name,
+        'total': data[0],
+        'wins': data[1],
+        'losses': data[2],
+        'win_rate': (data[1] / data[3] * 100) if data[3] > 0 else 0
+    } for name, data in session_data.items()]
+
+    # Wochentage ergeben sich aus dem Datum
+    weekdays = [RollupCell() for _ in WEEKDAY_NAMES]
+    for date, cell in by_date.items():
+        weekdays[datetime.date.fromisoformat(date).weekday()].merge(cell)
+    weekday_stats = [{
+        'day': WEEKDAY_NAMES[index],
+        'total': cell.count,
+        'wins': cell.positive_results,
+        'losses': cell.losses,
+        'win_rate': cell.win_rate
+    } for index, cell in enumerate(weekdays)]
+
+    calendar = [{
+        'date': date,
+        'total': cell.count,
+        'wins': cell.positive_results,
+        'losses': cell.losses,
+        'win_rate': cell.win_rate,
+        'pnl': cell.pnl
+    } for date, cell in sorted(by_date.items())]
+
+    monthly_stats = []
+    for month_key, cell in sorted(by_month.items()):
+        month_start = datetime.date(int(month_key[:4]), int(month_key[5:7]), 1)
+        monthly_stats.append({
+            'month': month_key,
+            'month_name': month_start.strftime('%B %Y'),
+            'total': cell.count,
+            'wins': cell.positive_results,
+            'losses': cell.losses,
+            'win_rate': cell.win_rate,
+            'pnl': cell.pnl
+        })
+
+    avg_pnl = total.pnl / total.count
+    avg_win_pnl = total.win_pnl / total.win_pnl_count if total.win_pnl_count else 0
+    avg_loss_pnl = total.loss_pnl / total.loss_pnl_count if total.loss_pnl_count else 0
+    avg_rr = total.rr / total.rr_count if total.rr_count else 0
+
+    return {
+        'total_trades': total.count,
+        'win_rate_percentage': round(total.win_rate, 2),
+        'results_count': dict(total.results),
+        'position_type_count': {
+            'Long': total.long,
+            'Short': total.short
+        },
+        'average_pnl': round(avg_pnl, 2),
+        'average_winning_pnl': round(avg_win_pnl, 2),
+        'average_losing_pnl': round(avg_loss_pnl, 2),
+        'average_initial_rr': round(avg_rr, 1),
+        'symbol_performance': symbol_stats,
+        'strategy_performance': strategy_stats,
+        'session_performance': session_stats,
+        'daily_performance': {
+            'weekdays': weekday_stats,
+            'calendar': calendar
+        },
+        'monthly_performance': monthly_stats
+    }
+
+
+class PortfolioAccumulator:
+    """
+    Zusammenführbare Teilergebnisse für die journalübergreifende Auswertung.
+    Jedes Journal wird separat akkumuliert, die Teilergebnisse werden per merge() vereinigt.
+    """
+
+    def __init__(self):
+        self.total = RollupCell()
+        self.journals = {}  # journal_id -> RollupCell
+        self.symbols = {}   # Symbol -> {journal_id: RollupCell}
+        self.records = []   # nach Datum sortierte EntryRecords für die gemeinsame Equity-Kurve
+
+    @classmethod
+    def from_journal(cls, journal_id, rollups, records):
+        """Teilergebnis eines Journals aus dessen Rollup-Index und Datensätzen."""
+        accumulator = cls()
+        journal_total = accumulator.journals[journal_id] = RollupCell()
+        for _, symbol, _, cell in rollups.cells():
+            journal_total.merge(cell)
+            if symbol:
+                accumulator.symbols.setdefault(symbol, {}).setdefault(journal_id, RollupCell()).merge(cell)
+        accumulator.total.merge(journal_total)
+        accumulator.records = sorted(records, key=lambda r: (r.entry_ts is None, r.entry_ts or 0, r.id))
+        return accumulator
+
+    def merge(self, other):
+        """Vereinigt ein weiteres Teilergebnis (Journale sind disjunkt)."""
+        self.total.merge(other.total)
+        self.journals.update(other.journals)
+        for symbol, per_journal in other.symbols.items():
+            target = self.symbols.setdefault(symbol, {})
+            for journal_id, cell in per_journal.items():
+                target.setdefault(journal_id, RollupCell()).merge(cell)
+        self.records = list(heapq.merge(
+            self.records, other.records, key=lambda r: (r.entry_ts is None, r.entry_ts or 0, r.id)
+        ))
+        return self
+
+    def summary(self, journal_names):
+        """Gesamtwerte, Beitrag je Journal und Symbol-Überschneidungen."""
+        total_pnl = self.total.pnl
+        absolute_pnl = sum(abs(cell.pnl) for cell in self.journals.values())
+
+        journal_stats = [{
+            'journal_id': journal_id,
+            'journal_name': journal_names.get(journal_id, ""),
+            'total_trades': cell.count,
+            'win_rate_percentage': round(cell.win_rate, 2),
+            'total_pnl': round(cell.pnl, 2),
+            'pnl_contribution_percentage': round(cell.pnl / absolute_pnl * 100, 2) if absolute_pnl else 0,
+            'trade_share_percentage': round(cell.count / self.total.count * 100, 2) if self.total.count else 0
+        } for journal_id, cell in self.journals.items()]
+        journal_stats.sort(key=lambda x: x['total_pnl'], reverse=True)
+
+        symbol_overlap = []
+        for symbol, per_journal in self.symbols.items():
+            combined = RollupCell()
+            for cell in per_journal.values():
+                combined.merge(cell)
+            symbol_overlap.append({
+                'symbol': symbol,
+                'journal_count': len(per_journal),
+                'journals': sorted(per_journal),
+                'count': combined.count,
+                'win_rate': combined.win_rate,
+                'total_pnl': round(combined.pnl, 2),
+                'per_journal': [{
+                    'journal_id': journal_id,
+                    'count': cell.count,
+                    'win_rate': cell.win_rate,
+                    'total_pnl': round(cell.pnl, 2)
+                } for journal_id, cell in sorted(per_journal.items())]
+            })
+        # In mehreren Journalen gehandelte Symbole zuerst
+        symbol_overlap.sort(key=lambda x: (x['journal_count'], x['count']), reverse=True)
+
+        return {
+            'total_trades': self.total.count,
+            'win_rate_percentage': round(self.total.win_rate, 2),
+            'results_count': dict(self.total.results),
+            'total_pnl': round(total_pnl, 2),
+            'average_pnl': round(total_pnl / self.total.count, 2) if self.total.count else 0,
+            'journals': journal_stats,
+            'symbol_overlap': symbol_overlap
+        }
@@ -49,6 +49,31 @@ def get_journal_entries(journal_id):
     entries = data_storage.get_entries(journal_id)
     return jsonify(entries)
 
+
+@entry_bp.route("/journals/<int:journal_id>/search", methods=["GET"])
+def search_journal_entries(journal_id):
+    """
+    Full-text search over notes, symbol, strategy and emotion of a journal's entries.
+
+    Query parameters:
+        q: search text (German/English, case- and umlaut-insensitive)
+        page, per_page: pagination of the ranked results (per_page max 100)
+    """
+    journal = data_storage.get_journal(journal_id)
+    if not journal:
+        return jsonify({"error": "Journal not found"}), 404
+
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter q is required"}), 400
+
+    page = request.args.get("page", default=1, type=int)
+    per_page = request.args.get("per_page", default=20, type=int)
+    if page < 1 or not 1 <= per_page <= 100:
+        return jsonify({"error": "page must be at least 1 and per_page between 1 and 100"}), 400
+
+    return jsonify(data_storage.search_entries(journal_id, query, page, per_page))
+
 @entry_bp.route("/entries/<int:entry_id>/links", methods=["POST"])
 def add_entry_link(entry_id):
     """Add a link for a specific journal entry."""
@@ -81,7 +106,11 @@ def create_journal_entry(journal_id):
     if not data:
         return jsonify({"error": "No data provided"}), 400
 
-    entry = data_storage.create_entry(journal_id, data)
+    try:
+        entry = data_storage.create_entry(journal_id, data)
+    except data_storage.EntryValidationError as e:
+        return jsonify({"error": e.message}), 400
+
     return jsonify(entry), 201
 
 
@@ -123,7 +152,11 @@ def update_journal_entry(entry_id):
     if not data:
         return jsonify({"error": "No update data provided"}), 400
 
-    updated_entry = data_storage.update_entry(entry_id, data)
+    try:
+        updated_entry = data_storage.update_entry(entry_id, data)
+    except data_storage.EntryValidationError as e:
+        return jsonify({"error": e.message}), 400
+
     if not updated_entry:
         return jsonify({"error": "Entry not found"}), 404
 
@@ -177,7 +210,12 @@ def upload_entry_image(entry_id):
         category = "Before"  # Standard ist jetzt "Before" statt "General"
 
     if file and allowed_file(file.filename):
-        new_image = data_storage.upload_image(entry_id, file, category)
+        max_size = current_app.config.get("MAX_UPLOAD_SIZE", data_storage.MAX_UPLOAD_SIZE)
+        try:
+            new_image = data_storage.upload_image(entry_id, file, category, max_size=max_size)
+        except data_storage.UploadError as e:
+            return jsonify({"error": e.message}), e.status_code
+
         if new_image:
             return jsonify(new_image), 201
         else:
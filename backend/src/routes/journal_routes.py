@@ -11,8 +11,14 @@ journal_bp = Blueprint("journal_bp", __name__)
 
 @journal_bp.route("/journals", methods=["GET"])
 def get_journals():
-    """Get a list of all journals."""
-    journals = data_storage.get_journals()
+    """
+    Get a list of all journals.
+
+    With ?include=summary every journal carries entry count, last trade date,
+    total PnL and win rate, so the dashboard needs no per-journal statistics call.
+    """
+    include = {value.strip() for value in request.args.get("include", "").split(",")}
+    journals = data_storage.get_journals(include_summary="summary" in include)
     return jsonify(journals)
 
 
@@ -23,7 +29,11 @@ def create_journal():
     if not data or not data.get("name"):
         return jsonify({"error": "Journal name is required"}), 400
 
-    new_journal = data_storage.create_journal(data)
+    try:
+        new_journal = data_storage.create_journal(data)
+    except data_storage.ValidationError as e:
+        return jsonify({"error": e.message}), 400
+
     return jsonify(new_journal), 201
 
 
@@ -44,7 +54,11 @@ def update_journal(journal_id):
     if not data:
         return jsonify({"error": "No update data provided"}), 400
 
-    updated_journal = data_storage.update_journal(journal_id, data)
+    try:
+        updated_journal = data_storage.update_journal(journal_id, data)
+    except data_storage.ValidationError as e:
+        return jsonify({"error": e.message}), 400
+
     if not updated_journal:
         return jsonify({"error": "Journal not found"}), 404
 
@@ -1,22 +1,231 @@
 # -*- coding: utf-8 -*-
 """API routes for calculating and retrieving journal statistics."""
 
-from flask import Blueprint, jsonify
+import math
+import datetime
+from flask import Blueprint, jsonify, request
 from src import data_storage
 
 stats_bp = Blueprint("stats_bp", __name__)
 
 
+def is_iso_date(value):
+    """Check whether a query value is a plain YYYY-MM-DD date."""
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return len(value) == 10
+
+
 @stats_bp.route("/journals/<int:journal_id>/statistics", methods=["GET"])
 def get_journal_statistics(journal_id):
-    """Calculate and return statistics for a specific journal."""
-    # Überprüfen, ob das Journal existiert
-    journal = data_storage.get_journal(journal_id)
-    if not journal:
+    """
+    Calculate and return statistics for a specific journal.
+
+    Optional query parameters restrict the statistics to a date range and/or filter:
+        from, to: inclusive dates (YYYY-MM-DD) in the journal's bucket timezone
+        symbol, strategy: only entries with this symbol/strategy
+    Filtered statistics are merged from the per-day rollups and omit the
+    checklist and emotion breakdowns.
+    Full statistics are computed from one pinned snapshot, so concurrent writes
+    neither block the computation nor mix states. They are served from a
+    stale-while-revalidate cache; X-Statistics-Stale: 1 marks a result that
+    predates recent writes (bounded by STATS_MAX_STALENESS_SECONDS).
+    """
+    # Snapshot festhalten (existiert nicht, wenn das Journal fehlt)
+    snapshot = data_storage.journal_snapshot(journal_id)
+    if snapshot is None:
         return jsonify({"error": "Journal not found"}), 404
 
-    stats = data_storage.get_journal_statistics(journal_id)
+    date_from = request.args.get("from") or None
+    date_to = request.args.get("to") or None
+    symbol = request.args.get("symbol") or None
+    strategy = request.args.get("strategy") or None
+
+    for name, value in (("from", date_from), ("to", date_to)):
+        if value is not None and not is_iso_date(value):
+            return jsonify({"error": f"{name} must be a date in the format YYYY-MM-DD"}), 400
+
+    stale = False
+    if date_from or date_to or symbol or strategy:
+        stats = data_storage.get_range_statistics(journal_id, date_from, date_to, symbol, strategy)
+    else:
+        stats, stale = data_storage.get_cached_statistics(journal_id, snapshot)
     if not stats:
         return jsonify({"message": "No entries found for this journal to calculate statistics."}), 404
 
-    return jsonify(stats)
\ No newline at end of file
+    response = jsonify(stats)
+    # Zuletzt berechneter Stand, Neuberechnung läuft im Hintergrund
+    response.headers["X-Statistics-Stale"] = "1" if stale else "0"
+    return response
+
+@stats_bp.route("/journals/<int:journal_id>/equity", methods=["GET"])
+def get_journal_equity(journal_id):
+    """
+    Return the equity curve with running peak, drawdown figures and win/loss streaks.
+
+    Query parameters:
+        points: maximum number of curve points (LTTB downsampling, 0 = full curve)
+        initial_equity: starting balance added to the cumulative PnL
+    """
+    journal = data_storage.get_journal(journal_id)
+    if not journal:
+        return jsonify({"error": "Journal not found"}), 404
+
+    points = request.args.get("points", default=data_storage.DEFAULT_CURVE_POINTS, type=int)
+    initial_equity = request.args.get("initial_equity", default=0.0, type=float)
+    if points < 0:
+        return jsonify({"error": "points must not be negative"}), 400
+
+    equity = data_storage.get_equity_curve(journal_id, initial_equity, points)
+    if not equity:
+        return jsonify({"message": "No entries found for this journal to calculate an equity curve."}), 404
+
+    return jsonify(equity)
+
+
+@stats_bp.route("/journals/<int:journal_id>/rolling", methods=["GET"])
+def get_journal_rolling(journal_id):
+    """
+    Return rolling win rate, expectancy, average R/R and PnL over a sliding window.
+
+    Query parameters:
+        window: window size (default 20)
+        unit: 'trades' (last N trades) or 'days' (last N days)
+        points: maximum number of series points (LTTB downsampling, 0 = full series)
+    """
+    journal = data_storage.get_journal(journal_id)
+    if not journal:
+        return jsonify({"error": "Journal not found"}), 404
+
+    window = request.args.get("window", default=20, type=int)
+    unit = request.args.get("unit", default="trades")
+    points = request.args.get("points", default=data_storage.DEFAULT_CURVE_POINTS, type=int)
+    if window < 1:
+        return jsonify({"error": "window must be at least 1"}), 400
+    if unit not in data_storage.ROLLING_UNITS:
+        return jsonify({"error": f"unit must be one of {', '.join(data_storage.ROLLING_UNITS)}"}), 400
+    if points < 0:
+        return jsonify({"error": "points must not be negative"}), 400
+
+    rolling = data_storage.get_rolling_performance(journal_id, window, unit, points)
+    if not rolling:
+        return jsonify({"message": "No entries found for this journal to calculate rolling statistics."}), 404
+
+    return jsonify(rolling)
+
+
+@stats_bp.route("/journals/<int:journal_id>/simulation", methods=["GET"])
+def get_journal_simulation(journal_id):
+    """
+    Bootstrap the journal's results into synthetic equity paths (Monte Carlo).
+
+    Query parameters:
+        mode: 'pnl' (resample realized PnL) or 'r' (resample R-multiples x risk_percentage)
+        paths: number of simulated paths (default 10000)
+        trades: trades per path (default: number of samples)
+        initial_equity: starting balance (default 10000)
+        ruin: drawdown from the starting balance in percent that counts as ruin (default 50)
+        risk_percentage: risk per trade for entries without one in 'r' mode (default 1)
+        seed: RNG seed, equal parameters give identical results
+    """
+    journal = data_storage.get_journal(journal_id)
+    if not journal:
+        return jsonify({"error": "Journal not found"}), 404
+
+    mode = request.args.get("mode", default="pnl")
+    paths = request.args.get("paths", default=10000, type=int)
+    trades = request.args.get("trades", default=None, type=int)
+    initial_equity = request.args.get("initial_equity", default=10000.0, type=float)
+    ruin = request.args.get("ruin", default=50.0, type=float)
+    risk = request.args.get("risk_percentage", default=1.0, type=float)
+    seed = request.args.get("seed", default=0, type=int)
+
+    if mode not in data_storage.SIMULATION_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(data_storage.SIMULATION_MODES)}"}), 400
+    if not 1 <= paths <= data_storage.MAX_PATHS:
+        return jsonify({"error": f"paths must be between 1 and {data_storage.MAX_PATHS}"}), 400
+    if trades is not None and not 1 <= trades <= data_storage.MAX_TRADES_PER_PATH:
+        return jsonify({"error": f"trades must be between 1 and {data_storage.MAX_TRADES_PER_PATH}"}), 400
+    if not all(math.isfinite(value) for value in (initial_equity, ruin, risk)):
+        return jsonify({"error": "initial_equity, ruin and risk_percentage must be finite numbers"}), 400
+    if initial_equity <= 0 or not 0 < ruin <= 100 or risk <= 0 or seed < 0:
+        return jsonify({"error": "initial_equity and risk_percentage must be positive, seed non-negative "
+                                 "and ruin between 0 and 100"}), 400
+
+    try:
+        simulation = data_storage.get_monte_carlo_simulation(
+            journal_id, mode, paths, trades, initial_equity, ruin, seed, risk
+        )
+    except data_storage.ValidationError as e:
+        return jsonify({"error": e.message}), 400
+    if not simulation:
+        return jsonify({"message": "No entries with usable results found for this journal."}), 404
+
+    return jsonify(simulation)
+
+
+@stats_bp.route("/journals/<int:journal_id>/checklist-combinations", methods=["GET"])
+def get_journal_checklist_combinations(journal_id):
+    """
+    Return combinations of checked checklist items ranked by win rate.
+
+    Query parameters:
+        min_support: minimum share of entries with a result that must contain the combination (default 0.05)
+        max_size: largest combination size to examine (default 4)
+        top: number of combinations to return (default 20)
+    """
+    journal = data_storage.get_journal(journal_id)
+    if not journal:
+        return jsonify({"error": "Journal not found"}), 404
+
+    min_support = request.args.get("min_support", default=0.05, type=float)
+    max_size = request.args.get("max_size", default=4, type=int)
+    top = request.args.get("top", default=20, type=int)
+    if not 0 < min_support <= 1:
+        return jsonify({"error": "min_support must be between 0 and 1"}), 400
+    if not 2 <= max_size <= data_storage.MAX_COMBINATION_SIZE:
+        return jsonify({"error": f"max_size must be between 2 and {data_storage.MAX_COMBINATION_SIZE}"}), 400
+    if top < 1:
+        return jsonify({"error": "top must be at least 1"}), 400
+
+    combinations = data_storage.get_checklist_combinations(journal_id, min_support, max_size, top)
+    if not combinations:
+        return jsonify({"message": "No entries found for this journal to analyse checklist combinations."}), 404
+
+    return jsonify(combinations)
+
+
+@stats_bp.route("/statistics/portfolio", methods=["GET"])
+def get_portfolio_statistics():
+    """
+    Aggregate performance across several journals.
+
+    Query parameters:
+        journals: comma-separated journal ids or 'all' (default)
+        initial_equity: starting balance of the combined equity curve
+        points: maximum number of equity curve points (LTTB downsampling, 0 = full curve)
+    """
+    raw_ids = request.args.get("journals", default="all").strip()
+    journal_ids = None
+    if raw_ids and raw_ids != "all":
+        try:
+            journal_ids = sorted({int(value) for value in raw_ids.split(",") if value.strip()})
+        except ValueError:
+            return jsonify({"error": "journals must be a comma-separated list of journal ids or 'all'"}), 400
+
+        missing = [journal_id for journal_id in journal_ids if not data_storage.get_journal(journal_id)]
+        if missing:
+            return jsonify({"error": "Journal not found", "journal_ids": missing}), 404
+
+    points = request.args.get("points", default=data_storage.DEFAULT_CURVE_POINTS, type=int)
+    initial_equity = request.args.get("initial_equity", default=0.0, type=float)
+    if points < 0:
+        return jsonify({"error": "points must not be negative"}), 400
+
+    portfolio = data_storage.get_portfolio_statistics(journal_ids, initial_equity, points)
+    if not portfolio:
+        return jsonify({"message": "No entries found in the selected journals."}), 404
+
+    return jsonify(portfolio)
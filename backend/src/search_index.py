@@ -0,0 +1,179 @@
+# src/search_index.py - Invertierter Index für die Volltextsuche in Journal-Einträgen
+
+import math
+import re
+import unicodedata
+
+# Durchsuchte Felder und ihre Gewichtung (ein Treffer im Symbol zählt mehr als in den Notizen)
+FIELD_WEIGHTS = {'symbol': 3, 'strategy': 2, 'emotion': 2, 'notes': 1}
+
+# BM25-Parameter
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have i in is it its of on or so that the this to was
+    were will with my me we our not no
+    aber als am an auch auf aus bei bin bis da das dass dem den der des die ein eine einem einen
+    einer eines er es fur hab habe hat ich im in ist ja mit nach nicht noch nur oder sehr sich sie
+    so und uns vom von vor war was weil wie wir zu zum zur uber
+""".split())
+
+# Einfache Suffix-Regeln (längste zuerst) für deutsche und englische Wortformen
+SUFFIXES = ('ungen', 'ingen', 'heiten', 'keiten', 'ung', 'heit', 'keit', 'lich', 'isch',
+            'ing', 'ern', 'em', 'en', 'er', 'es', 'ed', 'ly', 'e', 's', 'n')
+MIN_STEM_LENGTH = 3
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text):
+    """Kleinschreibung und Entfernen von Akzenten/Umlauten (ä -> a, ß -> ss)."""
+    text = text.lower().replace('ß', 'ss')
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def fold_with_offsets(text):
+    """
+    Wie fold(), aber zeichenweise: liefert zusätzlich zu jedem gefalteten Zeichen die Position
+    im Originaltext (fold() ändert die Länge, z. B. ß -> ss oder entfernte Akzente).
+    """
+    folded, offsets = [], []
+    for i, c in enumerate(text):
+        part = fold(c)
+        folded.append(part)
+        offsets.extend([i] * len(part))
+    return ''.join(folded), offsets
+
+
+def stem(token):
+    """Kürzt ein Wort um das längste passende Suffix, solange der Stamm lang genug bleibt."""
+    if token.isdigit():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """Zerlegt Text in normalisierte, gestemmte Suchbegriffe (ohne Stoppwörter)."""
+    if not text:
+        return []
+    tokens = []
+    for word in TOKEN_PATTERN.findall(fold(str(text))):
+        word = word.strip('_')
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        tokens.append(stem(word))
+    return tokens
+
+
+def entry_terms(entry):
+    """Gewichtete Termhäufigkeiten eines Eintrags über alle durchsuchten Felder."""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(entry.get(field)):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+class SearchIndex:
+    """
+    Invertierter Index eines Journals: Begriff -> {entry_id: gewichtete Häufigkeit}.
+    Einträge werden beim Schreiben einzeln hinzugefügt bzw. entfernt; die Suche liest
+    nur die Postings der Suchbegriffe und bewertet die Treffer mit BM25.
+    """
+
+    def __init__(self, signature=None):
+        self.signature = signature
+        self.postings = {}
+        self.lengths = {}  # entry_id -> Summe der gewichteten Häufigkeiten
+        self.total_length = 0
+
+    @classmethod
+    def build(cls, entries, signature=None):
+        index = cls(signature)
+        for entry in entries:
+            index.add(entry)
+        return index
+
+    def add(self, entry):
+        terms = entry_terms(entry)
+        if not terms:
+            return
+        entry_id = entry['id']
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[entry_id] = frequency
+        length = sum(terms.values())
+        self.lengths[entry_id] = length
+        self.total_length += length
+
+    def remove(self, entry):
+        """Entfernt einen Eintrag anhand seiner (alten) Feldwerte."""
+        entry_id = entry['id']
+        if entry_id not in self.lengths:
+            return
+        for term in entry_terms(entry):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(entry_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(entry_id)
+
+    def search(self, query):
+        """Gibt [(entry_id, score), ...] absteigend nach Relevanz zurück."""
+        terms = set(tokenize(query))
+        document_count = len(self.lengths)
+        if not terms or not document_count:
+            return []
+
+        average_length = self.total_length / document_count
+        scores = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for entry_id, frequency in posting.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[entry_id] / average_length)
+                scores[entry_id] = scores.get(entry_id, 0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+    def to_dict(self):
+        return {
+            'signature': list(self.signature) if self.signature else None,
+            'postings': {term: {str(k): v for k, v in posting.items()} for term, posting in self.postings.items()},
+            'lengths': {str(k): v for k, v in self.lengths.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls(tuple(data['signature']) if data.get('signature') else None)
+        index.postings = {term: {int(k): v for k, v in posting.items()} for term, posting in data['postings'].items()}
+        index.lengths = {int(k): v for k, v in data['lengths'].items()}
+        index.total_length = sum(index.lengths.values())
+        return index
+
+
+def make_snippet(text, query, width=160):
+    """Ausschnitt der Notizen um den ersten Treffer eines Suchbegriffs."""
+    if not text:
+        return ""
+    text = str(text)
+    folded, offsets = fold_with_offsets(text)
+    position = -1
+    for word in TOKEN_PATTERN.findall(fold(query)):
+        for candidate in (word, stem(word)):
+            position = folded.find(candidate)
+            if position >= 0:
+                break
+        if position >= 0:
+            position = offsets[position]
+            break
+
+    start = max(0, position - width // 3) if position >= 0 else 0
+    snippet = text[start:start + width].strip()
+    return ("…" if start > 0 else "") + snippet + ("…" if start + width < len(text) else "")
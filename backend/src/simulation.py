@@ -0,0 +1,164 @@
+# src/simulation.py - Monte-Carlo-Simulation von Equity-Pfaden (Bootstrap der Journal-Ergebnisse)
+
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np  # requirements.txt; ohne numpy läuft die langsame Python-Schleife
+except ImportError:
+    np = None
+
+SIMULATION_MODES = ('pnl', 'r')
+# Ohne numpy wird die Pfadzahl begrenzt, damit eine Anfrage nicht minutenlang rechnet
+MAX_PATHS = 200000 if np is not None else 20000
+MAX_TRADES_PER_PATH = 5000
+# Obergrenze für Pfade x Trades je Anfrage (die Simulation läuft im Request)
+MAX_CELLS = 50000000 if np is not None else 2000000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Pfade werden in Blöcke fester Größe aufgeteilt; jeder Block hat einen eigenen Seed,
+# sodass das Ergebnis nicht von der Anzahl der Worker abhängt.
+CELLS_PER_CHUNK = 2000000  # Pfade x Trades pro Block (begrenzt den Speicher je Worker)
+MIN_PARALLEL_CELLS = 5000000  # Kleinere Simulationen laufen in einem Thread
+
+
+def extract_samples(records, mode='pnl', default_risk=1.0):
+    """
+    Liefert die zu ziehenden Stichproben je Trade.
+    mode='pnl': realisierter PnL (additiv auf die Equity).
+    mode='r': Equity-Veränderung als Anteil, R-Multiple x Risiko (risk_percentage, sonst default_risk).
+      Win zählt mit initial_rr, Loss mit -1R, BE und PartialBE mit 0R (kein realisiertes R gespeichert).
+    """
+    samples = []
+    for record in records:
+        if mode == 'pnl':
+            if record.pnl is not None:
+                samples.append(float(record.pnl))
+            continue
+
+        if record.result == "Win" and record.initial_rr is not None:
+            r_multiple = record.initial_rr
+        elif record.result == "Loss":
+            r_multiple = -1.0
+        elif record.result in ("BE", "PartialBE"):
+            r_multiple = 0.0
+        else:
+            continue
+        risk = record.risk_percentage if record.risk_percentage is not None else default_risk
+        samples.append(r_multiple * risk / 100)
+    return samples
+
+
+def chunk_sizes(paths, trades):
+    """Teilt die Pfade in Blöcke von höchstens CELLS_PER_CHUNK Zellen."""
+    per_chunk = max(1, CELLS_PER_CHUNK // trades)
+    sizes = [per_chunk] * (paths // per_chunk)
+    if paths % per_chunk:
+        sizes.append(paths % per_chunk)
+    return sizes
+
+
+def _simulate_chunk_numpy(samples, paths, trades, mode, initial_equity, ruin_level, seed):
+    rng = np.random.default_rng(seed)
+    steps = np.asarray(samples, dtype=np.float64)[rng.integers(0, len(samples), size=(paths, trades))]
+
+    if mode == 'pnl':
+        equity = initial_equity + np.cumsum(steps, axis=1)
+    else:
+        equity = initial_equity * np.cumprod(1 + steps, axis=1)
+
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+
+    return (equity[:, -1].tolist(), drawdown.max(axis=1).tolist(),
+            int(np.count_nonzero(equity.min(axis=1) <= ruin_level)))
+
+
+def _simulate_chunk_python(samples, paths, trades, mode, initial_equity, ruin_level, seed):
+    rng = random.Random(seed)
+    finals, drawdowns, ruined = [], [], 0
+
+    for _ in range(paths):
+        equity = peak = initial_equity
+        max_drawdown = 0.0
+        hit_ruin = False
+        for step in rng.choices(samples, k=trades):
+            equity = equity + step if mode == 'pnl' else equity * (1 + step)
+            if equity > peak:
+                peak = equity
+            elif peak > 0:
+                max_drawdown = max(max_drawdown, (peak - equity) / peak * 100)
+            if equity <= ruin_level:
+                hit_ruin = True
+        finals.append(equity)
+        drawdowns.append(max_drawdown)
+        ruined += hit_ruin
+
+    return finals, drawdowns, ruined
+
+
+def simulate_chunk(samples, paths, trades, mode, initial_equity, ruin_level, seed):
+    """Simuliert einen Block von Pfaden."""
+    if np is not None:
+        return _simulate_chunk_numpy(samples, paths, trades, mode, initial_equity, ruin_level, seed)
+    return _simulate_chunk_python(samples, paths, trades, mode, initial_equity, ruin_level, seed)
+
+
+def percentiles(values):
+    """Perzentile (nächster Rang) einer Werteliste."""
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{p}": round(ordered[round(p / 100 * last)], 2) for p in PERCENTILES}
+
+
+def run_simulation(samples, paths=10000, trades=None, mode='pnl', initial_equity=10000.0,
+                   ruin_percentage=50.0, seed=0, workers=None):
+    """
+    Zieht paths Equity-Pfade mit je trades Trades (mit Zurücklegen) aus den Stichproben.
+    Ruin bedeutet, dass die Equity irgendwann auf initial_equity * (1 - ruin_percentage/100) fällt.
+    Große Simulationen werden blockweise auf Threads verteilt; numpy gibt in seinen Kernen den
+    GIL frei. Ein Prozesspool würde aus dem mehrfädigen Server heraus forken (bzw. mit spawn die
+    ganze App je Worker neu importieren). Jeder Block erhält einen aus (seed, Blocknummer)
+    abgeleiteten Seed und ist damit reproduzierbar.
+    """
+    trades = trades or min(len(samples), MAX_TRADES_PER_PATH)
+    ruin_level = initial_equity * (1 - ruin_percentage / 100)
+
+    sizes = chunk_sizes(paths, trades)
+    if np is not None:
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    else:
+        seeds = [seed * 1000003 + index for index in range(len(sizes))]
+    jobs = [(samples, size, trades, mode, initial_equity, ruin_level, chunk_seed)
+            for size, chunk_seed in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if np is not None and workers > 1 and len(jobs) > 1 and paths * trades >= MIN_PARALLEL_CELLS:
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs)), thread_name_prefix='simulation') as pool:
+            results = list(pool.map(simulate_chunk, *zip(*jobs)))
+    else:
+        # Die reine Python-Schleife hält den GIL, Threads brächten hier nichts
+        results = [simulate_chunk(*job) for job in jobs]
+
+    finals, drawdowns, ruined = [], [], 0
+    for chunk_finals, chunk_drawdowns, chunk_ruined in results:
+        finals.extend(chunk_finals)
+        drawdowns.extend(chunk_drawdowns)
+        ruined += chunk_ruined
+
+    return {
+        'mode': mode,
+        'paths': paths,
+        'trades_per_path': trades,
+        'sample_size': len(samples),
+        'initial_equity': initial_equity,
+        'seed': seed,
+        'engine': 'numpy' if np is not None else 'python',
+        'final_equity': dict(percentiles(finals), mean=round(sum(finals) / len(finals), 2)),
+        'max_drawdown_percentage': dict(percentiles(drawdowns), mean=round(sum(drawdowns) / len(drawdowns), 2)),
+        'probability_of_profit': round(sum(1 for f in finals if f > initial_equity) / paths * 100, 2),
+        'risk_of_ruin': round(ruined / paths * 100, 2),
+        'ruin_percentage': ruin_percentage
+    }
@@ -0,0 +1,89 @@
+# src/upload_serving.py - Ausliefern hochgeladener Bilder mit Caching, Range und Proxy-Offload
+
+import os
+import hashlib
+import mimetypes
+from urllib.parse import quote
+from flask import current_app, jsonify, request, send_file, make_response
+from werkzeug.security import safe_join
+
+# Standardwerte, überschreibbar über app.config
+DEFAULT_CACHE_MAX_AGE = 365 * 24 * 3600  # Hochgeladene Dateien ändern sich nie (UUID-Namen)
+
+
+def file_sha256(path, chunk_size=64 * 1024):
+    """SHA-256 des Dateiinhalts (blockweise gelesen)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def guess_mimetype(filename):
+    """Bestimmt den MIME-Typ für Offload-Antworten anhand der Dateiendung."""
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+def apply_cache_headers(response, etag, max_age, immutable):
+    """Setzt ETag und langlebige Cache-Header auf die Antwort."""
+    response.set_etag(etag)
+    if max_age:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = immutable
+    return response
+
+
+def serve_upload_file(upload_dir, filename, content_hash=None):
+    """
+    Liefert eine hochgeladene Datei aus. Das ETag ist der SHA-256 des Inhalts; content_hash
+    (Dateiname -> Hash, z. B. aus den gespeicherten Bild-Metadaten) erspart das Einlesen.
+    Konfiguration über app.config:
+      UPLOADS_CACHE_MAX_AGE  - max-age in Sekunden (0 deaktiviert das Caching)
+      UPLOADS_IMMUTABLE      - setzt Cache-Control: immutable
+      UPLOADS_OFFLOAD        - None, 'x-sendfile' oder 'x-accel-redirect'
+      UPLOADS_ACCEL_PREFIX   - interner Pfad des Front-Proxys für X-Accel-Redirect
+    Byte-Ranges und bedingte Anfragen (If-None-Match) werden unterstützt.
+    """
+    # Überprüfen, ob der Dateiname "None" ist oder nicht existiert
+    if filename == "None" or not filename:
+        return jsonify({"error": "Ungültiger Dateipfad"}), 400
+
+    # Sicherheitsprüfung: safe_join verhindert Pfade außerhalb des Upload-Verzeichnisses
+    safe_path = safe_join(os.path.abspath(upload_dir), filename)
+    if safe_path is None:
+        return jsonify({"error": "Ungültiger Dateipfad"}), 400
+
+    config = current_app.config
+    max_age = config.get('UPLOADS_CACHE_MAX_AGE', DEFAULT_CACHE_MAX_AGE)
+    immutable = config.get('UPLOADS_IMMUTABLE', True)
+    offload = config.get('UPLOADS_OFFLOAD')
+
+    # Gelöschte Dateien ergeben 404, auch bei bedingten Anfragen
+    if not os.path.isfile(safe_path):
+        return jsonify({"error": "Datei nicht gefunden"}), 404
+
+    etag = (content_hash(filename) if content_hash else None) or file_sha256(safe_path)
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+        return apply_cache_headers(response, etag, max_age, immutable)
+
+    if offload == 'x-accel-redirect':
+        # nginx liefert die Datei aus dem internen Pfad aus (inkl. Range)
+        prefix = config.get('UPLOADS_ACCEL_PREFIX', '/protected-uploads/')
+        response = make_response('', 200)
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(filename)
+        response.headers['Content-Type'] = guess_mimetype(filename)
+        return apply_cache_headers(response, etag, max_age, immutable)
+
+    if offload == 'x-sendfile':
+        # Apache/lighttpd übernehmen die Auslieferung anhand des absoluten Pfads
+        response = make_response('', 200)
+        response.headers['X-Sendfile'] = safe_path
+        response.headers['Content-Type'] = guess_mimetype(filename)
+        return apply_cache_headers(response, etag, max_age, immutable)
+
+    # send_file beantwortet Range- und If-Range-Anfragen (conditional=True)
+    response = send_file(safe_path, conditional=True, etag=etag, max_age=max_age or None)
+    return apply_cache_headers(response, etag, max_age, immutable)
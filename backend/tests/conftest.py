@@ -0,0 +1,62 @@
+# tests/conftest.py - Gemeinsame Fixtures; data_storage arbeitet in einem temporären Datenverzeichnis
+#
+# Ausführen aus backend/:  python -m pytest -q
+
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = tempfile.mkdtemp(prefix='tj-tests-')
+
+# Vor dem ersten Import von data_storage setzen: der Import initialisiert die Datendateien
+os.environ['TRADING_JOURNAL_DATA_DIR'] = DATA_DIR
+os.environ['TRADING_JOURNAL_LOG_FILE'] = os.path.join(DATA_DIR, 'tests.log')
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def ds():
+    from src import data_storage
+    return data_storage
+
+
+@pytest.fixture(scope='session')
+def client():
+    from src.main import app
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+@pytest.fixture
+def journal_id(ds):
+    """Leeres Journal mit drei Checklistenvorlagen; wird nach dem Test gelöscht."""
+    journal = ds.create_journal({'name': 'Test'})
+    for text in ('Trend', 'Level', 'News'):
+        ds.add_checklist_template(journal['id'], {'text': text})
+    yield journal['id']
+    ds.delete_journal(journal['id'])
+
+
+@pytest.fixture
+def write_back(ds):
+    """Aktiviert den Write-Back-Puffer für einen Test und stellt danach den Standard wieder her."""
+    ds.configure_durability('standard', write_back_ms=60000)
+    yield ds
+    ds.flush_pending_writes()
+    ds.configure_durability('standard', write_back_ms=0)
+
+
+def make_entry(ds, journal_id, **fields):
+    data = {'symbol': 'EURUSD', 'entry_date': '2024-03-01T10:00', 'position_type': 'Long',
+            'strategy': 'Breakout', 'pnl': 100, 'result': 'Win', 'notes': 'Sauberer Ausbruch'}
+    data.update(fields)
+    return ds.create_entry(journal_id, data)
@@ -0,0 +1,38 @@
+# tests/test_entry_records.py - Normalisierung der Eintragsfelder beim Schreiben
+
+import pytest
+
+from src.entry_records import EntryValidationError
+from tests.conftest import make_entry
+
+
+def test_partial_update_normalizes_only_given_fields(ds, journal_id):
+    entry = make_entry(ds, journal_id, pnl='12.5', notes='Unverändert')
+
+    updated = ds.update_entry(entry['id'], {'pnl': '-7,25', 'entry_date': '2024-03-02T16:45'})
+
+    assert updated['pnl'] == -7.25
+    assert updated['notes'] == 'Unverändert'
+    assert updated['result'] == 'Win'
+    assert updated['entry_date_utc'] == '2024-03-02T16:45:00Z'
+    assert updated['bucket_date'] == '2024-03-02'
+    assert updated['bucket_hour'] == 16
+
+
+def test_partial_update_rejects_invalid_values(ds, journal_id):
+    entry = make_entry(ds, journal_id)
+
+    with pytest.raises(EntryValidationError):
+        ds.update_entry(entry['id'], {'result': 'Jackpot'})
+
+    assert ds.get_entry(entry['id'])['result'] == 'Win'
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf'), 'nan', '-Infinity'])
+def test_non_finite_numbers_are_rejected(ds, journal_id, value):
+    entry = make_entry(ds, journal_id)
+
+    with pytest.raises(EntryValidationError):
+        ds.update_entry(entry['id'], {'pnl': value})
+
+    assert ds.get_entry(entry['id'])['pnl'] == 100
@@ -0,0 +1,67 @@
+# tests/test_migration.py - Journal-Verzeichnisse: Migration der globalen Dateien und ID-Vergabe
+
+import os
+
+from tests.conftest import make_entry
+
+
+def write_legacy_file(ds, path, rows):
+    assert ds.safe_save_data(path, rows)
+
+
+def remove_legacy_files(ds):
+    for path in (ds.ENTRIES_FILE, ds.STATUSES_FILE, ds.IMAGES_FILE):
+        for leftover in (path, f"{path}.migrated"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def test_migration_moves_legacy_rows_into_journal_shards(ds, journal_id):
+    entries = [
+        {'id': 9001, 'journal_id': journal_id, 'symbol': 'DAX', 'entry_date': '2023-05-02T09:30',
+         'pnl': 50, 'result': 'Win'},
+        {'id': 9002, 'journal_id': journal_id, 'symbol': 'US30', 'entry_date': '2023-05-03T15:00',
+         'pnl': -20, 'result': 'Loss'},
+    ]
+    images = [{'id': 9001, 'entry_id': 9002, 'file_path': None, 'link_url': 'https://example.com/a',
+               'category': 'Before', 'uploaded_at': '2023-05-03T15:00'}]
+    orphan = {'id': 9003, 'entry_id': 12345, 'file_path': None, 'link_url': 'https://example.com/b',
+              'category': 'After', 'uploaded_at': '2023-05-03T15:00'}
+    write_legacy_file(ds, ds.ENTRIES_FILE, entries)
+    write_legacy_file(ds, ds.IMAGES_FILE, images + [orphan])
+
+    try:
+        assert ds.migrate_to_journal_shards()
+        # Ein zweiter Lauf übernimmt nichts doppelt (die alten Dateien sind umbenannt)
+        assert not ds.migrate_to_journal_shards()
+
+        assert ds.load_journal_data(journal_id, 'entries') == entries
+        assert ds.load_journal_data(journal_id, 'images') == images  # verwaiste Zeile entfällt
+        for path in (ds.ENTRIES_FILE, ds.IMAGES_FILE):
+            assert not os.path.exists(path)
+            assert os.path.exists(f"{path}.migrated")
+
+        ds.rebuild_indexes()
+        assert ds.get_entry_journal_id(9002) == journal_id
+        assert ds.get_entry(9001)['symbol'] == 'DAX'
+        assert ds.next_free_ids()[0] > 9002
+    finally:
+        remove_legacy_files(ds)
+
+
+def test_failed_save_leaves_no_phantom_id(ds, journal_id, monkeypatch):
+    entry = make_entry(ds, journal_id)
+    next_entry_id, next_image_id = ds.next_free_ids()
+
+    monkeypatch.setattr(ds, 'save_data', lambda *args, **kwargs: False)
+    assert make_entry(ds, journal_id) is None
+    assert ds.upload_image(entry['id'], link_url='https://example.com/c') is None
+    monkeypatch.undo()
+
+    # Die reservierten IDs bleiben eine Lücke und landen nicht im Index
+    assert ds.get_entry_journal_id(next_entry_id) is None
+    assert ds.get_entry(next_entry_id) is None
+    created = make_entry(ds, journal_id)
+    assert created['id'] == next_entry_id + 1
+    image = ds.upload_image(created['id'], link_url='https://example.com/d')
+    assert image['id'] == next_image_id + 1
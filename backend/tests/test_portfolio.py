@@ -0,0 +1,27 @@
+# tests/test_portfolio.py - Journalübergreifende Statistiken
+
+from tests.conftest import make_entry
+
+
+def test_portfolio_combines_journals(ds, journal_id):
+    other = ds.create_journal({'name': 'Zweites'})['id']
+    try:
+        make_entry(ds, journal_id, symbol='DAX', pnl=100, result='Win', entry_date='2024-01-02T09:00')
+        make_entry(ds, journal_id, symbol='EURUSD', pnl=-40, result='Loss', entry_date='2024-01-04T09:00')
+        make_entry(ds, other, symbol='DAX', pnl=60, result='Win', entry_date='2024-01-03T09:00')
+
+        portfolio = ds.get_portfolio_statistics([journal_id, other], initial_equity=1000)
+
+        assert portfolio['journal_ids'] == [journal_id, other]
+        assert portfolio['total_trades'] == 3
+        assert portfolio['results_count']['Win'] == 2
+        assert [j['total_pnl'] for j in portfolio['journals']] == [60, 60]
+        assert portfolio['total_pnl'] == 120
+        # Gemeinsame Equity-Kurve nach Datum über beide Journale
+        assert [point['pnl'] for point in portfolio['equity']['curve']] == [100, 60, -40]
+        assert portfolio['equity']['final_equity'] == 1120
+        # In beiden Journalen gehandelte Symbole zuerst
+        overlap = [(s['symbol'], s['journal_count']) for s in portfolio['symbol_overlap']]
+        assert overlap == [('DAX', 2), ('EURUSD', 1)]
+    finally:
+        ds.delete_journal(other)
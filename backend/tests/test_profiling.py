@@ -0,0 +1,7 @@
+# tests/test_profiling.py - Ablage der Profile unterhalb des Datenverzeichnisses
+
+import os
+
+
+def test_profiles_are_stored_below_data_dir(ds, client):
+    assert client.application.config['PROFILING_DIR'] == os.path.join(ds.DATA_DIR, 'profiles')
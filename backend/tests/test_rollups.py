@@ -0,0 +1,41 @@
+# tests/test_rollups.py - Tages-Rollups: inkrementelle Pflege gegenüber Neuaufbau
+
+from src.rollups import JournalRollups, rollup_statistics
+from tests.conftest import make_entry
+
+
+def full_rollups(ds, journal_id):
+    records = [ds.EntryRecord.from_dict(e) for e in ds.load_journal_data(journal_id, 'entries')]
+    return JournalRollups.build(records)
+
+
+def test_incremental_rollups_match_full_rebuild(ds, journal_id):
+    ds.get_rollups(journal_id)  # Index anlegen, damit die folgenden Änderungen inkrementell laufen
+
+    first = make_entry(ds, journal_id, pnl=150, result='Win', entry_date='2024-01-02T09:00')
+    second = make_entry(ds, journal_id, symbol='DAX', pnl=-50, result='Loss', entry_date='2024-01-02T14:00')
+    third = make_entry(ds, journal_id, strategy='Range', pnl=0, result='BE', entry_date='2024-01-05T11:00')
+    ds.update_entry(first['id'], {'pnl': 80.5, 'entry_date': '2024-01-03T09:00'})
+    ds.update_entry(third['id'], {'result': 'PartialBE', 'pnl': 20})
+    ds.delete_entry(second['id'])
+
+    incremental = ds.get_rollups(journal_id)
+    full = full_rollups(ds, journal_id)
+
+    assert incremental.signature == ds.entries_signature(journal_id)
+    assert incremental.summary() == full.summary()
+    assert rollup_statistics(incremental.cells()) == rollup_statistics(full.cells())
+    assert incremental.summary()['entry_count'] == 2
+
+
+def test_rollups_rebuild_after_external_change(ds, journal_id):
+    make_entry(ds, journal_id, pnl=10)
+    before = ds.get_rollups(journal_id)
+
+    entries = ds.load_journal_data(journal_id, 'entries')
+    entries[0]['pnl'] = 999
+    ds.save_journal_data(journal_id, 'entries', entries)  # ohne entries_changed (z. B. Werkzeuge)
+
+    after = ds.get_rollups(journal_id)
+    assert after is not before
+    assert after.summary()['total_pnl'] == 999
@@ -0,0 +1,54 @@
+# tests/test_search_index.py - Volltextindex: Pflege bei Änderungen, Speichern und Laden
+
+import os
+
+from src.search_index import SearchIndex, make_snippet
+from tests.conftest import make_entry
+
+
+def test_search_index_follows_updates_and_deletes(ds, journal_id):
+    breakout = make_entry(ds, journal_id, notes='Sauberer Ausbruch über das Tageshoch')
+    pullback = make_entry(ds, journal_id, notes='Geduldig auf den Rücklauf gewartet')
+    assert ds.search_entries(journal_id, 'Ausbruch')['total'] == 1
+
+    ds.update_entry(pullback['id'], {'notes': 'Zweiter Ausbruch nach dem Rücklauf'})
+    hits = ds.search_entries(journal_id, 'Ausbruch')
+    assert {r['entry_id'] for r in hits['results']} == {breakout['id'], pullback['id']}
+    assert ds.search_entries(journal_id, 'geduldig')['total'] == 0
+
+    ds.delete_entry(breakout['id'])
+    hits = ds.search_entries(journal_id, 'Ausbruch')
+    assert [r['entry_id'] for r in hits['results']] == [pullback['id']]
+
+    # Der inkrementell gepflegte Index entspricht einem Neuaufbau aus der Datei
+    rebuilt = SearchIndex.build(ds.load_journal_data(journal_id, 'entries'), ds.entries_signature(journal_id))
+    assert ds.get_search_index(journal_id).to_dict() == rebuilt.to_dict()
+
+
+def test_search_index_is_persisted_and_reloaded(ds, journal_id):
+    make_entry(ds, journal_id, notes='Trendlinie hielt, Ziel erreicht')
+    ds.get_search_index(journal_id)
+    ds.save_dirty_search_indexes()
+    assert os.path.exists(ds.search_index_file(journal_id))
+
+    ds.reset_caches()
+    loaded = ds.load_search_index(journal_id)
+    assert loaded is not None
+    assert ds.search_entries(journal_id, 'Trendlinie')['total'] == 1
+
+    # Passt die Datei nicht mehr zu entries.json, wird sie verworfen
+    entries = ds.load_journal_data(journal_id, 'entries')
+    entries[0]['notes'] = 'Anderer Text'
+    ds.save_journal_data(journal_id, 'entries', entries)
+    assert ds.load_search_index(journal_id) is None
+
+
+def test_snippet_offsets_refer_to_original_text():
+    # Jedes ß wird beim Falten zu ss; ohne Rückabbildung verschiebt sich der Ausschnitt
+    text = "Straße " * 40 + "Ausbruch über das Hoch"
+
+    snippet = make_snippet(text, 'ausbruch', width=30)
+
+    assert snippet.startswith("…")
+    assert "Ausbruch" in snippet
+    assert snippet == "…" + text[text.index("Ausbruch") - 10:text.index("Ausbruch") + 20].strip() + "…"
@@ -0,0 +1,20 @@
+# tests/test_sessions.py - Prüfung der Session-Definitionen eines Journals
+
+
+def test_duplicate_session_names_are_rejected(ds, client, journal_id):
+    sessions = [{'name': 'London', 'start': 8, 'end': 12}, {'name': ' london ', 'start': 14, 'end': 18}]
+
+    response = client.put(f"/api/journals/{journal_id}", json={'sessions': sessions})
+
+    assert response.status_code == 400
+    assert 'london' in response.get_json()['error']
+    assert ds.get_journal(journal_id).get('sessions') is None
+
+
+def test_distinct_session_names_are_accepted(ds, client, journal_id):
+    sessions = [{'name': 'London', 'start': 8, 'end': 12}, {'name': 'New York', 'start': 14, 'end': 18}]
+
+    response = client.put(f"/api/journals/{journal_id}", json={'sessions': sessions})
+
+    assert response.status_code == 200
+    assert [s['name'] for s in ds.get_journal(journal_id)['sessions']] == ['London', 'New York']
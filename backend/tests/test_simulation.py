@@ -0,0 +1,45 @@
+# tests/test_simulation.py - Monte-Carlo-Simulation: Grenzen und Prüfung der Parameter
+
+import pytest
+
+from src.simulation import run_simulation
+from tests.conftest import make_entry
+
+
+@pytest.fixture
+def simulation_url(ds, journal_id):
+    for pnl, result in ((120, 'Win'), (-60, 'Loss'), (0, 'BE'), (80, 'Win')):
+        make_entry(ds, journal_id, pnl=pnl, result=result)
+    return f"/api/journals/{journal_id}/simulation"
+
+
+def test_simulation_is_reproducible():
+    samples = [120.0, -60.0, 0.0, 80.0]
+    first = run_simulation(samples, paths=2000, trades=50, seed=7)
+    assert run_simulation(samples, paths=2000, trades=50, seed=7, workers=1) == first
+    assert run_simulation(samples, paths=2000, trades=50, seed=8) != first
+
+
+def test_simulation_route_accepts_valid_parameters(client, simulation_url):
+    response = client.get(simulation_url, query_string={'paths': 500, 'trades': 20, 'seed': 1})
+    assert response.status_code == 200
+    assert response.get_json()['paths'] == 500
+
+
+@pytest.mark.parametrize('params', [
+    {'initial_equity': 'nan'},
+    {'initial_equity': 'inf'},
+    {'ruin': 'nan'},
+    {'risk_percentage': 'nan'},
+    {'risk_percentage': '-inf'},
+    {'risk_percentage': 0},
+    {'mode': 'r', 'risk_percentage': -1},
+])
+def test_simulation_route_rejects_invalid_numbers(client, simulation_url, params):
+    assert client.get(simulation_url, query_string=params).status_code == 400
+
+
+def test_simulation_route_caps_paths_times_trades(ds, client, simulation_url):
+    response = client.get(simulation_url, query_string={'paths': ds.MAX_PATHS, 'trades': ds.MAX_TRADES_PER_PATH})
+    assert response.status_code == 400
+    assert str(ds.MAX_CELLS) in response.get_json()['error']
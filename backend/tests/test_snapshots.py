@@ -0,0 +1,27 @@
+# tests/test_snapshots.py - Journal-Snapshots: Versionen und Invalidierung
+
+from tests.conftest import make_entry
+
+
+def test_snapshot_round_trip_and_invalidation(ds, journal_id):
+    entry = make_entry(ds, journal_id, pnl=40)
+    snapshot = ds.journal_snapshot(journal_id)
+    assert ds.journal_snapshot(journal_id) is snapshot
+    assert [e['id'] for e in snapshot.entries] == [entry['id']]
+    assert [r.pnl for r in snapshot.records()] == [40]
+
+    # Schreibvorgänge in einer Transaktion veröffentlichen eine neue Version
+    ds.update_entry(entry['id'], {'pnl': 60})
+    updated = ds.journal_snapshot(journal_id)
+    assert updated.version > snapshot.version
+    assert [e['pnl'] for e in updated.entries] == [60]
+    assert [e['pnl'] for e in snapshot.entries] == [40]  # alte Version bleibt unverändert
+
+    # Schreibvorgänge ohne Transaktion verwerfen den Snapshot; der nächste Leser baut ihn neu auf
+    entries = ds.load_journal_data(journal_id, 'entries')
+    entries[0]['pnl'] = 75
+    ds.save_journal_data(journal_id, 'entries', entries)
+    rebuilt = ds.journal_snapshot(journal_id)
+    assert rebuilt is not updated
+    assert [e['pnl'] for e in rebuilt.entries] == [75]
+    assert rebuilt.signature == ds.entries_signature(journal_id)
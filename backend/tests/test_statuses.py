@@ -0,0 +1,34 @@
+# tests/test_statuses.py - Checklistenstatus als Bitmasken: Kompaktierung alter Zeilen
+
+from tests.conftest import make_entry
+
+
+def test_compact_statuses_merges_legacy_rows_into_bitmasks(ds):
+    templates = [{'id': 10, 'order': 0}, {'id': 11, 'order': 1}, {'id': 12, 'order': 2}]
+    statuses = [
+        {'entry_id': 1, 'known': 0b001, 'checked': 0b001},
+        {'entry_id': 1, 'template_id': 11, 'checked': True},
+        {'entry_id': 1, 'template_id': 10, 'checked': False},
+        {'entry_id': 2, 'template_id': 12, 'checked': True},
+        {'entry_id': 2, 'template_id': 99, 'checked': True},  # gelöschte Vorlage
+    ]
+
+    compacted = {row['entry_id']: row for row in ds.compact_statuses(statuses, templates)}
+
+    assert compacted[1] == {'entry_id': 1, 'known': 0b011, 'checked': 0b010}
+    assert compacted[2] == {'entry_id': 2, 'known': 0b100, 'checked': 0b100}
+
+
+def test_compacted_shard_matches_legacy_rows(ds, journal_id):
+    templates = ds.get_checklist_templates(journal_id)
+    entry = make_entry(ds, journal_id)
+    legacy = [{'entry_id': entry['id'], 'template_id': t['id'], 'checked': t['order'] != 1} for t in templates]
+    ds.save_journal_data(journal_id, 'statuses', legacy)
+
+    ds.compact_status_shards()
+
+    compacted = ds.load_journal_data(journal_id, 'statuses')
+    assert len(compacted) == 1
+    assert ds.expand_status_row(compacted[0], templates) == legacy
+    served = ds.get_entry(entry['id'])['checklist_statuses']
+    assert [(s['template_id'], s['checked']) for s in served] == [(s['template_id'], s['checked']) for s in legacy]
@@ -0,0 +1,64 @@
+# tests/test_uploads.py - Prüfung von Größe und Bildtyp beim Hochladen
+
+import io
+import os
+
+import pytest
+
+from tests.conftest import make_entry
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\0' * 200
+JPEG = b'\xff\xd8\xff\xe0' + b'\0' * 200
+
+
+def upload_files(ds):
+    return set(os.listdir(ds.UPLOADS_DIR))
+
+
+def test_store_upload_stream_accepts_images(ds):
+    stored = ds.store_upload_stream(io.BytesIO(JPEG), 'chart.jpg', chunk_size=3)
+
+    assert stored['content_type'] == 'image/jpeg'
+    assert stored['size'] == len(JPEG)
+    with open(os.path.join(ds.UPLOADS_DIR, stored['file_path']), 'rb') as f:
+        assert f.read() == JPEG
+    os.remove(os.path.join(ds.UPLOADS_DIR, stored['file_path']))
+
+
+@pytest.mark.parametrize('content, max_size, status_code', [
+    (PNG, len(PNG) - 1, 413),                # zu groß
+    (b'<svg xmlns="..."/>' * 4, 1024, 400),  # kein unterstütztes Bild
+    (b'GIF8', 1024, 400),                    # zu kurz für eine Signatur
+    (b'', 1024, 400),                        # leer
+])
+def test_store_upload_stream_rejects_invalid_files(ds, content, max_size, status_code):
+    before = upload_files(ds)
+
+    with pytest.raises(ds.UploadError) as excinfo:
+        ds.store_upload_stream(io.BytesIO(content), 'chart.png', max_size=max_size, chunk_size=16)
+
+    assert excinfo.value.status_code == status_code
+    assert upload_files(ds) == before  # keine temporären oder halben Dateien
+
+
+def test_upload_route_checks_size_and_type(ds, client, journal_id):
+    entry = make_entry(ds, journal_id)
+    url = f"/api/entries/{entry['id']}/images"
+
+    response = client.post(url, data={'image': (io.BytesIO(PNG), 'chart.png')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 201
+    served = client.get(response.get_json()['file_path'])
+    assert served.status_code == 200
+    assert served.data == PNG
+
+    response = client.post(url, data={'image': (io.BytesIO(b'not an image' * 10), 'chart.png')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 400
+
+    too_large = b'\x89PNG\r\n\x1a\n' + b'\0' * client.application.config['MAX_UPLOAD_SIZE']
+    response = client.post(url, data={'image': (io.BytesIO(too_large), 'chart.png')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+
+    assert len(ds.get_entry(entry['id'])['images']) == 1  # abgelehnte Uploads hinterlassen nichts
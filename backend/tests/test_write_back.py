@@ -0,0 +1,70 @@
+# tests/test_write_back.py - Write-Back-Puffer: Sichtbarkeit, Flush und abgeleitete Indizes
+
+import os
+import json
+
+from tests.conftest import make_entry
+
+
+def read_file(ds, journal_id, collection):
+    """Inhalt der Datei auf der Platte (ohne Puffer); [] solange sie nicht geschrieben wurde."""
+    if not os.path.exists(ds.journal_file(journal_id, collection)):
+        return []
+    with open(ds.journal_file(journal_id, collection), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_buffered_changes_are_visible_before_flush(write_back, journal_id):
+    ds = write_back
+    entry = make_entry(ds, journal_id, pnl=25)
+
+    assert ds.entries_pending(journal_id)
+    assert ds.get_entry(entry['id'])['pnl'] == 25
+    assert entry['id'] not in {e['id'] for e in read_file(ds, journal_id, 'entries')}
+
+    assert ds.flush_journal(journal_id) >= 1
+    assert not ds.entries_pending(journal_id)
+    assert [e['pnl'] for e in read_file(ds, journal_id, 'entries')] == [25]
+
+
+def test_pending_signature_is_never_persisted(write_back, journal_id):
+    ds = write_back
+    make_entry(ds, journal_id, notes='Gepufferte Notiz')
+    signature = ds.entries_signature(journal_id)
+    assert signature[1:] == ('pending', ds.PROCESS_TOKEN)
+
+    # Solange entries.json im Puffer liegt, wird kein Suchindex geschrieben
+    ds.get_search_index(journal_id)
+    assert not ds.save_search_index(journal_id)
+
+
+def test_flush_resigns_derived_indexes(write_back, journal_id):
+    ds = write_back
+    make_entry(ds, journal_id, pnl=30, notes='Sauberer Ausbruch')
+    rollups = ds.get_rollups(journal_id)
+    index = ds.get_search_index(journal_id)
+    records = ds.get_entry_records(journal_id)
+
+    ds.flush_pending_writes()
+
+    # Gleicher Inhalt, neue Dateikennung: die Indizes werden übernommen statt neu aufgebaut
+    signature = ds.entries_signature(journal_id)
+    assert 'pending' not in signature
+    assert ds.get_rollups(journal_id) is rollups
+    assert ds.get_search_index(journal_id) is index
+    assert ds.get_entry_records(journal_id) is records
+    assert rollups.signature == index.signature == signature
+    assert ds.save_search_index(journal_id)
+
+
+def test_delete_journal_discards_pending_writes(write_back, journal_id):
+    ds = write_back
+    make_entry(ds, journal_id)
+    other = ds.create_journal({'name': 'Anderes'})['id']
+    make_entry(ds, other)
+
+    ds.delete_journal(other)
+
+    assert not ds.entries_pending(other)
+    assert ds.flush_pending_writes() >= 1  # nur das verbliebene Journal
+    assert ds.load_journal_data(other, 'entries') == []
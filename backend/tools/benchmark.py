@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# tools/benchmark.py - Benchmarks für data_storage mit synthetischen Daten (Ausgabe als JSON)
+#
+# Beispiel:
+#   python tools/benchmark.py --sizes 1000,10000 --output bench.json
+#   python tools/benchmark.py --sizes 1000,10000 --compare bench.json
+#
+# Für jede Größe werden Journale mit tools/generate_data.py in einem temporären
+# Datenverzeichnis erzeugt; die echten Daten werden nicht berührt.
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import datetime
+import statistics
+import subprocess
+import tempfile
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TOOLS_DIR)
+import generate_data  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEATS = 5
+
+
+def measure(func, repeats, setup=None):
+    """Führt func repeats-mal aus und gibt die Laufzeiten in Sekunden zurück."""
+    timings = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(size, operation, timings):
+    return {
+        'size': size,
+        'operation': operation,
+        'runs': len(timings),
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings)
+    }
+
+
+def clear_caches(ds):
+    """Verwirft die abgeleiteten Caches, damit auch Kaltstarts gemessen werden."""
+    ds.reset_caches()
+
+
+def benchmark_size(ds, rng, size, repeats):
+    """Misst alle Operationen für ein Journal mit size Einträgen."""
+    results = []
+    journal_id = generate_data.generate_journal(ds, rng, size)
+    entry_ids = [e['id'] for e in ds.get_entries(journal_id)]
+    template = ds.get_checklist_templates(journal_id)[0]
+    # Schreibende Operationen auf großen Journalen sind teuer, daher weniger Wiederholungen
+    write_repeats = max(1, repeats if size <= 10000 else repeats // 2)
+
+    def record(operation, timings):
+        results.append(summarize(size, operation, timings))
+        print(f"  {operation:<32} median {results[-1]['median'] * 1000:10.2f} ms", file=sys.stderr)
+
+    entries_file = ds.journal_file(journal_id, 'entries')
+    record('load_data_entries', measure(lambda: ds.load_data(entries_file), repeats))
+    record('get_entries', measure(lambda: ds.get_entries(journal_id), repeats))
+    record('get_entry', measure(lambda: ds.get_entry(rng.choice(entry_ids)), repeats))
+    record('get_journal_statistics_cold',
+           measure(lambda: ds.get_journal_statistics(journal_id), repeats, lambda: clear_caches(ds)))
+    record('get_journal_statistics', measure(lambda: ds.get_journal_statistics(journal_id), repeats))
+
+    template_id = template['id']
+    record('update_checklist_status', measure(
+        lambda: ds.update_checklist_status(rng.choice(entry_ids), template_id, rng.random() < 0.5),
+        write_repeats
+    ))
+
+    new_entry = {
+        'entry_date': '2024-06-03T09:30', 'symbol': 'EURUSD', 'position_type': 'Long',
+        'strategy': 'Breakout', 'initial_rr': 2, 'pnl': 150, 'result': 'Win',
+        'checklist_statuses': {str(template_id): True}
+    }
+    record('create_entry', measure(lambda: ds.create_entry(journal_id, new_entry), write_repeats))
+
+    record('delete_journal', measure(lambda: ds.delete_journal(journal_id), 1))
+    ds.wait_for_reaper()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=TOOLS_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Gibt die Veränderung der Mediane gegenüber einer früheren Ergebnisdatei aus."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['size'], r['operation']): r for r in json.load(f)['results']}
+
+    print(f"\nVergleich mit {baseline_path}:", file=sys.stderr)
+    for result in results:
+        previous = baseline.get((result['size'], result['operation']))
+        if not previous or not previous['median']:
+            continue
+        ratio = result['median'] / previous['median']
+        marker = '  <-- langsamer' if ratio > 1.2 else ''
+        print(f"  {result['size']:>7} {result['operation']:<32} x{ratio:6.2f}{marker}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für data_storage")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="Kommagetrennte Journalgrößen (Einträge)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Wiederholungen je Operation")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Ergebnisdatei (JSON), sonst Ausgabe auf stdout")
+    parser.add_argument('--compare', help="Frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument('--durability', choices=('paranoid', 'standard', 'fast'), default='standard',
+                        help="Haltbarkeitsmodus der Speichervorgänge")
+    parser.add_argument('--format', choices=('json', 'binary'), default='json',
+                        help="Speicherformat (binary: zusätzliche Binärdateien)")
+    parser.add_argument('--keep-data', action='store_true', help="Temporäres Datenverzeichnis nicht löschen")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    data_dir = tempfile.mkdtemp(prefix='tj-bench-')
+    ds = generate_data.load_storage(data_dir)
+    ds.configure_durability(args.durability)
+    ds.configure_storage_format(args.format)
+    rng = random.Random(args.seed)
+
+    results = []
+    try:
+        for size in sizes:
+            print(f"{size} Einträge:", file=sys.stderr)
+            results.extend(benchmark_size(ds, rng, size, args.repeats))
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        'created_at': datetime.datetime.utcnow().isoformat() + 'Z',
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': args.repeats,
+        'durability': args.durability,
+        'format': args.format,
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
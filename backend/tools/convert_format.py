@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# tools/convert_format.py - Konvertiert Datendateien zwischen JSON und Binärformat und prüft sie
+#
+# Beispiele:
+#   python tools/convert_format.py to-binary                 # Binärdateien zu allen JSON-Dateien
+#   python tools/convert_format.py verify                    # Prüfsummen beider Formate vergleichen
+#   python tools/convert_format.py to-json --output-dir exp  # Export der Binärdateien als JSON
+#   python tools/convert_format.py to-json                   # fehlende/defekte JSON-Dateien wiederherstellen
+#
+# Bitte bei gestopptem Server ausführen. Das Werkzeug importiert data_storage bewusst nicht,
+# da dessen Initialisierung defekte JSON-Dateien aus Backups ersetzen würde.
+
+import os
+import sys
+import json
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from src import binary_format  # noqa: E402
+
+SHARED_FILES = ('journals', 'templates', 'strategies')
+SHARDED_COLLECTIONS = ('entries', 'statuses', 'images')
+
+
+def data_files(data_dir):
+    """Alle Datendateien (ohne Endung) relativ zum Datenverzeichnis."""
+    names = list(SHARED_FILES)
+    journals_dir = os.path.join(data_dir, 'journals')
+    if os.path.isdir(journals_dir):
+        for journal in sorted((n for n in os.listdir(journals_dir) if n.isdigit()), key=int):
+            names.extend(os.path.join('journals', journal, c) for c in SHARDED_COLLECTIONS)
+    return [name for name in names
+            if os.path.exists(os.path.join(data_dir, name + '.json'))
+            or os.path.exists(os.path.join(data_dir, name + binary_format.EXTENSION))]
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Daten sind keine Liste")
+    return data
+
+
+def write_json(path, data):
+    """Schreibt wie data_storage (eingerückt, UTF-8) atomar über eine temporäre Datei."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+
+def stamp_of(path):
+    return binary_format.source_stamp(os.stat(path))
+
+
+def to_binary(data_dir, names, codec):
+    """JSON -> Binär; prüft, dass die geschriebene Binärdatei dieselbe Prüfsumme ergibt."""
+    failures = 0
+    for name in names:
+        json_path = os.path.join(data_dir, name + '.json')
+        bin_path = os.path.join(data_dir, name + binary_format.EXTENSION)
+        if not os.path.exists(json_path):
+            print(f"  {name}: keine JSON-Datei, übersprungen")
+            continue
+        try:
+            data = read_json(json_path)
+            stamp = stamp_of(json_path)
+            size = binary_format.write_snapshot(bin_path, data, stamp, fsync=True, codec=codec)
+            expected = binary_format.canonical_checksum(data)
+            actual = binary_format.canonical_checksum(binary_format.read_snapshot(bin_path, stamp))
+        except (OSError, ValueError) as e:
+            print(f"  {name}: FEHLER {e}")
+            failures += 1
+            continue
+        if actual != expected:
+            os.remove(bin_path)
+            print(f"  {name}: FEHLER Prüfsumme {actual[:12]} statt {expected[:12]}, Binärdatei entfernt")
+            failures += 1
+        else:
+            print(f"  {name}: {len(data)} Zeilen, {size} Bytes, sha256 {expected[:12]}")
+    return failures
+
+
+def to_json(data_dir, names, output_dir=None, force=False):
+    """
+    Binär -> JSON; prüft, dass die geschriebene JSON-Datei dieselbe Prüfsumme ergibt. Ohne
+    output_dir werden nur fehlende oder unlesbare JSON-Dateien ersetzt (mit force alle); die
+    Binärdatei wird danach der neuen JSON-Datei zugeordnet.
+    """
+    failures = 0
+    for name in names:
+        bin_path = os.path.join(data_dir, name + binary_format.EXTENSION)
+        if not os.path.exists(bin_path):
+            continue
+        try:
+            with open(bin_path, 'rb') as f:
+                content = f.read()
+            codec = binary_format.read_header(content)[0]
+            data = binary_format.decode(content)
+        except (OSError, ValueError) as e:
+            print(f"  {name}: FEHLER {e}")
+            failures += 1
+            continue
+
+        json_path = os.path.join(output_dir or data_dir, name + '.json')
+        if output_dir is None and not force and os.path.exists(json_path):
+            try:
+                read_json(json_path)
+                print(f"  {name}: JSON-Datei ist lesbar, übersprungen (--force zum Überschreiben)")
+                continue
+            except (OSError, ValueError):
+                pass
+
+        expected = binary_format.canonical_checksum(data)
+        try:
+            write_json(json_path, data)
+            actual = binary_format.canonical_checksum(read_json(json_path))
+            if output_dir is None and actual == expected:
+                binary_format.write_snapshot(bin_path, data, stamp_of(json_path), fsync=True, codec=codec)
+        except (OSError, ValueError) as e:
+            print(f"  {name}: FEHLER {e}")
+            failures += 1
+            continue
+        if actual != expected:
+            print(f"  {name}: FEHLER Prüfsumme {actual[:12]} statt {expected[:12]}")
+            failures += 1
+        else:
+            print(f"  {name}: {len(data)} Zeilen nach {json_path}, sha256 {expected[:12]}")
+    return failures
+
+
+def verify(data_dir, names):
+    """Vergleicht die Prüfsummen von JSON- und Binärdatei; veraltete Binärdateien werden gemeldet."""
+    failures = 0
+    for name in names:
+        json_path = os.path.join(data_dir, name + '.json')
+        bin_path = os.path.join(data_dir, name + binary_format.EXTENSION)
+        if not os.path.exists(bin_path):
+            print(f"  {name}: keine Binärdatei")
+            continue
+        try:
+            with open(bin_path, 'rb') as f:
+                content = f.read()
+            codec, source, _ = binary_format.read_header(content)
+            binary_sum = binary_format.canonical_checksum(binary_format.decode(content))
+        except (OSError, ValueError) as e:
+            print(f"  {name}: FEHLER Binärdatei {e}")
+            failures += 1
+            continue
+        try:
+            json_sum = binary_format.canonical_checksum(read_json(json_path))
+            current = source == stamp_of(json_path)
+        except (OSError, ValueError) as e:
+            print(f"  {name}: FEHLER JSON-Datei {e} (Wiederherstellung mit to-json möglich)")
+            failures += 1
+            continue
+
+        if json_sum == binary_sum:
+            state = 'aktuell' if current else 'gleicher Inhalt, Kennung veraltet (wird ignoriert)'
+            print(f"  {name}: OK ({codec}, {state}), sha256 {json_sum[:12]}")
+        elif current:
+            print(f"  {name}: FEHLER Prüfsummen weichen ab (JSON {json_sum[:12]}, binär {binary_sum[:12]})")
+            failures += 1
+        else:
+            print(f"  {name}: veraltet, wird beim Laden ignoriert (to-binary erneuert sie)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konvertiert und prüft JSON- und Binärdateien")
+    parser.add_argument('command', choices=('to-binary', 'to-json', 'verify'))
+    parser.add_argument('--data-dir', default=os.environ.get('TRADING_JOURNAL_DATA_DIR')
+                        or os.path.join(BACKEND_DIR, 'data'), help="Datenverzeichnis")
+    parser.add_argument('--codec', choices=binary_format.available_codecs(), default=binary_format.default_codec(),
+                        help="Codec der Binärdateien (to-binary)")
+    parser.add_argument('--output-dir', help="to-json: Export in dieses Verzeichnis statt Wiederherstellung")
+    parser.add_argument('--force', action='store_true', help="to-json: auch lesbare JSON-Dateien überschreiben")
+    args = parser.parse_args()
+
+    names = data_files(args.data_dir)
+    print(f"{len(names)} Dateien in {args.data_dir}:")
+    if args.command == 'to-binary':
+        failures = to_binary(args.data_dir, names, args.codec)
+    elif args.command == 'to-json':
+        failures = to_json(args.data_dir, names, args.output_dir, args.force)
+    else:
+        failures = verify(args.data_dir, names)
+
+    print(f"{failures} Fehler")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
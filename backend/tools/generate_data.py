@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# tools/generate_data.py - Erzeugt synthetische Journal-Daten für Benchmarks und Lasttests
+#
+# Beispiel:
+#   python tools/generate_data.py --data-dir /tmp/tj-data --journals 3 --entries 10000
+#
+# Die Daten werden direkt im Speicherformat (data/journals/<id>/...) geschrieben, ohne den
+# Umweg über create_entry, damit auch 100k Einträge in wenigen Sekunden entstehen.
+
+import os
+import sys
+import random
+import argparse
+import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SYMBOLS = ('EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD', 'DAX', 'NASDAQ', 'US30', 'BTCUSD')
+STRATEGIES = ('Breakout', 'Pullback', 'Reversal', 'Range', 'News', 'Trendfolge')
+EMOTIONS = ('Confidence', 'Doubt', 'Frustration', 'Euphoria', 'Indifference', 'Neutral',
+            'Revenge Trading', 'Self-Deception', 'Impatience')
+CHECKLIST_TEXTS = ('Trend im H4 bestätigt', 'Key Level markiert', 'News-Kalender geprüft',
+                   'Risiko max. 1%', 'Einstieg nach Bestätigung', 'SL hinter Struktur',
+                   'Kein Trade gegen den Trend', 'Session aktiv', 'Volumen steigend',
+                   'Plan vor dem Einstieg notiert')
+NOTE_PHRASES = ('Sauberer Ausbruch über das Tageshoch.', 'Zu früh eingestiegen, Bestätigung fehlte.',
+                'Geduldig auf den Rücklauf gewartet.', 'Stop zu eng gesetzt.',
+                'Breakout above the Asian range.', 'Chased the move after missing the entry.',
+                'Followed the plan, partial at 1R.', 'News spike took out the stop.',
+                'Trendlinie hielt, Ziel erreicht.', 'Exited early out of fear.')
+
+# Verteilung der Ergebnisse (Win, Loss, BE, PartialBE)
+RESULT_WEIGHTS = (('Win', 45), ('Loss', 40), ('BE', 10), ('PartialBE', 5))
+
+
+def random_entry(rng, journal_id, entry_id, start, span_days):
+    """Erzeugt einen plausiblen Eintrag (Rohwerte wie vom Frontend gesendet)."""
+    entry_time = start + datetime.timedelta(days=rng.randrange(span_days),
+                                            hours=rng.choice((7, 8, 9, 10, 11, 13, 14, 15, 16, 20)),
+                                            minutes=rng.randrange(60))
+    end_time = entry_time + datetime.timedelta(minutes=rng.randrange(5, 480))
+    result = rng.choices([r for r, _ in RESULT_WEIGHTS], [w for _, w in RESULT_WEIGHTS])[0]
+    initial_rr = round(rng.uniform(1, 4), 1)
+    risk = rng.choice((0.5, 1, 1, 1.5, 2))
+    risk_amount = risk * 100
+
+    if result == 'Win':
+        pnl = round(risk_amount * initial_rr * rng.uniform(0.6, 1.0), 2)
+    elif result == 'Loss':
+        pnl = round(-risk_amount * rng.uniform(0.8, 1.05), 2)
+    elif result == 'PartialBE':
+        pnl = round(risk_amount * rng.uniform(0.2, 0.8), 2)
+    else:
+        pnl = 0
+
+    return {
+        'id': entry_id,
+        'journal_id': journal_id,
+        'entry_date': entry_time.strftime('%Y-%m-%dT%H:%M'),
+        'end_date': end_time.strftime('%Y-%m-%dT%H:%M'),
+        'symbol': rng.choice(SYMBOLS),
+        'position_type': rng.choice(('Long', 'Short')),
+        'strategy': rng.choice(STRATEGIES),
+        'initial_rr': initial_rr,
+        'risk_percentage': risk,
+        'pnl': pnl,
+        'result': result,
+        'confidence_level': rng.randint(1, 10),
+        'trade_rating': rng.randint(1, 5),
+        'notes': ' '.join(rng.sample(NOTE_PHRASES, rng.randint(1, 3))),
+        'stop_loss': None,
+        'take_profit': None,
+        'custom_field_value': None,
+        'emotion': rng.choice(EMOTIONS)
+    }
+
+
+def next_id(rows, default=1):
+    return max((row['id'] for row in rows), default=default - 1) + 1
+
+
+def generate_journal(ds, rng, entry_count, template_count=8, images_per_entry=0.5, span_days=730):
+    """
+    Legt ein Journal mit entry_count Einträgen, Checklistenvorlagen, Status-Bitmasken und
+    Bild-Metadaten an und gibt die Journal-ID zurück. ds ist das geladene data_storage-Modul.
+    """
+    journals = ds.load_data(ds.JOURNALS_FILE)
+    templates = ds.load_data(ds.TEMPLATES_FILE)
+    journal_id = next_id(journals)
+
+    journals.append({
+        'id': journal_id,
+        'name': f"Benchmark {journal_id} ({entry_count} Einträge)",
+        'description': 'Synthetische Daten (tools/generate_data.py)',
+        'has_sl_tp_fields': False,
+        'has_custom_field': False,
+        'custom_field_name': '',
+        'custom_field_options': [],
+        'has_emotions': True,
+        'timezone': ds.DEFAULT_TIMEZONE,
+        'bucket_timezone': None,
+        'sessions': None,
+        'created_at': datetime.datetime.utcnow().isoformat()
+    })
+
+    template_id = next_id(templates)
+    journal_templates = []
+    for order in range(template_count):
+        journal_templates.append({
+            'id': template_id + order,
+            'journal_id': journal_id,
+            'text': CHECKLIST_TEXTS[order % len(CHECKLIST_TEXTS)],
+            'order': order
+        })
+    templates.extend(journal_templates)
+    known = sum(ds.template_bit(t) for t in journal_templates)
+
+    entry_id, image_id = ds.next_free_ids()
+
+    utc = datetime.timezone.utc
+    start = datetime.datetime(2023, 1, 2)
+    entries, statuses, images = [], [], []
+    for _ in range(entry_count):
+        entry = random_entry(rng, journal_id, entry_id, start, span_days)
+        ds.normalize_entry_fields(entry, input_tz=utc, bucket_tz=utc)
+        entries.append(entry)
+
+        checked = 0
+        for template in journal_templates:
+            if rng.random() < 0.6:
+                checked |= ds.template_bit(template)
+        statuses.append({'entry_id': entry_id, 'known': known, 'checked': checked})
+
+        image_count = int(images_per_entry) + (rng.random() < images_per_entry % 1)
+        for index in range(image_count):
+            images.append({
+                'id': image_id,
+                'entry_id': entry_id,
+                'file_path': None,
+                'link_url': f"https://www.tradingview.com/x/bench{entry_id}-{index}/",
+                'category': 'Before' if index % 2 == 0 else 'After',
+                'uploaded_at': entry['entry_date']
+            })
+            image_id += 1
+        entry_id += 1
+
+    ds.save_data(ds.TEMPLATES_FILE, templates)
+    ds.save_journal_data(journal_id, 'entries', entries)
+    ds.save_journal_data(journal_id, 'statuses', statuses)
+    ds.save_journal_data(journal_id, 'images', images)
+    ds.save_data(ds.JOURNALS_FILE, journals)
+
+    for strategy in STRATEGIES:
+        ds.add_strategy(strategy)
+
+    ds.rebuild_indexes()
+    return journal_id
+
+
+def load_storage(data_dir):
+    """Importiert data_storage mit dem angegebenen Datenverzeichnis."""
+    os.environ['TRADING_JOURNAL_DATA_DIR'] = os.path.abspath(data_dir)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from src import data_storage
+    return data_storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt synthetische Trading-Journal-Daten")
+    parser.add_argument('--data-dir', required=True, help="Zielverzeichnis (wird als DATA_DIR verwendet)")
+    parser.add_argument('--journals', type=int, default=1, help="Anzahl Journale")
+    parser.add_argument('--entries', type=int, default=1000, help="Einträge pro Journal")
+    parser.add_argument('--templates', type=int, default=8, help="Checklistenvorlagen pro Journal")
+    parser.add_argument('--images', type=float, default=0.5, help="Bilder pro Eintrag (Durchschnitt)")
+    parser.add_argument('--seed', type=int, default=42, help="Seed für reproduzierbare Daten")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.data_dir) == os.path.join(BACKEND_DIR, 'data'):
+        parser.error("Bitte ein separates Verzeichnis verwenden, nicht die echten Daten")
+
+    ds = load_storage(args.data_dir)
+    rng = random.Random(args.seed)
+    for _ in range(args.journals):
+        journal_id = generate_journal(ds, rng, args.entries, args.templates, args.images)
+        print(f"Journal {journal_id}: {args.entries} Einträge erzeugt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# tools/stress.py - Nebenläufiger Lasttest der Speicherschicht über den Flask-Test-Client
+#
+# Beispiel:
+#   python tools/stress.py --threads 16 --operations 200
+#   python tools/stress.py --threads 4 --processes 4 --output stress.json
+#
+# Jeder Worker legt eigene Einträge an und bearbeitet, toggelt, löscht und versieht sie mit
+# Bildern. Dabei führt er ein Protokoll des zuletzt erfolgreich geschriebenen Zustands, das
+# am Ende mit den Dateien auf der Platte verglichen wird (Invarianten, siehe check_invariants).
+# Gearbeitet wird in einem temporären Datenverzeichnis; die echten Daten werden nicht berührt.
+# Der Exit-Code ist 1, wenn eine Invariante verletzt ist.
+#
+# Hinweis zu --processes: Die Sperren und ID-Zähler in data_storage gelten nur innerhalb eines
+# Prozesses. Jeder Prozess arbeitet auf einem eigenen Journal und vergibt IDs aus eigenen
+# Zählern, die sich mit denen der anderen Prozesse überschneiden. Geprüft werden in diesem
+# Modus daher nur Invarianten, die je Prozess gelten: eindeutige IDs innerhalb eines Journals,
+# keine verlorenen Schreibvorgänge, keine verwaisten Zeilen oder Dateien.
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import tempfile
+import threading
+import concurrent.futures
+import multiprocessing
+from io import BytesIO
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TOOLS_DIR)
+import generate_data  # noqa: E402
+from benchmark import git_revision  # noqa: E402
+
+OPERATIONS = ('create', 'update', 'delete', 'toggle', 'upload')
+# Gewichtung der Operationen; create überwiegt, damit immer genug Einträge vorhanden sind
+OPERATION_WEIGHTS = (30, 25, 10, 25, 10)
+DEFAULT_TEMPLATES = 4
+PERCENTILES = (50, 90, 95, 99)
+
+# Kleinste gültige PNG-Datei (1x1 Pixel)
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489'
+    '0000000d49444154789c6360000002000001e221bc330000000049454e44ae426082'
+)
+
+
+def load_app(data_dir):
+    """
+    Importiert die Flask-App mit dem angegebenen Datenverzeichnis. Das Log landet ebenfalls
+    dort, nicht in der trading_journal.log des Repositorys.
+    """
+    os.environ['TRADING_JOURNAL_LOG_FILE'] = os.path.join(os.path.abspath(data_dir), 'stress.log')
+    ds = generate_data.load_storage(data_dir)
+    from src.main import app
+    app.config['TESTING'] = True
+    return app, ds
+
+
+class Ledger:
+    """Zuletzt erfolgreich geschriebener Zustand der Einträge eines Workers."""
+
+    def __init__(self, journal_id):
+        self.journal_id = journal_id
+        self.entries = {}  # entry_id -> {'notes', 'checked': {template_id: bool}, 'images'}
+        self.deleted = set()
+
+    def to_dict(self):
+        return {'journal_id': self.journal_id, 'entries': {str(k): v for k, v in self.entries.items()}, 'deleted': sorted(self.deleted)}
+
+
+def run_worker(app, journal_id, template_ids, operations, seed):
+    """
+    Führt operations zufällige Anfragen gegen ein Journal aus.
+    Gibt (Protokoll, Latenzen je Operation, Fehler je Operation) zurück.
+    """
+    rng = random.Random(seed)
+    client = app.test_client()
+    ledger = Ledger(journal_id)
+    latencies = {op: [] for op in OPERATIONS}
+    errors = {op: 0 for op in OPERATIONS}
+
+    def call(op, method, url, **kwargs):
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        latencies[op].append(time.perf_counter() - start)
+        return response
+
+    for n in range(operations):
+        alive = list(ledger.entries)
+        op = rng.choices(OPERATIONS, OPERATION_WEIGHTS)[0] if alive else 'create'
+
+        if op == 'create':
+            checked = {tid: rng.random() < 0.5 for tid in template_ids}
+            notes = f"worker {seed} create {n}"
+            response = call(op, 'POST', f"/api/journals/{journal_id}/entries", json={
+                'entry_date': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00",
+                'symbol': rng.choice(generate_data.SYMBOLS),
+                'strategy': rng.choice(generate_data.STRATEGIES),
+                'result': rng.choice(('Win', 'Loss', 'BE')),
+                'pnl': round(rng.uniform(-100, 150), 2),
+                'notes': notes,
+                'checklist_statuses': {str(tid): value for tid, value in checked.items()}
+            })
+            if response.status_code == 201:
+                entry_id = response.get_json()['id']
+                ledger.entries[entry_id] = {'notes': notes, 'checked': checked, 'images': 0}
+                ledger.deleted.discard(entry_id)
+            else:
+                errors[op] += 1
+
+        elif op == 'update':
+            entry_id = rng.choice(alive)
+            notes = f"worker {seed} update {n}"
+            response = call(op, 'PUT', f"/api/entries/{entry_id}", json={'notes': notes})
+            if response.status_code == 200:
+                ledger.entries[entry_id]['notes'] = notes
+            else:
+                errors[op] += 1
+
+        elif op == 'delete':
+            entry_id = rng.choice(alive)
+            response = call(op, 'DELETE', f"/api/entries/{entry_id}")
+            if response.status_code in (200, 204):
+                del ledger.entries[entry_id]
+                ledger.deleted.add(entry_id)
+            else:
+                errors[op] += 1
+
+        elif op == 'toggle':
+            entry_id = rng.choice(alive)
+            template_id = rng.choice(template_ids)
+            checked = not ledger.entries[entry_id]['checked'][template_id]
+            response = call(op, 'PUT', f"/api/entries/{entry_id}/checklist/{template_id}",
+                            json={'checked': checked})
+            if response.status_code == 200:
+                ledger.entries[entry_id]['checked'][template_id] = checked
+            else:
+                errors[op] += 1
+
+        else:  # upload
+            entry_id = rng.choice(alive)
+            response = call(op, 'POST', f"/api/entries/{entry_id}/images",
+                            data={'image': (BytesIO(PNG_BYTES), 'chart.png'), 'category': 'Before'},
+                            content_type='multipart/form-data')
+            if response.status_code == 201:
+                ledger.entries[entry_id]['images'] += 1
+            else:
+                errors[op] += 1
+
+    return ledger, latencies, errors
+
+
+def setup_journals(app, count, template_count):
+    """Legt count Journale mit je template_count Checklistenvorlagen an."""
+    client = app.test_client()
+    journals = []
+    for n in range(count):
+        journal = client.post('/api/journals', json={'name': f"Stress {n + 1}"}).get_json()
+        template_ids = []
+        for order in range(template_count):
+            response = client.post(f"/api/journals/{journal['id']}/checklist_templates",
+                                   json={'text': generate_data.CHECKLIST_TEXTS[order]})
+            template_ids.append(response.get_json()['id'])
+        journals.append((journal['id'], template_ids))
+    return journals
+
+
+def run_threads(app, journals, threads, operations, seed, offset=0):
+    """Startet threads Worker (verteilt auf die Journale) und sammelt ihre Ergebnisse."""
+    results = [None] * threads
+    barrier = threading.Barrier(threads)
+
+    def target(index):
+        journal_id, template_ids = journals[index % len(journals)]
+        barrier.wait()  # alle Worker gleichzeitig loslassen
+        results[index] = run_worker(app, journal_id, template_ids, operations, seed + offset + index)
+
+    workers = [threading.Thread(target=target, args=(i,), name=f"stress-{i}") for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def process_main(data_dir, journals, threads, operations, seed, offset):
+    """Einstiegspunkt eines Worker-Prozesses (eigene App-Instanz auf demselben Datenverzeichnis)."""
+    app, ds = load_app(data_dir)
+    results = run_threads(app, journals, threads, operations, seed, offset)
+    ds.flush_pending_writes()
+    ds.wait_for_reaper()
+    return [(ledger.to_dict(), latencies, errors) for ledger, latencies, errors in results]
+
+
+def read_json(path, violations):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        violations.append(f"{path}: kein gültiges JSON ({e})")
+        return None
+
+
+def check_invariants(data_dir, ledgers, ids_per_journal=False):
+    """
+    Prüft die Dateien auf der Platte gegen die Protokolle der Worker und gibt eine Liste
+    der Verletzungen zurück (leer, wenn alles stimmt). Mit ids_per_journal müssen IDs nur
+    innerhalb eines Journals eindeutig sein (--processes, jeder Prozess zählt für sich).
+    """
+    violations = []
+    shared = {name: read_json(os.path.join(data_dir, f"{name}.json"), violations)
+              for name in ('journals', 'templates', 'strategies')}
+    templates = shared['templates'] or []
+    template_bits = {t['id']: 1 << t['order'] for t in templates}
+
+    # Schlüssel (journal_id, entry_id), damit doppelte IDs journalübergreifend erkennbar bleiben
+    entries, statuses, image_counts = {}, {}, {}
+    entry_ids_seen, image_ids_seen, referenced_files = set(), set(), set()
+
+    journals_dir = os.path.join(data_dir, 'journals')
+    for journal_name in sorted(os.listdir(journals_dir)) if os.path.isdir(journals_dir) else ():
+        shard = {}
+        for collection in ('entries', 'statuses', 'images'):
+            path = os.path.join(journals_dir, journal_name, f"{collection}.json")
+            shard[collection] = read_json(path, violations) if os.path.exists(path) else []
+        if any(rows is None for rows in shard.values()):
+            continue
+        journal_id = int(journal_name)
+        if ids_per_journal:
+            entry_ids_seen, image_ids_seen = set(), set()
+
+        for entry in shard['entries']:
+            if entry['id'] in entry_ids_seen:
+                violations.append(f"Eintrags-ID {entry['id']} ist doppelt vergeben")
+            entry_ids_seen.add(entry['id'])
+            entries[(journal_id, entry['id'])] = entry
+
+        for row in shard['statuses']:
+            key = (journal_id, row['entry_id'])
+            if key not in entries:
+                violations.append(f"Journal {journal_id}: verwaister Status für Eintrag {row['entry_id']}")
+            elif key in statuses:
+                violations.append(f"Journal {journal_id}: mehrere Statuszeilen für Eintrag {row['entry_id']}")
+            statuses[key] = row
+
+        for image in shard['images']:
+            key = (journal_id, image['entry_id'])
+            if image['id'] in image_ids_seen:
+                violations.append(f"Bild-ID {image['id']} ist doppelt vergeben")
+            image_ids_seen.add(image['id'])
+            if key not in entries:
+                violations.append(f"Journal {journal_id}: verwaistes Bild {image['id']} (Eintrag {image['entry_id']})")
+            image_counts[key] = image_counts.get(key, 0) + 1
+            if image.get('file_path'):
+                referenced_files.add(image['file_path'])
+                if not os.path.exists(os.path.join(data_dir, 'uploads', image['file_path'])):
+                    violations.append(f"Bilddatei {image['file_path']} (Bild {image['id']}) fehlt")
+
+    for journal_id, entry_id in entries:
+        if (journal_id, entry_id) not in statuses:
+            violations.append(f"Journal {journal_id}: Eintrag {entry_id} hat keine Statuszeile")
+
+    uploads_dir = os.path.join(data_dir, 'uploads')
+    if os.path.isdir(uploads_dir):
+        for name in sorted(set(os.listdir(uploads_dir)) - referenced_files):
+            violations.append(f"Verwaiste Bilddatei {name}")
+
+    # Verlorene Schreibvorgänge: der letzte bestätigte Zustand muss auf der Platte stehen.
+    # IDs kommen aus fortlaufenden Zählern und werden nie neu vergeben.
+    for ledger in ledgers:
+        journal_id = ledger['journal_id']
+        for entry_id in ledger['deleted']:
+            if (journal_id, entry_id) in entries:
+                violations.append(f"Gelöschter Eintrag {entry_id} ist noch vorhanden")
+        for entry_id, expected in ledger['entries'].items():
+            key = (journal_id, int(entry_id))
+            entry = entries.get(key)
+            if entry is None:
+                violations.append(f"Eintrag {entry_id} fehlt")
+                continue
+            if entry.get('notes') != expected['notes']:
+                violations.append(f"Eintrag {entry_id}: Notizen {entry.get('notes')!r} statt {expected['notes']!r}")
+            row = statuses.get(key)
+            for template_id, checked in expected['checked'].items():
+                bit = template_bits.get(int(template_id), 0)
+                if row and bool(row['checked'] & bit) != checked:
+                    violations.append(f"Eintrag {entry_id}: Checklistenpunkt {template_id} verloren")
+            if image_counts.get(key, 0) != expected['images']:
+                violations.append(f"Eintrag {entry_id}: {image_counts.get(key, 0)} Bilder "
+                                  f"statt {expected['images']}")
+
+    return violations
+
+
+def percentile(sorted_values, p):
+    """Perzentil nach der Nearest-Rank-Methode."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-p * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    operations = {}
+    total = 0
+    for op in OPERATIONS:
+        values = sorted(latencies[op])
+        total += len(values)
+        operations[op] = {
+            'count': len(values),
+            'errors': errors[op],
+            'mean_ms': sum(values) / len(values) * 1000 if values else None,
+            'max_ms': values[-1] * 1000 if values else None,
+        }
+        for p in PERCENTILES:
+            value = percentile(values, p)
+            operations[op][f"p{p}_ms"] = value * 1000 if value is not None else None
+    return {
+        'requests': total,
+        'elapsed_seconds': elapsed,
+        'throughput_per_second': total / elapsed if elapsed else None,
+        'operations': operations
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nebenläufiger Lasttest der Speicherschicht")
+    parser.add_argument('--threads', type=int, default=8, help="Worker-Threads (je Prozess)")
+    parser.add_argument('--processes', type=int, default=0,
+                        help="Zusätzlich in N Prozessen laufen lassen (jeder mit eigenem Journal)")
+    parser.add_argument('--operations', type=int, default=100, help="Anfragen je Worker")
+    parser.add_argument('--journals', type=int, default=1, help="Journale, auf die die Threads verteilt werden")
+    parser.add_argument('--templates', type=int, default=DEFAULT_TEMPLATES, help="Checklistenvorlagen je Journal")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Ergebnisdatei (JSON), sonst Ausgabe auf stdout")
+    parser.add_argument('--keep-data', action='store_true', help="Temporäres Datenverzeichnis nicht löschen")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='tj-stress-')
+    app, ds = load_app(data_dir)
+
+    ledgers = []
+    latencies = {op: [] for op in OPERATIONS}
+    errors = {op: 0 for op in OPERATIONS}
+
+    def collect(ledger, worker_latencies, worker_errors):
+        ledgers.append(ledger)
+        for op in OPERATIONS:
+            latencies[op].extend(worker_latencies[op])
+            errors[op] += worker_errors[op]
+
+    try:
+        if args.processes:
+            journals = setup_journals(app, args.processes, args.templates)
+            context = multiprocessing.get_context('spawn')
+            start = time.perf_counter()
+            with concurrent.futures.ProcessPoolExecutor(args.processes, mp_context=context) as pool:
+                futures = [pool.submit(process_main, data_dir, [journals[i]], args.threads,
+                                       args.operations, args.seed, i * args.threads)
+                           for i in range(args.processes)]
+                for future in futures:
+                    for result in future.result():
+                        collect(*result)
+            elapsed = time.perf_counter() - start
+        else:
+            journals = setup_journals(app, args.journals, args.templates)
+            start = time.perf_counter()
+            results = run_threads(app, journals, args.threads, args.operations, args.seed)
+            elapsed = time.perf_counter() - start
+            ds.flush_pending_writes()
+            ds.wait_for_reaper()
+            for ledger, worker_latencies, worker_errors in results:
+                collect(ledger.to_dict(), worker_latencies, worker_errors)
+
+        violations = check_invariants(data_dir, ledgers, ids_per_journal=bool(args.processes))
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        'created_at': datetime.datetime.utcnow().isoformat() + 'Z',
+        'git_revision': git_revision(),
+        'threads': args.threads,
+        'processes': args.processes,
+        'operations_per_worker': args.operations,
+        'data_dir': data_dir if args.keep_data else None,
+        'summary': summarize(latencies, errors, elapsed),
+        'violations': violations
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    summary = report['summary']
+    print(f"{summary['requests']} Anfragen in {elapsed:.2f} s "
+          f"({summary['throughput_per_second']:.1f}/s), {len(violations)} Verletzungen", file=sys.stderr)
+    for violation in violations[:20]:
+        print(f"  {violation}", file=sys.stderr)
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
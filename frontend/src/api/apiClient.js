@@ -10,7 +10,7 @@ const apiClient = axios.create({
 });
 
 // Journal API methods
-export const getJournals = () => apiClient.get('/journals');
+export const getJournals = (params) => apiClient.get('/journals', { params });
 export const getJournal = (id) => apiClient.get(`/journals/${id}`);
 export const createJournal = (data) => apiClient.post('/journals', data);
 export const updateJournal = (id, data) => apiClient.put(`/journals/${id}`, data);
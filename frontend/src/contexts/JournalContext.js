@@ -17,7 +17,8 @@ export const JournalProvider = ({ children }) => {
   const fetchJournals = useCallback(async () => {
     try {
       setLoading(true);
-      const response = await getJournals();
+      // Kurzübersicht (Einträge, PnL, Gewinnrate) direkt mitladen
+      const response = await getJournals({ include: 'summary' });
       setJournals(response.data);
       setError(null);
     } catch (err) {
@@ -51,6 +51,18 @@ const Dashboard = () => {
                 <Typography variant="body2" color="text.secondary" noWrap>
                   {journal.description || 'No description'}
                 </Typography>
+                {journal.summary && (
+                  <Typography variant="body2" sx={{ mt: 1 }}>
+                    {journal.summary.entry_count} trades
+                    {journal.summary.entry_count > 0 && (
+                      <>
+                        {' · '}PnL {journal.summary.total_pnl}
+                        {' · '}Win rate {journal.summary.win_rate_percentage}%
+                        {journal.summary.last_trade_date && ` · Last trade ${journal.summary.last_trade_date}`}
+                      </>
+                    )}
+                  </Typography>
+                )}
               </CardContent>
               <CardActions>
                 <Button size="small" onClick={() => navigate(`/journals/${journal.id}`)}>